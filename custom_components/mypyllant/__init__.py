@@ -1,20 +1,21 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime as dt, timedelta
+from datetime import datetime as dt, timedelta, timezone
 import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import (
+    HassJob,
     HomeAssistant,
+    callback,
     SupportsResponse,
     ServiceCall,
     ServiceResponse,
 )
-from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from homeassistant.helpers import selector
-
-from myPyllant import export, report
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
 
 from myPyllant.api import MyPyllantAPI
 from myPyllant.const import DEFAULT_BRAND
@@ -35,10 +36,19 @@ from .const import (
     SERVICE_GENERATE_TEST_DATA,
     SERVICE_EXPORT,
     SERVICE_REPORT,
+    SERVICE_BACKFILL_STATISTICS,
+    SERVICE_EXPORT_FILE,
     OPTION_UPDATE_INTERVAL_DAILY,
     DEFAULT_UPDATE_INTERVAL_DAILY,
+    OPTION_FETCH_AMBISENSE_ROOMS,
+    DEFAULT_FETCH_AMBISENSE_ROOMS,
+    GAP_SCAN_INTERVAL,
 )
+from .backfill import StatisticsBackfill, StatisticsGapScanner
+from .decorators import refreshed_session
+from .export import EXPORT_FORMATS, async_export, async_export_file, async_report
 from .coordinator import SystemCoordinator, DailyDataCoordinator
+from .storage import BackfillStore, PeriodTotalsStore, QuotaStore, SnapshotStore
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -100,22 +110,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {}
 
-    _LOGGER.debug("Creating API and logging in with %s in realm %s", username, country)
+    _LOGGER.debug("Creating API with %s in realm %s", username, country)
     api = MyPyllantAPI(
         username=username, password=password, brand=brand, country=country
     )
-    try:
-        await api.login()
-    except (AuthenticationFailed, LoginEndpointInvalid, RealmInvalid) as e:
-        raise ConfigEntryAuthFailed from e
-
     system_coordinator = SystemCoordinator(
         hass, api, entry, timedelta(seconds=update_interval)
     )
-    _LOGGER.debug("Refreshing SystemCoordinator")
-    await system_coordinator.async_refresh()
     hass.data[DOMAIN][entry.entry_id]["system_coordinator"] = system_coordinator
-
     # Daily data coordinator is fetched once by default (to get all entities), but not updated on a regular basis
     # to prevent quota errors
     daily_data_coordinator = DailyDataCoordinator(
@@ -124,28 +126,160 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         entry,
         timedelta(seconds=update_interval_daily) if update_interval_daily else None,
     )
-    _LOGGER.debug("Refreshing DailyDataCoordinator")
-    await daily_data_coordinator.async_refresh()
     hass.data[DOMAIN][entry.entry_id]["daily_data_coordinator"] = daily_data_coordinator
+    # Month and year to date totals are accumulated locally from each update of the daily data
+    period_totals_store = PeriodTotalsStore(hass, entry.entry_id)
+    await period_totals_store.async_load(daily_data_coordinator.period_totals)
+    entry.async_on_unload(
+        daily_data_coordinator.async_add_listener(
+            lambda: period_totals_store.async_save(daily_data_coordinator)
+        )
+    )
+
+    # Restore a quota lockout from before a restart, so setup doesn't extend it
+    quota = system_coordinator.quota
+    quota_store = QuotaStore(hass, entry.entry_id)
+    await quota_store.async_load(quota)
+    entry.async_on_unload(
+        quota.async_add_listener(lambda: quota_store.async_save(quota))
+    )
+    lockout_end_time = quota.lockout_end_time
+    if lockout_end_time and lockout_end_time <= dt.now(timezone.utc):
+        lockout_end_time = None
+
+    # Ambisense rooms can't be restored from a snapshot, those entities would be missing until the next restart
+    snapshot_store = SnapshotStore(hass, entry.entry_id)
+    snapshot = (
+        await snapshot_store.async_load()
+        if not entry.options.get(
+            OPTION_FETCH_AMBISENSE_ROOMS, DEFAULT_FETCH_AMBISENSE_ROOMS
+        )
+        else None
+    )
+    if snapshot:
+        # Create entities from the last known data, logging in and refreshing happens in the background
+        _LOGGER.debug("Setting up entities from snapshot")
+        (
+            system_coordinator.homes,
+            system_coordinator.data,
+            daily_data_coordinator.data,
+        ) = snapshot
+
+        async def async_refresh_coordinators() -> None:
+            await system_coordinator.async_refresh()
+            await daily_data_coordinator.async_refresh()
+
+        @callback
+        def async_start_refresh(_now: dt | None = None) -> None:
+            entry.async_create_background_task(
+                hass,
+                async_refresh_coordinators(),
+                f"{DOMAIN}_refresh_{entry.entry_id}",
+            )
+
+        if lockout_end_time:
+            _LOGGER.info(
+                "myVAILLANT API is locked out until %s, refreshing after that",
+                lockout_end_time,
+            )
+            entry.async_on_unload(
+                async_call_later(
+                    hass,
+                    lockout_end_time - dt.now(timezone.utc),
+                    HassJob(
+                        async_start_refresh,
+                        f"{DOMAIN} refresh after lockout",
+                        cancel_on_shutdown=True,
+                    ),
+                )
+            )
+        else:
+            async_start_refresh()
+    elif lockout_end_time:
+        raise ConfigEntryNotReady(
+            f"myVAILLANT API is locked out until {lockout_end_time}"
+        )
+    else:
+        _LOGGER.debug("Logging in with %s", username)
+        try:
+            await api.login()
+        except (AuthenticationFailed, LoginEndpointInvalid, RealmInvalid) as e:
+            raise ConfigEntryAuthFailed from e
+        _LOGGER.debug("Refreshing SystemCoordinator")
+        await system_coordinator.async_refresh()
+        _LOGGER.debug("Refreshing DailyDataCoordinator")
+        await daily_data_coordinator.async_refresh()
+
+    @callback
+    def async_save_snapshot() -> None:
+        snapshot_store.async_save(system_coordinator, daily_data_coordinator)
+
+    entry.async_on_unload(system_coordinator.async_add_listener(async_save_snapshot))
+    entry.async_on_unload(
+        daily_data_coordinator.async_add_listener(async_save_snapshot)
+    )
+    if not snapshot:
+        async_save_snapshot()
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Days before the fetched data are seeded from the data sensors' statistics
+    entry.async_create_background_task(
+        hass,
+        daily_data_coordinator.async_seed_period_totals(),
+        f"{DOMAIN}_seed_period_totals_{entry.entry_id}",
+    )
+
+    # Interrupted backfills continue once the data sensors are updated
+    backfill = StatisticsBackfill(
+        hass, daily_data_coordinator, BackfillStore(hass, entry.entry_id)
+    )
+    await backfill.async_load()
+    hass.data[DOMAIN][entry.entry_id]["backfill"] = backfill
+    entry.async_on_unload(
+        daily_data_coordinator.async_add_listener(backfill.async_start)
+    )
+    # Hours missing before the current window are refetched on a slow schedule
+    gap_scanner = StatisticsGapScanner(hass, daily_data_coordinator, backfill)
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass,
+            gap_scanner.async_scan,
+            timedelta(seconds=GAP_SCAN_INTERVAL),
+            cancel_on_shutdown=True,
+        )
+    )
+
+    # Services run on the entry's logged in API, instead of logging in again for every call
     async def handle_export(call: ServiceCall) -> ServiceResponse:
         _LOGGER.debug("Exporting data with params %s", call.data)
-        return {
-            "export": await export.main(
-                user=username,
-                password=password,
-                brand=brand,
-                country=country,
-                data=call.data.get("data", False),
-                resolution=call.data.get("resolution", DeviceDataBucketResolution.DAY),
-                start=call.data.get("start"),
-                end=call.data.get("end"),
-            )
-        }
+        async with refreshed_session(system_coordinator, "export") as session_api:
+            return {
+                "export": await async_export(
+                    session_api,
+                    data=call.data.get("data", False),
+                    resolution=call.data.get(
+                        "resolution", DeviceDataBucketResolution.DAY
+                    ),
+                    start=call.data.get("start"),
+                    end=call.data.get("end"),
+                )
+            }
+
+    async def handle_export_file(call: ServiceCall) -> ServiceResponse:
+        _LOGGER.debug("Exporting data to a file with params %s", call.data)
+        return await async_export_file(
+            hass,
+            system_coordinator,
+            start=call.data["start"],
+            end=call.data.get("end"),
+            resolution=DeviceDataBucketResolution(call.data["resolution"]),
+            file_format=call.data["format"],
+            compress=call.data["compress"],
+        )
 
     async def handle_generate_test_data(call: ServiceCall) -> ServiceResponse:
+        # generate_test_data creates its own API, there is no way to pass a logged in one
         return await generate_test_data.main(
             user=username,
             password=password,
@@ -155,17 +289,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
 
     async def handle_report(call: ServiceCall) -> ServiceResponse:
-        return {
-            f.file_name: f.file_content
-            for f in await report.main(
-                user=username,
-                password=password,
-                brand=brand,
-                country=country,
-                year=int(call.data.get("year", dt.now().year)),
-                write_results=False,
+        async with refreshed_session(system_coordinator, "report") as session_api:
+            return await async_report(  # type: ignore
+                session_api, int(call.data.get("year", dt.now().year))
             )
-        }
 
     hass.services.async_register(
         DOMAIN,
@@ -186,6 +313,43 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         ),
         supports_response=SupportsResponse.ONLY,
     )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_FILE,
+        handle_export_file,
+        schema=vol.Schema(
+            {
+                vol.Required("start"): vol.Coerce(dt.fromisoformat),
+                vol.Optional("end"): vol.Coerce(dt.fromisoformat),
+                vol.Optional(
+                    "resolution", default=str(DeviceDataBucketResolution.HOUR)
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=_DEVICE_DATA_BUCKET_RESOLUTION_OPTIONS,
+                        mode=selector.SelectSelectorMode.LIST,
+                    ),
+                ),
+                vol.Optional("format", default="ndjson"): vol.In(EXPORT_FORMATS),
+                vol.Optional("compress", default=False): bool,
+            }
+        ),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def handle_backfill_statistics(call: ServiceCall) -> None:
+        backfill.async_start(call.data["start"])
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BACKFILL_STATISTICS,
+        handle_backfill_statistics,
+        schema=vol.Schema(
+            {
+                vol.Required("start"): vol.Coerce(dt.fromisoformat),
+            }
+        ),
+    )
     hass.services.async_register(
         DOMAIN,
         SERVICE_GENERATE_TEST_DATA,
@@ -206,6 +370,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove stored data of a config entry."""
+    await SnapshotStore(hass, entry.entry_id).async_remove()
+    await QuotaStore(hass, entry.entry_id).async_remove()
+    await BackfillStore(hass, entry.entry_id).async_remove()
+    await PeriodTotalsStore(hass, entry.entry_id).async_remove()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
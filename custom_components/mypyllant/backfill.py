@@ -0,0 +1,481 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime as dt, timedelta, tzinfo
+from typing import TYPE_CHECKING, Any
+
+from aiohttp.client_exceptions import ClientResponseError
+from homeassistant.components.recorder.statistics import StatisticData
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from myPyllant.enums import DeviceDataBucketResolution
+
+from custom_components.mypyllant.const import (
+    BACKFILL_BUDGET_WAIT,
+    BACKFILL_CHUNK_DAYS,
+    BACKFILL_REQUEST_INTERVAL,
+    DOMAIN,
+    GAP_SCAN_DAYS,
+)
+from custom_components.mypyllant.coordinator import DailyDataCoordinator
+from custom_components.mypyllant.statistics import compute_hourly_statistics
+from custom_components.mypyllant.storage import BackfillStore
+
+if TYPE_CHECKING:
+    from custom_components.mypyllant.sensor import DataSensor
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _local_midnight(value: dt, timezone: tzinfo) -> dt:
+    # Date-based construction keeps midnight on DST-change days
+    day = value.astimezone(timezone).date()
+    return dt(day.year, day.month, day.day, tzinfo=timezone)
+
+
+def _device_key(sensor: DataSensor) -> str:
+    return f"{sensor.system_id}_{sensor.device.device_uuid}"  # type: ignore
+
+
+class StatisticsBackfill:
+    """
+    Imports the hourly statistics of DataSensors from before their current window, walking back in time in chunks
+
+    Sums are computed backwards from the earliest published statistic of each sensor, or from the baseline of
+    the current window if there is none, so the imported history joins the published statistics without a
+    jump. If the history holds more energy than that sum, i.e. after a fresh install, the later sums are
+    raised instead of writing negative sums, so the history counts up from 0. Only one chunk of one device is
+    held in memory at a time, and the progress is stored after each chunk, so an interrupted backfill
+    continues where it stopped.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: DailyDataCoordinator,
+        store: BackfillStore,
+    ) -> None:
+        self.hass = hass
+        self.coordinator = coordinator
+        self.store = store
+        # Progress by device, with the requested start, the time until which statistics are imported, and the
+        # time until which each statistic id is imported with its sum at that time
+        self._checkpoints: dict[str, dict[str, Any]] = {}
+        self._requested_start: dt | None = None
+        self._task: asyncio.Task | None = None
+        # Held while statistics before the current window are rewritten, so backfill and gap repair don't overlap
+        self.lock = asyncio.Lock()
+
+    async def async_load(self) -> None:
+        self._checkpoints = await self.store.async_load()
+
+    @callback
+    def async_start(self, start: dt | None = None) -> None:
+        """
+        Starts importing statistics back to start in the background, or continues stored backfills without start
+        """
+        if start is not None:
+            self._requested_start = (
+                min(start, self._requested_start) if self._requested_start else start
+            )
+        if self._task is not None and not self._task.done():
+            return
+        if self._requested_start is None and not self._checkpoints:
+            return
+        self._task = self.coordinator.entry.async_create_background_task(
+            self.hass,
+            self._async_run(),
+            f"{DOMAIN}_backfill_{self.coordinator.entry.entry_id}",
+        )
+
+    async def _async_run(self) -> None:
+        try:
+            async with self.lock:
+                while True:
+                    if self._requested_start is not None:
+                        start, self._requested_start = self._requested_start, None
+                        await self._async_add_checkpoints(start)
+                    for key in list(self._checkpoints):
+                        await self._async_backfill_device(key)
+                    if self._requested_start is None:
+                        break
+        except ClientResponseError as e:
+            self.coordinator.quota.set_quota_exceeded(e)
+            _LOGGER.warning(
+                "Pausing statistics backfill, continuing on a later update: %s", e
+            )
+        except HomeAssistantError as e:
+            _LOGGER.warning(
+                "Pausing statistics backfill, continuing on a later update: %s", e
+            )
+
+    def _sensors(self, key: str) -> list[DataSensor]:
+        return [
+            sensor
+            for sensor in self.coordinator.statistics_writer.sensors
+            if sensor.statistic_id in self._checkpoints[key]["sums"]
+            and sensor.device_data is not None
+        ]
+
+    async def _async_add_checkpoints(self, start: dt) -> None:
+        """
+        Creates a checkpoint for every device with data sensors, starting at the baseline of the current window
+        """
+        devices: dict[str, list[DataSensor]] = {}
+        for sensor in self.coordinator.statistics_writer.sensors:
+            if (
+                sensor.statistic_id is None
+                or sensor.device is None
+                or not sensor.device_data.data  # type: ignore
+            ):
+                continue
+            devices.setdefault(_device_key(sensor), []).append(sensor)
+
+        for key, sensors in devices.items():
+            timezone = sensors[0].device.timezone  # type: ignore
+            requested = _local_midnight(
+                start if start.tzinfo else start.replace(tzinfo=timezone), timezone
+            )
+            if key in self._checkpoints:
+                # A running backfill only needs to go further back
+                checkpoint_start = dt.fromisoformat(self._checkpoints[key]["start"])
+                self._checkpoints[key]["start"] = min(
+                    requested, checkpoint_start
+                ).isoformat()
+                continue
+            writer = self.coordinator.statistics_writer
+            window_start = min(s.device_data.data[0].start_date for s in sensors)  # type: ignore
+            rows = await writer.async_load_statistics(
+                {s.statistic_id for s in sensors},  # type: ignore
+                requested,
+                window_start,
+            )
+            untils: dict[str, str] = {}
+            sums: dict[str, float] = {}
+            for sensor in sensors:
+                statistic_id: str = sensor.statistic_id  # type: ignore
+                published = [
+                    row
+                    for row in rows.get(statistic_id, [])
+                    if row.get("start") is not None and row.get("sum") is not None
+                ]
+                if published:
+                    # Published hours aren't fetched again, except the earliest one, whose sum is known after it
+                    earliest = min(published, key=lambda row: row["start"])
+                    untils[statistic_id] = (
+                        dt.fromtimestamp(earliest["start"], timezone)
+                        + timedelta(hours=1)
+                    ).isoformat()
+                    sums[statistic_id] = earliest["sum"]
+                else:
+                    untils[statistic_id] = window_start.isoformat()
+                    sums[statistic_id] = await writer.async_get_baseline(sensor)
+            self._checkpoints[key] = {
+                "start": requested.isoformat(),
+                "until": max(untils.values(), key=dt.fromisoformat),
+                "untils": untils,
+                "sums": sums,
+            }
+        self.store.async_save(self._checkpoints)
+
+    async def _async_wait_for_budget(self) -> None:
+        quota = self.coordinator.quota
+        while True:
+            quota.raise_if_locked("statistics backfill", HomeAssistantError)
+            quota.budget.record()
+            if quota.budget.allows_background_update():
+                return
+            _LOGGER.debug(
+                "Waiting %ss for API budget before continuing statistics backfill",
+                BACKFILL_BUDGET_WAIT,
+            )
+            await asyncio.sleep(BACKFILL_BUDGET_WAIT)
+
+    async def _async_backfill_device(self, key: str) -> None:
+        sensors = self._sensors(key)
+        if not sensors:
+            # Sensors aren't set up (yet), the checkpoint is kept for a later run
+            return
+        device = sensors[0].device
+        checkpoint = self._checkpoints[key]
+        start = dt.fromisoformat(checkpoint["start"])
+        until = dt.fromisoformat(checkpoint["until"]).astimezone(device.timezone)  # type: ignore
+        _LOGGER.info(
+            "Backfilling statistics of %s from %s back to %s",
+            device.name_display,  # type: ignore
+            until,
+            start,
+        )
+        while until > start:
+            chunk_start = max(
+                start,
+                _local_midnight(
+                    until - timedelta(days=BACKFILL_CHUNK_DAYS),
+                    device.timezone,  # type: ignore
+                ),
+            )
+            await self._async_wait_for_budget()
+            await self.coordinator._refresh_session()
+            device_data = [
+                da
+                async for da in self.coordinator.api.get_data_by_device(
+                    device,  # type: ignore
+                    DeviceDataBucketResolution.HOUR,
+                    chunk_start,
+                    until,
+                )
+            ]
+            untils = checkpoint.setdefault("untils", {})
+            for sensor in sensors:
+                sensor_until = dt.fromisoformat(
+                    untils.get(sensor.statistic_id, checkpoint["until"])
+                )
+                if sensor_until <= chunk_start or sensor.da_index >= len(device_data):
+                    continue
+                buckets = [
+                    bucket
+                    for bucket in device_data[sensor.da_index].data
+                    if chunk_start <= bucket.start_date < sensor_until
+                ]
+                # The sum before this chunk is the sum after it, minus everything in between
+                baseline_sum = checkpoint["sums"][sensor.statistic_id] - sum(
+                    bucket.value for bucket in buckets if bucket.value is not None
+                )
+                if baseline_sum < 0:
+                    # More energy than the published sum, the later sums are raised so this chunk starts at 0
+                    self.coordinator.statistics_writer.async_adjust(
+                        sensor, sensor_until, -baseline_sum
+                    )
+                    baseline_sum = 0.0
+                self.coordinator.statistics_writer.async_import(
+                    sensor, compute_hourly_statistics(buckets, baseline_sum, {})
+                )
+                checkpoint["sums"][sensor.statistic_id] = baseline_sum
+                untils[sensor.statistic_id] = chunk_start.isoformat()
+            until = chunk_start
+            checkpoint["until"] = until.isoformat()
+            self.store.async_save(self._checkpoints)
+            await asyncio.sleep(BACKFILL_REQUEST_INTERVAL)
+
+        _LOGGER.info("Finished backfilling statistics of %s", device.name_display)  # type: ignore
+        del self._checkpoints[key]
+        self.store.async_save(self._checkpoints)
+
+
+class StatisticsGapScanner:
+    """
+    Finds missing hours in the published statistics before the current window, and refetches only those
+
+    Hours can go missing when updates fail until they fall out of the window. The scan runs rarely, skips while
+    a backfill is running, and stops once the background API budget is used up; missed hours are found again
+    on the next scan. Sums of the hours after a repaired gap are raised by the gap's consumption, so there is
+    no negative step afterward.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: DailyDataCoordinator,
+        backfill: StatisticsBackfill,
+    ) -> None:
+        self.hass = hass
+        self.coordinator = coordinator
+        self.backfill = backfill
+        # Hours that were refetched already, the API doesn't have values for those if they are still missing
+        self._attempted: set[tuple[str, float]] = set()
+        self._task: asyncio.Task | None = None
+
+    @callback
+    def async_scan(self, _now: dt | None = None) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._task = self.coordinator.entry.async_create_background_task(
+            self.hass,
+            self._async_scan(),
+            f"{DOMAIN}_gap_scan_{self.coordinator.entry.entry_id}",
+        )
+
+    async def _async_scan(self) -> None:
+        writer = self.coordinator.statistics_writer
+        sensors = [
+            sensor
+            for sensor in writer.sensors
+            if sensor.statistic_id is not None
+            and sensor.device is not None
+            and sensor.device_data.data  # type: ignore
+        ]
+        if not sensors or self.backfill.lock.locked():
+            return
+        window_start = min(s.device_data.data[0].start_date for s in sensors)  # type: ignore
+        scan_start = window_start - timedelta(days=GAP_SCAN_DAYS)
+        self._attempted = {
+            (statistic_id, start)
+            for statistic_id, start in self._attempted
+            if start >= scan_start.timestamp()
+        }
+        try:
+            rows = await writer.async_load_statistics(
+                {s.statistic_id for s in sensors},  # type: ignore
+                scan_start,
+                window_start,
+            )
+
+            gaps: dict[str, dict[DataSensor, list[float]]] = {}
+            for sensor in sensors:
+                published = {
+                    row["start"]
+                    for row in rows.get(sensor.statistic_id, [])  # type: ignore
+                    if row.get("start") is not None
+                }
+                if not published:
+                    # Nothing to anchor a repair to, older history is up to a backfill
+                    continue
+                missing = [
+                    start
+                    for start in range(
+                        int(min(published)),
+                        int(sensor.device_data.data[0].start_date.timestamp()),  # type: ignore
+                        3600,
+                    )
+                    if start not in published
+                    and (sensor.statistic_id, start) not in self._attempted
+                ]
+                if missing:
+                    gaps.setdefault(_device_key(sensor), {})[sensor] = missing
+
+            async with self.backfill.lock:
+                for device_gaps in gaps.values():
+                    quota = self.coordinator.quota
+                    quota.raise_if_locked("statistics gap repair", HomeAssistantError)
+                    quota.budget.record()
+                    if not quota.budget.allows_background_update():
+                        _LOGGER.debug("Not enough API budget to repair statistics gaps")
+                        return
+                    await self._async_repair_device(device_gaps)
+        except ClientResponseError as e:
+            self.coordinator.quota.set_quota_exceeded(e)
+            _LOGGER.warning("Could not repair statistics gaps: %s", e)
+        except HomeAssistantError as e:
+            _LOGGER.debug("Skipping statistics gap repair: %s", e)
+        except Exception as e:  # noqa: BLE001
+            # i.e. recorder errors, the next scan tries again
+            _LOGGER.warning("Could not scan statistics for gaps: %s", e)
+
+    async def _async_repair_device(
+        self, device_gaps: dict[DataSensor, list[float]]
+    ) -> None:
+        sensors = list(device_gaps)
+        device = sensors[0].device
+        missing = sorted({start for starts in device_gaps.values() for start in starts})
+        _LOGGER.info(
+            "Refetching %s missing hours of energy data for %s",
+            len(missing),
+            device.name_display,  # type: ignore
+        )
+
+        # Missing hours close to each other are fetched together, at most one chunk per request
+        ranges: list[list[float]] = []
+        for start in missing:
+            if ranges and start - ranges[-1][0] < BACKFILL_CHUNK_DAYS * 86400:
+                ranges[-1][1] = start + 3600
+            else:
+                ranges.append([start, start + 3600])
+        values: dict[DataSensor, dict[float, float]] = {s: {} for s in sensors}
+        await self.coordinator._refresh_session()
+        for range_start, range_end in ranges:
+            device_data = [
+                da
+                async for da in self.coordinator.api.get_data_by_device(
+                    device,  # type: ignore
+                    DeviceDataBucketResolution.HOUR,
+                    dt.fromtimestamp(range_start, device.timezone),  # type: ignore
+                    dt.fromtimestamp(range_end, device.timezone),  # type: ignore
+                )
+            ]
+            for sensor in sensors:
+                if sensor.da_index >= len(device_data):
+                    continue
+                values[sensor] |= {
+                    bucket.start_date.timestamp(): bucket.value
+                    for bucket in device_data[sensor.da_index].data
+                    if bucket.value is not None
+                    and bucket.start_date.timestamp() in device_gaps[sensor]
+                }
+            await asyncio.sleep(BACKFILL_REQUEST_INTERVAL)
+
+        # Published rows are read after fetching, so they include everything written in the meantime
+        writer = self.coordinator.statistics_writer
+        window_start = min(s.device_data.data[0].start_date for s in sensors)  # type: ignore
+        rows = await writer.async_load_statistics(
+            {s.statistic_id for s in sensors},  # type: ignore
+            dt.fromtimestamp(missing[0], device.timezone)  # type: ignore
+            - timedelta(days=GAP_SCAN_DAYS),
+            window_start,
+            {"sum", "state"},
+        )
+        for sensor in sensors:
+            self._attempted |= {(sensor.statistic_id, s) for s in device_gaps[sensor]}  # type: ignore
+            if values[sensor]:
+                writer.async_import(
+                    sensor,
+                    self._repaired_statistics(
+                        rows.get(sensor.statistic_id, []),  # type: ignore
+                        values[sensor],
+                        device.timezone,  # type: ignore
+                    ),
+                )
+        # The window's sums continue from the raised baseline
+        writer.async_schedule()
+
+    @staticmethod
+    def _repaired_statistics(
+        rows: list[dict[str, Any]],
+        values: dict[float, float],
+        timezone: tzinfo,
+    ) -> list[StatisticData]:
+        """
+        Inserts the refetched hours between the published rows, and raises all later rows by the inserted consumption
+
+        The state of later rows on the same day is raised as well, as it counts up from midnight
+        """
+        published = {
+            row["start"]: (row["sum"] or 0.0, row.get("state") or 0.0)
+            for row in rows
+            if row.get("start") is not None
+        }
+        previous: tuple[float, float, dt] | None = None
+        offset = 0.0
+        day_offsets: dict[dt, float] = {}
+        stats: list[StatisticData] = []
+        for start in sorted(published.keys() | values.keys()):
+            start_date = dt.fromtimestamp(start, timezone)
+            midnight = _local_midnight(start_date, timezone)
+            if start in values:
+                if previous is None:
+                    # The gap isn't preceded by a published row
+                    continue
+                previous_sum, previous_state, previous_midnight = previous
+                value = values[start]
+                row_sum = previous_sum + value
+                row_state = (
+                    previous_state if previous_midnight == midnight else 0.0
+                ) + value
+                offset += value
+                day_offsets[midnight] = day_offsets.get(midnight, 0.0) + value
+            else:
+                row_sum = published[start][0] + offset
+                row_state = published[start][1] + day_offsets.get(midnight, 0.0)
+                if previous is None or not offset:
+                    previous = (row_sum, row_state, midnight)
+                    continue
+            stats.append(
+                StatisticData(
+                    start=start_date,
+                    last_reset=midnight,
+                    sum=row_sum,
+                    state=row_state,
+                )
+            )
+            previous = (row_sum, row_state, midnight)
+        return stats
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 from collections.abc import Mapping
+from functools import partial
 from typing import Any
 
 from homeassistant.components.binary_sensor import (
@@ -10,15 +11,17 @@ from homeassistant.components.binary_sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo, EntityCategory
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from myPyllant.models import System, AmbisenseDevice
+from myPyllant.models import AmbisenseDevice
 
 from . import SystemCoordinator
 from .const import DOMAIN
+from .model_index import ModelKey, is_added
+from .topology import EntityTracker
 from .utils import (
     EntityList,
+    SystemCoordinatorEntity,
     ZoneCoordinatorEntity,
     AmbisenseDeviceCoordinatorEntity,
     CircuitEntity,
@@ -31,33 +34,60 @@ async def async_setup_entry(
     hass: HomeAssistant, config: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up the sensor platform."""
+    coordinator: SystemCoordinator = hass.data[DOMAIN][config.entry_id][
+        "system_coordinator"
+    ]
+    await EntityTracker(
+        hass,
+        config,
+        coordinator,
+        async_add_entities,
+        partial(create_binary_sensors, hass, config),
+    ).async_setup()
+
+
+async def create_binary_sensors(
+    hass: HomeAssistant,
+    config: ConfigEntry,
+    added: frozenset[ModelKey] | None = None,
+) -> EntityList[BinarySensorEntity]:
     coordinator: SystemCoordinator = hass.data[DOMAIN][config.entry_id][
         "system_coordinator"
     ]
     if not coordinator.data:
         _LOGGER.warning("No system data, skipping binary sensors")
-        return
+        return EntityList()
 
+    model_index = coordinator.model_index
     sensors: EntityList[BinarySensorEntity] = EntityList()
     for index, system in enumerate(coordinator.data):
-        sensors.append(lambda: ControlError(index, coordinator))
-        sensors.append(lambda: ControlOnline(index, coordinator))
-        sensors.append(lambda: FirmwareUpdateRequired(index, coordinator))
-        sensors.append(lambda: FirmwareUpdateEnabled(index, coordinator))
-        if system.eebus:
-            sensors.append(lambda: EebusEnabled(index, coordinator))
-            sensors.append(lambda: EebusCapable(index, coordinator))
+        if is_added(added, model_index.key(index, "system")):
+            sensors.append(lambda: ControlError(index, coordinator))
+            sensors.append(lambda: ControlOnline(index, coordinator))
+            sensors.append(lambda: FirmwareUpdateRequired(index, coordinator))
+            sensors.append(lambda: FirmwareUpdateEnabled(index, coordinator))
+            if system.eebus:
+                sensors.append(lambda: EebusEnabled(index, coordinator))
+                sensors.append(lambda: EebusCapable(index, coordinator))
         for circuit_index, _ in enumerate(system.circuits):
+            if not is_added(added, model_index.key(index, "circuit", circuit_index)):
+                continue
             sensors.append(
                 lambda: CircuitIsCoolingAllowed(index, circuit_index, coordinator)
             )
         for zone_index, zone in enumerate(system.zones):
+            if not is_added(added, model_index.key(index, "zone", zone_index)):
+                continue
             if zone.is_manual_cooling_active is not None:
                 sensors.append(
                     lambda: ZoneIsManualCoolingActive(index, zone_index, coordinator)
                 )
         if system.ambisense_rooms:
             for room_index, room in enumerate(system.ambisense_rooms):
+                if not is_added(
+                    added, model_index.key(index, "ambisense_room", room_index)
+                ):
+                    continue
                 for device in room.room_configuration.devices:
                     if device.unreach is not None:
                         sensors.append(
@@ -72,10 +102,10 @@ async def async_setup_entry(
                             )
                         )
 
-    async_add_entities(sensors)  # type: ignore
+    return sensors
 
 
-class SystemControlEntity(CoordinatorEntity, BinarySensorEntity):
+class SystemControlEntity(SystemCoordinatorEntity, BinarySensorEntity):
     coordinator: SystemCoordinator
 
     def __init__(
@@ -83,29 +113,13 @@ class SystemControlEntity(CoordinatorEntity, BinarySensorEntity):
         system_index: int,
         coordinator: SystemCoordinator,
     ):
-        super().__init__(coordinator)
+        super().__init__(system_index, coordinator)
         self.system_index = system_index
 
-    @property
-    def system(self) -> System:
-        return self.coordinator.data[self.system_index]
-
     @property
     def entity_category(self) -> EntityCategory | None:
         return EntityCategory.DIAGNOSTIC
 
-    @property
-    def id_infix(self) -> str:
-        return f"{self.system.id}_home"
-
-    @property
-    def name_prefix(self) -> str:
-        return f"{self.system.home.home_name or self.system.home.nomenclature}"
-
-    @property
-    def device_info(self) -> DeviceInfo | None:
-        return {"identifiers": {(DOMAIN, self.id_infix)}}
-
 
 class ControlError(SystemControlEntity):
     def __init__(
@@ -5,6 +5,7 @@ import datetime
 import logging
 import re
 from abc import ABC, abstractmethod
+from functools import partial
 from typing import Any
 
 from homeassistant.components.calendar import (
@@ -33,6 +34,8 @@ from myPyllant.enums import ZoneOperatingType
 from . import SystemCoordinator
 from .const import DOMAIN, WEEKDAYS_TO_RFC5545, RFC5545_TO_WEEKDAYS
 from .decorators import ensure_token_refresh
+from .model_index import ModelKey, is_added
+from .topology import EntityTracker
 from .utils import (
     ZoneCoordinatorEntity,
     DomesticHotWaterCoordinatorEntity,
@@ -47,16 +50,36 @@ async def async_setup_entry(
     hass: HomeAssistant, config: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up the sensor platform."""
+    coordinator: SystemCoordinator = hass.data[DOMAIN][config.entry_id][
+        "system_coordinator"
+    ]
+    await EntityTracker(
+        hass,
+        config,
+        coordinator,
+        async_add_entities,
+        partial(create_calendars, hass, config),
+    ).async_setup()
+
+
+async def create_calendars(
+    hass: HomeAssistant,
+    config: ConfigEntry,
+    added: frozenset[ModelKey] | None = None,
+) -> EntityList[CalendarEntity]:
     coordinator: SystemCoordinator = hass.data[DOMAIN][config.entry_id][
         "system_coordinator"
     ]
     if not coordinator.data:
         _LOGGER.warning("No system data, skipping calendar entities")
-        return
+        return EntityList()
 
+    model_index = coordinator.model_index
     sensors: EntityList[CalendarEntity] = EntityList()
     for index, system in enumerate(coordinator.data):
         for zone_index, zone in enumerate(system.zones):
+            if not is_added(added, model_index.key(index, "zone", zone_index)):
+                continue
             if zone.heating.time_program_heating:
                 sensors.append(
                     lambda: ZoneHeatingCalendar(index, zone_index, coordinator)
@@ -66,6 +89,10 @@ async def async_setup_entry(
                     lambda: ZoneCoolingCalendar(index, zone_index, coordinator)
                 )
         for dhw_index, dhw in enumerate(system.domestic_hot_water):
+            if not is_added(
+                added, model_index.key(index, "domestic_hot_water", dhw_index)
+            ):
+                continue
             sensors.append(
                 lambda: DomesticHotWaterCalendar(index, dhw_index, coordinator)
             )
@@ -74,11 +101,15 @@ async def async_setup_entry(
                     index, dhw_index, coordinator
                 )
             )
-        for room in system.ambisense_rooms:
+        for room_position, room in enumerate(system.ambisense_rooms):
+            if not is_added(
+                added, model_index.key(index, "ambisense_room", room_position)
+            ):
+                continue
             sensors.append(
                 lambda: AmbisenseCalendar(index, room.room_index, coordinator)
             )
-    async_add_entities(sensors)  # type: ignore
+    return sensors
 
 
 class BaseCalendarEntity(CalendarEntity, ABC):
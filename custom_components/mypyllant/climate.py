@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from collections.abc import Mapping
+from collections.abc import Awaitable, Callable, Mapping
 from dataclasses import asdict
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Any
 
 import voluptuous as vol
@@ -24,11 +26,10 @@ from homeassistant.components.climate.const import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceResponse, SupportsResponse
 from homeassistant.helpers import entity_platform, selector
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from myPyllant.const import DEFAULT_QUICK_VETO_DURATION
 from myPyllant.models import (
     System,
@@ -36,6 +37,7 @@ from myPyllant.models import (
     ZoneTimeProgram,
     RoomTimeProgram,
 )
+from myPyllant.utils import prepare_field_value_for_dict
 from myPyllant.enums import (
     ZoneOperatingMode,
     ZoneOperatingModeVRC700,
@@ -47,18 +49,26 @@ from myPyllant.enums import (
 
 from custom_components.mypyllant.decorators import ensure_token_refresh
 
+from custom_components.mypyllant.model_index import ModelKey, is_added
+from custom_components.mypyllant.topology import EntityTracker
 from custom_components.mypyllant.utils import (
     shorten_zone_name,
     EntityList,
     AmbisenseCoordinatorEntity,
+    ChangeDetectingEntity,
+    identity_property,
 )
 
 from . import SystemCoordinator
 from .const import (
     DEFAULT_TIME_PROGRAM_OVERWRITE,
+    DEFAULT_CLIMATE_ATTRIBUTES,
     DOMAIN,
+    REFRESH_DELAY_LONG,
+    REFRESH_DELAY_MEDIUM,
     OPTION_DEFAULT_QUICK_VETO_DURATION,
     OPTION_TIME_PROGRAM_OVERWRITE,
+    OPTION_CLIMATE_ATTRIBUTES,
     SERVICE_CANCEL_HOLIDAY,
     SERVICE_CANCEL_QUICK_VETO,
     SERVICE_SET_HOLIDAY,
@@ -70,6 +80,7 @@ from .const import (
     DEFAULT_HOLIDAY_SETPOINT,
     SERVICE_SET_ZONE_OPERATING_MODE,
     SERVICE_SET_TIME_PROGRAM,
+    SERVICE_GET_TIME_PROGRAM,
     SERVICE_SET_COOLING_FOR_DAYS,
     SERVICE_CANCEL_COOLING_FOR_DAYS,
     HVAC_MODE_COOLING_FOR_DAYS,
@@ -116,54 +127,19 @@ async def async_setup_entry(
     coordinator: SystemCoordinator = hass.data[DOMAIN][config.entry_id][
         "system_coordinator"
     ]
-    if not coordinator.data:
-        _LOGGER.warning("No system data, skipping climate")
-        return
-
-    zone_entities: EntityList[ClimateEntity] = EntityList()
-    ventilation_entities: EntityList[ClimateEntity] = EntityList()
-    ambisense_entities: EntityList[ClimateEntity] = EntityList()
-
-    for index, system in enumerate(coordinator.data):
-        for zone_index, _ in enumerate(system.zones):
-            data_key = f"zone_{index}_{zone_index}"
-            if data_key not in hass.data[DOMAIN][config.entry_id]:
-                hass.data[DOMAIN][config.entry_id][data_key] = {}
-            zone_entities.append(
-                lambda: ZoneClimate(
-                    index,
-                    zone_index,
-                    coordinator,
-                    config,
-                    hass.data[DOMAIN][config.entry_id][data_key],
-                )
-            )
-
-        for room in system.ambisense_rooms:
-            ambisense_entities.append(
-                lambda: AmbisenseClimate(
-                    index,
-                    room.room_index,
-                    coordinator,
-                    config,
-                    hass.data[DOMAIN][config.entry_id][data_key],
-                )
-            )
-
-        for ventilation_index, _ in enumerate(system.ventilation):
-            ventilation_entities.append(
-                lambda: VentilationClimate(
-                    index,
-                    ventilation_index,
-                    coordinator,
-                )
-            )
-
-    async_add_entities(zone_entities)  # type: ignore
-    async_add_entities(ventilation_entities)  # type: ignore
-    async_add_entities(ambisense_entities)  # type: ignore
+    tracker = EntityTracker(
+        hass,
+        config,
+        coordinator,
+        async_add_entities,
+        partial(create_climates, hass, config),
+    )
+    await tracker.async_setup()
 
-    if len(zone_entities) > 0 or len(ambisense_entities) > 0:
+    if any(
+        isinstance(entity, (ZoneClimate, AmbisenseClimate))
+        for entity in tracker.entities
+    ):
         platform = entity_platform.async_get_current_platform()
         _LOGGER.debug("Setting up zone climate entity services for %s", platform)
         # noinspection PyTypeChecker
@@ -276,6 +252,12 @@ async def async_setup_entry(
             },
             "set_time_program",
         )
+        platform.async_register_entity_service(
+            SERVICE_GET_TIME_PROGRAM,
+            {},
+            "get_time_program",
+            supports_response=SupportsResponse.ONLY,
+        )
         # noinspection PyTypeChecker
         # Wrapping the schema in vol.Schema() breaks entity_id passing
         platform.async_register_entity_service(
@@ -319,7 +301,7 @@ async def async_setup_entry(
             "set_zone_operating_mode",
         )
 
-    if len(ventilation_entities) > 0:
+    if any(isinstance(entity, VentilationClimate) for entity in tracker.entities):
         platform = entity_platform.async_get_current_platform()
         _LOGGER.debug("Setting up ventilation climate entity services for %s", platform)
         # noinspection PyTypeChecker
@@ -341,7 +323,75 @@ async def async_setup_entry(
         )
 
 
-class ZoneClimate(CoordinatorEntity, ClimateEntity):
+async def create_climates(
+    hass: HomeAssistant,
+    config: ConfigEntry,
+    added: frozenset[ModelKey] | None = None,
+) -> list[ClimateEntity]:
+    coordinator: SystemCoordinator = hass.data[DOMAIN][config.entry_id][
+        "system_coordinator"
+    ]
+    if not coordinator.data:
+        _LOGGER.warning("No system data, skipping climate")
+        return []
+
+    zone_entities: EntityList[ClimateEntity] = EntityList()
+    ventilation_entities: EntityList[ClimateEntity] = EntityList()
+    ambisense_entities: EntityList[ClimateEntity] = EntityList()
+
+    model_index = coordinator.model_index
+    for index, system in enumerate(coordinator.data):
+        for zone_index, _ in enumerate(system.zones):
+            if not is_added(added, model_index.key(index, "zone", zone_index)):
+                continue
+            data_key = f"zone_{index}_{zone_index}"
+            if data_key not in hass.data[DOMAIN][config.entry_id]:
+                hass.data[DOMAIN][config.entry_id][data_key] = {}
+            zone_entities.append(
+                lambda: ZoneClimate(
+                    index,
+                    zone_index,
+                    coordinator,
+                    config,
+                    hass.data[DOMAIN][config.entry_id][data_key],
+                )
+            )
+
+        for room_position, room in enumerate(system.ambisense_rooms):
+            if not is_added(
+                added, model_index.key(index, "ambisense_room", room_position)
+            ):
+                continue
+            room_data_key = f"room_{index}_{room.room_index}"
+            if room_data_key not in hass.data[DOMAIN][config.entry_id]:
+                hass.data[DOMAIN][config.entry_id][room_data_key] = {}
+            ambisense_entities.append(
+                lambda: AmbisenseClimate(
+                    index,
+                    room.room_index,
+                    coordinator,
+                    config,
+                    hass.data[DOMAIN][config.entry_id][room_data_key],
+                )
+            )
+
+        for ventilation_index, _ in enumerate(system.ventilation):
+            if not is_added(
+                added, model_index.key(index, "ventilation", ventilation_index)
+            ):
+                continue
+            ventilation_entities.append(
+                lambda: VentilationClimate(
+                    index,
+                    ventilation_index,
+                    coordinator,
+                )
+            )
+
+    return [*zone_entities, *ventilation_entities, *ambisense_entities]
+
+
+class ZoneClimate(ChangeDetectingEntity, ClimateEntity):
     """Climate for a zone."""
 
     coordinator: SystemCoordinator
@@ -349,6 +399,8 @@ class ZoneClimate(CoordinatorEntity, ClimateEntity):
     _attr_temperature_unit = UnitOfTemperature.CELSIUS
     _attr_target_temperature_step = 0.5
     _enable_turn_on_off_backwards_compatibility = False
+    # Time programs are large and rarely change, they're available through the get_time_program service
+    _unrecorded_attributes = frozenset({"time_program_heating"})
 
     def __init__(
         self,
@@ -361,6 +413,8 @@ class ZoneClimate(CoordinatorEntity, ClimateEntity):
         super().__init__(coordinator)
         self.system_index = system_index
         self.zone_index = zone_index
+        self._system_key = coordinator.model_index.key(system_index, "system")
+        self._zone_key = coordinator.model_index.key(system_index, "zone", zone_index)
         self.config = config
         self.data = data
         self.data["last_active_hvac_mode"] = (
@@ -436,30 +490,56 @@ class ZoneClimate(CoordinatorEntity, ClimateEntity):
             OPTION_TIME_PROGRAM_OVERWRITE, DEFAULT_TIME_PROGRAM_OVERWRITE
         )
 
+    @property
+    def attribute_policy(self) -> str:
+        return self.config.options.get(
+            OPTION_CLIMATE_ATTRIBUTES, DEFAULT_CLIMATE_ATTRIBUTES
+        )
+
     @property
     def system(self) -> System:
-        return self.coordinator.data[self.system_index]
+        return self.coordinator.model_index[self._system_key]
 
     @property
     def zone(self) -> Zone:
-        return self.system.zones[self.zone_index]
+        return self.coordinator.model_index[self._zone_key]
 
-    @property
+    def fingerprint(self) -> tuple[Any, ...] | None:
+        return (
+            self.zone,
+            self.system.home,
+            self.system.brand_name,
+            self.system.control_identifier,
+            self.system.manual_cooling_ongoing,
+            self.zone.quick_veto_ongoing,
+            self.zone.general.holiday_ongoing,
+            self.zone.general.holiday_planned,
+        )
+
+    def identity(self) -> tuple[Any, ...] | None:
+        return (
+            self.system.home,
+            self.system.brand_name,
+            self.zone.name,
+            self.zone.associated_circuit_index,
+        )
+
+    @identity_property
     def circuit_name_suffix(self) -> str:
         if self.zone.associated_circuit_index is None:
             return ""
         else:
             return f" (Circuit {self.zone.associated_circuit_index})"
 
-    @property
+    @identity_property
     def name_prefix(self) -> str:
         return f"{self.system.home.home_name or self.system.home.nomenclature} Zone {shorten_zone_name(self.zone.name)}{self.circuit_name_suffix}"
 
-    @property
+    @identity_property
     def id_infix(self) -> str:
         return f"{self.system.id}_zone_{self.zone.index}"
 
-    @property
+    @identity_property
     def device_info(self) -> DeviceInfo:
         return DeviceInfo(
             identifiers={(DOMAIN, self.id_infix)},
@@ -467,24 +547,41 @@ class ZoneClimate(CoordinatorEntity, ClimateEntity):
             manufacturer=self.system.brand_name,
         )
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_climate"
 
-    @property
+    @identity_property
     def name(self) -> str:
         return f"{self.name_prefix} Climate"
 
     @property
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        if self.attribute_policy == "none":
+            return None
         attr = {
-            "time_program_heating": self.zone.heating.time_program_heating,
             "quick_veto_start_date_time": self.zone.quick_veto_start_date_time,
             "quick_veto_end_date_time": self.zone.quick_veto_end_date_time,
             "holiday_start_date_time": self.zone.general.holiday_start_date_time,
             "holiday_end_date_time": self.zone.general.holiday_end_date_time,
         }
-        return attr | self.zone.extra_fields
+        if self.attribute_policy == "summary":
+            return attr
+        return (
+            {"time_program_heating": self.zone.heating.time_program_heating}
+            | attr
+            | self.zone.extra_fields
+        )
+
+    async def get_time_program(self, **kwargs) -> ServiceResponse:
+        time_programs = {
+            "time_program_heating": self.zone.heating.time_program_heating,
+        }
+        if self.zone.cooling:
+            time_programs["time_program_cooling"] = (
+                self.zone.cooling.time_program_cooling
+            )
+        return prepare_field_value_for_dict(time_programs)
 
     @ensure_token_refresh
     async def set_holiday(self, **kwargs):
@@ -512,13 +609,13 @@ class ZoneClimate(CoordinatorEntity, ClimateEntity):
         await self.coordinator.api.set_holiday(
             self.system, start, end, setpoint=setpoint
         )
-        await self.coordinator.async_request_refresh_delayed(20)
+        await self.coordinator.async_request_refresh_delayed(REFRESH_DELAY_LONG)
 
     @ensure_token_refresh
     async def cancel_holiday(self):
         _LOGGER.debug("Canceling holiday on System %s", self.system.id)
         await self.coordinator.api.cancel_holiday(self.system)
-        await self.coordinator.async_request_refresh_delayed(20)
+        await self.coordinator.async_request_refresh_delayed(REFRESH_DELAY_LONG)
 
     @ensure_token_refresh
     async def set_cooling_for_days(self, **kwargs):
@@ -533,7 +630,7 @@ class ZoneClimate(CoordinatorEntity, ClimateEntity):
         await self.coordinator.api.set_cooling_for_days(
             self.system, start, end, duration_days
         )
-        await self.coordinator.async_request_refresh_delayed(20)
+        await self.coordinator.async_request_refresh_delayed(REFRESH_DELAY_LONG)
 
     @ensure_token_refresh
     async def cancel_cooling_for_days(self, **kwargs):
@@ -542,7 +639,7 @@ class ZoneClimate(CoordinatorEntity, ClimateEntity):
             self.system.id,
         )
         await self.coordinator.api.cancel_cooling_for_days(self.system)
-        await self.coordinator.async_request_refresh_delayed(20)
+        await self.coordinator.async_request_refresh_delayed(REFRESH_DELAY_LONG)
 
     @ensure_token_refresh
     async def set_ventilation_boost(self, **kwargs):
@@ -554,7 +651,7 @@ class ZoneClimate(CoordinatorEntity, ClimateEntity):
         if self.system.control_identifier.is_vrc700:
             raise ValueError("Can't set ventilation boost on VRC700 systems")
         await self.coordinator.api.set_ventilation_boost(self.system)
-        await self.coordinator.async_request_refresh_delayed(20)
+        await self.coordinator.async_request_refresh_delayed(REFRESH_DELAY_LONG)
 
     @ensure_token_refresh
     async def cancel_ventilation_boost(self, **kwargs):
@@ -565,7 +662,7 @@ class ZoneClimate(CoordinatorEntity, ClimateEntity):
         if self.system.control_identifier.is_vrc700:
             raise ValueError("Can't cancel ventilation boost on VRC700 systems")
         await self.coordinator.api.cancel_ventilation_boost(self.system)
-        await self.coordinator.async_request_refresh_delayed(20)
+        await self.coordinator.async_request_refresh_delayed(REFRESH_DELAY_LONG)
 
     @ensure_token_refresh
     async def set_time_program(self, **kwargs):
@@ -615,7 +712,7 @@ class ZoneClimate(CoordinatorEntity, ClimateEntity):
         await self.coordinator.api.set_time_controlled_cooling_setpoint(
             self.zone, temperature
         )
-        await self.coordinator.async_request_refresh_delayed(10)
+        await self.coordinator.async_request_refresh_delayed(REFRESH_DELAY_MEDIUM)
 
     @ensure_token_refresh
     async def remove_quick_veto(self):
@@ -685,10 +782,10 @@ class ZoneClimate(CoordinatorEntity, ClimateEntity):
             if not self.system.manual_cooling_ongoing:
                 await self.set_cooling_for_days()
         else:
-            refresh_delay = 10
+            refresh_delay = REFRESH_DELAY_MEDIUM
             if self.system.manual_cooling_ongoing:
                 await self.coordinator.api.cancel_cooling_for_days(self.system)
-                refresh_delay = 20
+                refresh_delay = REFRESH_DELAY_LONG
             mode = [k for k, v in self.hvac_mode_map.items() if v == hvac_mode][0]
             await self.set_zone_operating_mode(
                 mode, self.zone.active_operating_type, refresh_delay=refresh_delay
@@ -726,11 +823,27 @@ class ZoneClimate(CoordinatorEntity, ClimateEntity):
             self.zone.name,
             mode,
         )
-        await self.coordinator.api.set_zone_operating_mode(
-            self.zone,
-            mode,
-            operating_type,
-        )
+        key = (self.unique_id, f"{operating_type}_operation_mode")
+        if getattr(self.zone, str(operating_type), None):
+            mode_enum = (
+                ZoneOperatingModeVRC700(mode)
+                if self.zone.control_identifier.is_vrc700
+                else ZoneOperatingMode(mode)
+            )
+            self.coordinator.optimistic.apply(
+                key,
+                self.zone,
+                {f"{operating_type}.operation_mode_{operating_type}": mode_enum},
+            )
+        try:
+            await self.coordinator.api.set_zone_operating_mode(
+                self.zone,
+                mode,
+                operating_type,
+            )
+        except Exception:
+            self.coordinator.optimistic.rollback(key)
+            raise
         await self.coordinator.async_request_refresh_delayed(delay=refresh_delay)
 
     @property
@@ -781,11 +894,19 @@ class ZoneClimate(CoordinatorEntity, ClimateEntity):
             else:
                 _LOGGER.warning("Can't determine operation type on %s", self.zone.name)
 
+        api = self.coordinator.api
+        commands: list[Awaitable[None]] = []
+        # Determined before any optimistic values change the setpoints
+        heating_active = (
+            self.zone.active_operating_type == ZoneOperatingType.HEATING
+            or not self.zone.cooling
+        )
         if (
             target_temp_low is not None
             and target_temp_low != self.zone.desired_room_temperature_setpoint_heating
         ):
             # Heating temperature
+            heating_command: Callable[[], Awaitable[Any]]
             if self.zone.heating.operation_mode_heating in (
                 ZoneOperatingMode.MANUAL,
                 ZoneOperatingModeVRC700.DAY,
@@ -793,29 +914,52 @@ class ZoneClimate(CoordinatorEntity, ClimateEntity):
                 _LOGGER.debug(
                     "Setting heating manual temperature on %s to %s",
                     self.zone.name,
-                    target_temp_high,
+                    target_temp_low,
+                )
+                heating_command = partial(
+                    api.set_manual_mode_setpoint,
+                    self.zone,
+                    target_temp_low,
+                    DEFAULT_MANUAL_SETPOINT_TYPE,
+                )
+            elif self.time_program_overwrite and not self.preset_mode == PRESET_BOOST:
+                _LOGGER.debug(
+                    "Setting heating time program temperature in %s to %s",
+                    self.zone.name,
+                    target_temp_low,
+                )
+                heating_command = partial(
+                    api.set_time_program_temperature,
+                    self.zone,
+                    "heating",
+                    temperature=target_temp_low,
                 )
-                await self.set_manual_mode_setpoint(temperature=target_temp_low)
             else:
-                if self.time_program_overwrite and not self.preset_mode == PRESET_BOOST:
-                    _LOGGER.debug(
-                        "Setting heating time program temperature in %s to %s",
-                        self.zone.name,
-                        target_temp_low,
-                    )
-                    await self.coordinator.api.set_time_program_temperature(
-                        self.zone,
-                        "heating",
-                        temperature=target_temp_low,
-                    )
-                    await self.coordinator.async_request_refresh_delayed()
-                else:
-                    _LOGGER.debug(
-                        "Setting quick veto on %s to %s",
-                        self.zone.name,
-                        target_temp_low,
-                    )
-                    await self.set_quick_veto(temperature=target_temp_low)
+                _LOGGER.debug(
+                    "Setting quick veto on %s to %s",
+                    self.zone.name,
+                    target_temp_low,
+                )
+                heating_command = partial(
+                    api.quick_veto_zone_temperature,
+                    self.zone,
+                    target_temp_low,
+                    None,
+                    self.default_quick_veto_duration,
+                )
+            heating_values = {
+                "desired_room_temperature_setpoint_heating": target_temp_low
+            }
+            if heating_active:
+                heating_values["desired_room_temperature_setpoint"] = target_temp_low
+            self.coordinator.optimistic.apply(
+                (self.unique_id, "heating"), self.zone, heating_values
+            )
+            commands.append(
+                self.coordinator.command_queue.async_submit(
+                    (self.unique_id, "heating"), heating_command
+                )
+            )
 
         if (
             target_temp_high is not None
@@ -823,15 +967,19 @@ class ZoneClimate(CoordinatorEntity, ClimateEntity):
             and target_temp_high != self.zone.desired_room_temperature_setpoint_cooling
         ):
             # Cooling temperature
+            cooling_command: Callable[[], Awaitable[Any]] | None = None
+            refresh_delay = None
             if self.zone.cooling.operation_mode_cooling == ZoneOperatingMode.MANUAL:
                 _LOGGER.debug(
                     "Setting cooling manual temperature on %s to %s",
                     self.zone.name,
                     target_temp_high,
                 )
-                await self.set_manual_mode_setpoint(
-                    temperature=target_temp_high,
-                    setpoint_type="cooling",
+                cooling_command = partial(
+                    api.set_manual_mode_setpoint,
+                    self.zone,
+                    target_temp_high,
+                    "cooling",
                 )
             elif (
                 self.zone.cooling.operation_mode_cooling
@@ -842,9 +990,12 @@ class ZoneClimate(CoordinatorEntity, ClimateEntity):
                     self.zone.name,
                     target_temp_high,
                 )
-                await self.set_time_controlled_cooling_setpoint(
-                    temperature=target_temp_high
+                cooling_command = partial(
+                    api.set_time_controlled_cooling_setpoint,
+                    self.zone,
+                    target_temp_high,
                 )
+                refresh_delay = REFRESH_DELAY_MEDIUM
             elif (
                 self.zone.cooling.operation_mode_cooling == ZoneOperatingModeVRC700.DAY
             ):
@@ -853,13 +1004,36 @@ class ZoneClimate(CoordinatorEntity, ClimateEntity):
                     self.zone.name,
                     target_temp_high,
                 )
-                await self.coordinator.api.aiohttp_session.patch(
-                    f"{await self.coordinator.api.get_system_api_base(self.zone.system_id)}"
-                    f"/zone/{self.zone.index}/cooling/setpoint",
-                    json={"setpoint": target_temp_high},
-                    headers=self.coordinator.api.get_authorized_headers(),
+                cooling_command = partial(
+                    self._set_vrc700_cooling_setpoint, target_temp_high
+                )
+            if cooling_command is not None:
+                cooling_values = {
+                    "desired_room_temperature_setpoint_cooling": target_temp_high
+                }
+                if not heating_active:
+                    cooling_values["desired_room_temperature_setpoint"] = (
+                        target_temp_high
+                    )
+                self.coordinator.optimistic.apply(
+                    (self.unique_id, "cooling"), self.zone, cooling_values
+                )
+                commands.append(
+                    self.coordinator.command_queue.async_submit(
+                        (self.unique_id, "cooling"), cooling_command, refresh_delay
+                    )
                 )
-                await self.coordinator.async_request_refresh_delayed()
+
+        # Both setpoints are sent in the same batch, followed by a single refresh
+        await asyncio.gather(*commands)
+
+    async def _set_vrc700_cooling_setpoint(self, temperature: float) -> None:
+        await self.coordinator.api.aiohttp_session.patch(
+            f"{await self.coordinator.api.get_system_api_base(self.zone.system_id)}"
+            f"/zone/{self.zone.index}/cooling/setpoint",
+            json={"setpoint": temperature},
+            headers=self.coordinator.api.get_authorized_headers(),
+        )
 
     @property
     def preset_modes(self) -> list[str]:
@@ -981,6 +1155,7 @@ class AmbisenseClimate(AmbisenseCoordinatorEntity, ClimateEntity):
     )
     _attr_preset_modes = AMBISENSE_ROOM_PRESETS
     _enable_turn_on_off_backwards_compatibility = False
+    _unrecorded_attributes = frozenset({"time_program", "devices"})
 
     def __init__(
         self,
@@ -1023,19 +1198,35 @@ class AmbisenseClimate(AmbisenseCoordinatorEntity, ClimateEntity):
         )
 
     @property
+    def attribute_policy(self) -> str:
+        return self.config.options.get(
+            OPTION_CLIMATE_ATTRIBUTES, DEFAULT_CLIMATE_ATTRIBUTES
+        )
+
+    @identity_property
     def name(self) -> str:
         return self.name_prefix
 
     @property
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        if self.attribute_policy == "none":
+            return None
         attr = {
-            "time_program": self.room.time_program,
             "quick_veto_end_date_time": self.room.room_configuration.quick_veto_end_time,
             "window_state": self.room.room_configuration.window_state,
             "button_lock": self.room.room_configuration.button_lock,
-            "devices": [asdict(d) for d in self.room.room_configuration.devices],
         }
-        return attr | self.room.extra_fields
+        if self.attribute_policy == "summary":
+            return attr
+        return (
+            {"time_program": self.room.time_program}
+            | attr
+            | {"devices": [asdict(d) for d in self.room.room_configuration.devices]}
+            | self.room.extra_fields
+        )
+
+    async def get_time_program(self, **kwargs) -> ServiceResponse:
+        return prepare_field_value_for_dict({"time_program": self.room.time_program})
 
     @ensure_token_refresh
     async def set_quick_veto(self, **kwargs):
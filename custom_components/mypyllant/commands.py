@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.mypyllant.const import (
+    COMMAND_QUEUE_WINDOW,
+    DEFAULT_REFRESH_DELAY,
+    DOMAIN,
+    OPTION_REFRESH_DELAY,
+)
+
+if TYPE_CHECKING:
+    from custom_components.mypyllant.coordinator import SystemCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+Command = Callable[[], Awaitable[Any]]
+
+
+class CommandQueue:
+    """
+    Collects API writes for a short time. Repeated writes to the same target only send the last value,
+    and the whole batch is followed by a single refresh.
+
+    Values that were applied optimistically with the same key are rolled back if their command fails.
+    """
+
+    def __init__(self, coordinator: SystemCoordinator) -> None:
+        self.coordinator = coordinator
+        self._commands: dict[Hashable, tuple[Command, int | None]] = {}
+        self._waiters: dict[Hashable, list[asyncio.Future[None]]] = {}
+        # The flush that still collects commands, and all flushes that haven't finished yet
+        self._flush_task: asyncio.Task | None = None
+        self._flush_tasks: set[asyncio.Task] = set()
+
+    async def async_submit(
+        self,
+        key: Hashable,
+        command: Command,
+        refresh_delay: int | None = None,
+    ) -> None:
+        """
+        Queues a command, replacing a pending command with the same key, and waits until it was sent
+
+        Parameters:
+            key: Identifies the written value, i.e. (unique_id, "heating")
+            command: Coroutine function that calls the API
+            refresh_delay: Seconds to wait before refreshing, defaults to the refresh delay option
+        """
+        if key in self._commands:
+            _LOGGER.debug("Replacing pending command %s", key)
+            # Re-insert, so the batch keeps the order of the latest writes
+            del self._commands[key]
+        self._commands[key] = (command, refresh_delay)
+        waiter: asyncio.Future[None] = self.coordinator.hass.loop.create_future()
+        self._waiters.setdefault(key, []).append(waiter)
+        if self._flush_task is None:
+            self._flush_task = self.coordinator.hass.async_create_task(
+                self._async_flush(), f"{DOMAIN}_command_queue"
+            )
+            self._flush_tasks.add(self._flush_task)
+            self._flush_task.add_done_callback(self._flush_tasks.discard)
+        await waiter
+
+    async def async_shutdown(self) -> None:
+        """
+        Cancels pending and running flushes, their callers get an error for commands that weren't sent
+        """
+        tasks = list(self._flush_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _take_batch(
+        self,
+    ) -> tuple[
+        dict[Hashable, tuple[Command, int | None]],
+        dict[Hashable, list[asyncio.Future[None]]],
+    ]:
+        commands, self._commands = self._commands, {}
+        waiters, self._waiters = self._waiters, {}
+        self._flush_task = None
+        return commands, waiters
+
+    async def _async_flush(self) -> None:
+        commands: dict[Hashable, tuple[Command, int | None]] = {}
+        waiters: dict[Hashable, list[asyncio.Future[None]]] = {}
+        errors: dict[Hashable, Exception] = {}
+        sent: set[Hashable] = set()
+        try:
+            await asyncio.sleep(COMMAND_QUEUE_WINDOW)
+            commands, waiters = self._take_batch()
+
+            default_delay = self.coordinator.entry.options.get(
+                OPTION_REFRESH_DELAY, DEFAULT_REFRESH_DELAY
+            )
+            refresh_delays: list[int] = []
+            for key, (command, refresh_delay) in commands.items():
+                _LOGGER.debug("Sending command %s", key)
+                try:
+                    await command()
+                except Exception as e:  # noqa: BLE001
+                    errors[key] = e
+                    self.coordinator.optimistic.rollback(key)
+                else:
+                    sent.add(key)
+                    refresh_delays.append(
+                        refresh_delay if refresh_delay is not None else default_delay
+                    )
+            if refresh_delays:
+                await self.coordinator.async_request_refresh_delayed(
+                    max(refresh_delays)
+                )
+        finally:
+            if self._flush_task is asyncio.current_task():
+                # Cancelled while still collecting commands
+                commands, waiters = self._take_batch()
+            for key in commands:
+                if key not in sent and key not in errors:
+                    errors[key] = HomeAssistantError(f"Command {key} was not sent")
+                    self.coordinator.optimistic.rollback(key)
+            for key, key_waiters in waiters.items():
+                for waiter in key_waiters:
+                    if waiter.done():
+                        # The caller was cancelled
+                        continue
+                    if key in errors:
+                        waiter.set_exception(errors[key])
+                    else:
+                        waiter.set_result(None)
@@ -18,6 +18,7 @@ from myPyllant.http_client import (
     LoginEndpointInvalid,
     RealmInvalid,
 )
+from myPyllant.enums import DeviceDataBucketResolution
 from myPyllant.const import (
     BRANDS,
     COUNTRIES,
@@ -30,6 +31,9 @@ from . import OPTION_UPDATE_INTERVAL_DAILY
 from .const import (
     DEFAULT_REFRESH_DELAY,
     DEFAULT_TIME_PROGRAM_OVERWRITE,
+    OPTION_CLIMATE_ATTRIBUTES,
+    DEFAULT_CLIMATE_ATTRIBUTES,
+    CLIMATE_ATTRIBUTE_POLICIES,
     DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
     OPTION_BRAND,
@@ -61,6 +65,16 @@ from .const import (
     DEFAULT_FETCH_DTC,
     OPTION_FETCH_AMBISENSE_CAPABILITY,
     DEFAULT_FETCH_AMBISENSE_CAPABILITY,
+    OPTION_DAILY_DATA_CONCURRENCY,
+    DEFAULT_DAILY_DATA_CONCURRENCY,
+    OPTION_DAILY_DATA_INCREMENTAL,
+    DEFAULT_DAILY_DATA_INCREMENTAL,
+    OPTION_DAILY_DATA_RESOLUTION,
+    DEFAULT_DAILY_DATA_RESOLUTION,
+    OPTION_UPDATE_INTERVAL_DIAGNOSTICS,
+    DEFAULT_UPDATE_INTERVAL_DIAGNOSTICS,
+    OPTION_UPDATE_INTERVAL_CAPABILITIES,
+    DEFAULT_UPDATE_INTERVAL_CAPABILITIES,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -84,6 +98,15 @@ _COUNTRIES_OPTIONS = [
 _BRANDS_OPTIONS = [
     selector.SelectOptionDict(value=k, label=v) for k, v in BRANDS.items()
 ]
+# Coarser totals (day, month, year) are rolled up locally, so only fine resolutions are requested
+_DAILY_DATA_RESOLUTION_OPTIONS = [
+    selector.SelectOptionDict(value=v.value, label=v.value.title())
+    for v in (DeviceDataBucketResolution.HOUR, DeviceDataBucketResolution.DAY)
+]
+_CLIMATE_ATTRIBUTES_OPTIONS = [
+    selector.SelectOptionDict(value=v, label=v.title())
+    for v in CLIMATE_ATTRIBUTE_POLICIES
+]
 
 DATA_SCHEMA = vol.Schema(
     {
@@ -116,6 +139,31 @@ OPTIONS_SCHEMA = vol.Schema(
         vol.Optional(
             OPTION_UPDATE_INTERVAL_DAILY,
         ): positive_int,
+        vol.Required(
+            OPTION_UPDATE_INTERVAL_DIAGNOSTICS,
+            default=DEFAULT_UPDATE_INTERVAL_DIAGNOSTICS,
+        ): positive_int,
+        vol.Required(
+            OPTION_UPDATE_INTERVAL_CAPABILITIES,
+            default=DEFAULT_UPDATE_INTERVAL_CAPABILITIES,
+        ): positive_int,
+        vol.Required(
+            OPTION_DAILY_DATA_CONCURRENCY,
+            default=DEFAULT_DAILY_DATA_CONCURRENCY,
+        ): vol.All(vol.Coerce(int), vol.Clamp(min=1, max=10)),
+        vol.Required(
+            OPTION_DAILY_DATA_INCREMENTAL,
+            default=DEFAULT_DAILY_DATA_INCREMENTAL,
+        ): bool,
+        vol.Required(
+            OPTION_DAILY_DATA_RESOLUTION,
+            default=str(DEFAULT_DAILY_DATA_RESOLUTION),
+        ): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=_DAILY_DATA_RESOLUTION_OPTIONS,
+                mode=selector.SelectSelectorMode.LIST,
+            ),
+        ),
         vol.Required(
             OPTION_REFRESH_DELAY,
             default=DEFAULT_REFRESH_DELAY,
@@ -140,6 +188,15 @@ OPTIONS_SCHEMA = vol.Schema(
             OPTION_TIME_PROGRAM_OVERWRITE,
             default=DEFAULT_TIME_PROGRAM_OVERWRITE,
         ): bool,
+        vol.Required(
+            OPTION_CLIMATE_ATTRIBUTES,
+            default=DEFAULT_CLIMATE_ATTRIBUTES,
+        ): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=_CLIMATE_ATTRIBUTES_OPTIONS,
+                mode=selector.SelectSelectorMode.LIST,
+            ),
+        ),
         vol.Required(
             OPTION_DEFAULT_DHW_LEGIONELLA_PROTECTION_TEMPERATURE,
             default=DEFAULT_DHW_LEGIONELLA_PROTECTION_TEMPERATURE,
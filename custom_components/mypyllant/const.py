@@ -1,8 +1,10 @@
-from myPyllant.enums import ZoneOperatingType
+from myPyllant.enums import DeviceDataBucketResolution, ZoneOperatingType
 
 DOMAIN = "mypyllant"
 OPTION_UPDATE_INTERVAL = "update_interval"
 OPTION_UPDATE_INTERVAL_DAILY = "update_interval_daily"
+OPTION_UPDATE_INTERVAL_DIAGNOSTICS = "update_interval_diagnostics"
+OPTION_UPDATE_INTERVAL_CAPABILITIES = "update_interval_capabilities"
 OPTION_REFRESH_DELAY = "refresh_delay"
 OPTION_DEFAULT_QUICK_VETO_DURATION = "quick_veto_duration"
 OPTION_DEFAULT_HOLIDAY_DURATION = "holiday_duration"
@@ -22,9 +24,17 @@ OPTION_FETCH_AMBISENSE_ROOMS = "fetch_ambisense_rooms"
 OPTION_FETCH_ENERGY_MANAGEMENT = "fetch_energy_management"
 OPTION_FETCH_EEBUS = "fetch_eebus"
 OPTION_FETCH_AMBISENSE_CAPABILITY = "fetch_ambisense_capability"
+OPTION_DAILY_DATA_CONCURRENCY = "daily_data_concurrency"
+OPTION_DAILY_DATA_INCREMENTAL = "daily_data_incremental"
+OPTION_DAILY_DATA_RESOLUTION = "daily_data_resolution"
+OPTION_CLIMATE_ATTRIBUTES = "climate_attributes"
 DEFAULT_UPDATE_INTERVAL = 30 * 60  # in seconds
 DEFAULT_UPDATE_INTERVAL_DAILY = None  # Optional, in seconds
+DEFAULT_UPDATE_INTERVAL_DIAGNOSTICS = 2 * 3600  # in seconds
+DEFAULT_UPDATE_INTERVAL_CAPABILITIES = 24 * 3600  # in seconds
 DEFAULT_REFRESH_DELAY = 5  # in seconds
+REFRESH_DELAY_MEDIUM = 10  # in seconds, for changes the API takes longer to reflect
+REFRESH_DELAY_LONG = 20  # in seconds, i.e. for operating modes and holidays
 DEFAULT_MANUAL_COOLING_DURATION = 30  # in days
 DEFAULT_COUNTRY = "germany"
 DEFAULT_TIME_PROGRAM_OVERWRITE = False
@@ -37,11 +47,44 @@ DEFAULT_FETCH_EEBUS = False
 DEFAULT_FETCH_AMBISENSE_ROOMS = False
 DEFAULT_FETCH_ENERGY_MANAGEMENT = False
 DEFAULT_FETCH_AMBISENSE_CAPABILITY = False
+DEFAULT_DAILY_DATA_CONCURRENCY = 3  # parallel device requests for energy data
+DEFAULT_DAILY_DATA_INCREMENTAL = False
+DEFAULT_DAILY_DATA_RESOLUTION = DeviceDataBucketResolution.HOUR
+DEFAULT_CLIMATE_ATTRIBUTES = "full"
+# Extra state attributes of climate entities: everything, only quick veto and holiday dates, or none at all
+CLIMATE_ATTRIBUTE_POLICIES = ("full", "summary", "none")
+DAILY_DATA_SETTLE_TIME = 2 * 3600  # in seconds, after which an hourly bucket is final
 DEFAULT_MANUAL_SETPOINT_TYPE = ZoneOperatingType.HEATING
 DEFAULT_DHW_LEGIONELLA_PROTECTION_TEMPERATURE = 70.0
 QUOTA_PAUSE_INTERVAL = 3 * 3600  # in seconds
 API_DOWN_PAUSE_INTERVAL = 15 * 60  # in seconds
+API_BUDGET_WINDOW = 3600  # in seconds, rolling window for counting API calls
+API_BUDGET_SAFETY_MARGIN = 0.8  # share of the learned quota that may be used at all
+API_BUDGET_WRITE_RESERVE = 0.2  # share of the usable quota that is kept for writes
+API_BUDGET_STRETCH_THRESHOLD = (
+    0.5  # share of the background budget after which intervals get longer
+)
+API_BUDGET_MAX_STRETCH = 4  # maximum factor for lengthening update intervals
+SNAPSHOT_SAVE_DELAY = 60  # in seconds
+BACKFILL_CHUNK_DAYS = 7  # days of hourly energy data per backfill request
+BACKFILL_REQUEST_INTERVAL = 10  # in seconds, between backfill requests
+BACKFILL_BUDGET_WAIT = 5 * 60  # in seconds, until the API budget is checked again
+GAP_SCAN_INTERVAL = 6 * 3600  # in seconds, between scans for missing statistics
+GAP_SCAN_DAYS = 7  # days before the current window that are scanned for gaps
+EXPORT_CHUNK_DAYS = {  # days of energy data per request of a file export
+    DeviceDataBucketResolution.HOUR: 7,
+    DeviceDataBucketResolution.DAY: 366,
+    DeviceDataBucketResolution.MONTH: 3660,
+}
+EXPORT_DIRECTORY = "mypyllant"  # in the config directory
+COMMAND_QUEUE_WINDOW = 1.5  # in seconds, writes within this window are sent together
+# Written values that the API doesn't return are dropped after this time
+OPTIMISTIC_STATE_TIMEOUT = 5 * 60  # in seconds
+# Models that are missing from the API for this many updates in a row are removed with their entities
+MODEL_REMOVAL_UPDATES = 3
 HVAC_MODE_COOLING_FOR_DAYS = "COOLING_FOR_DAYS"
+SYSTEM_TIER_DIAGNOSTICS = "diagnostics"  # connection status & trouble codes
+SYSTEM_TIER_CAPABILITIES = "capabilities"  # EEBUS & Ambisense capability
 DHW_LEGIONELLA_PROTECTION_DATETIME = "dhw_legionella_protection_datetime"
 
 SERVICE_SET_QUICK_VETO = "set_quick_veto"
@@ -64,6 +107,9 @@ SERVICE_SET_VENTILATION_FAN_STAGE = "set_ventilation_fan_stage"
 SERVICE_EXPORT = "export"
 SERVICE_GENERATE_TEST_DATA = "generate_test_data"
 SERVICE_REPORT = "report"
+SERVICE_BACKFILL_STATISTICS = "backfill_statistics"
+SERVICE_EXPORT_FILE = "export_file"
+SERVICE_GET_TIME_PROGRAM = "get_time_program"
 
 WEEKDAYS_TO_RFC5545 = {
     "monday": "MO",
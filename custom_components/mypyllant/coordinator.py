@@ -3,20 +3,25 @@ from __future__ import annotations
 import asyncio
 import logging
 from asyncio import CancelledError
-from datetime import timedelta, datetime as dt, timezone
-from typing import TypedDict
+from collections.abc import Awaitable, Callable
+from collections import defaultdict
+from datetime import date, timedelta, datetime as dt, timezone
+from typing import Any, TypedDict
 
 from aiohttp import ClientResponseError
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_call_later
 
 from custom_components.mypyllant.const import (
+    API_BUDGET_WINDOW,
     DOMAIN,
+    MODEL_REMOVAL_UPDATES,
     OPTION_REFRESH_DELAY,
     DEFAULT_REFRESH_DELAY,
-    QUOTA_PAUSE_INTERVAL,
     API_DOWN_PAUSE_INTERVAL,
     OPTION_FETCH_MPC,
     OPTION_FETCH_RTS,
@@ -34,14 +39,37 @@ from custom_components.mypyllant.const import (
     DEFAULT_FETCH_CONNECTION_STATUS,
     OPTION_FETCH_DTC,
     DEFAULT_FETCH_DTC,
+    OPTION_DAILY_DATA_CONCURRENCY,
+    DEFAULT_DAILY_DATA_CONCURRENCY,
+    OPTION_DAILY_DATA_INCREMENTAL,
+    DEFAULT_DAILY_DATA_INCREMENTAL,
+    OPTION_DAILY_DATA_RESOLUTION,
+    DEFAULT_DAILY_DATA_RESOLUTION,
+    DAILY_DATA_SETTLE_TIME,
+    OPTION_UPDATE_INTERVAL_DIAGNOSTICS,
+    DEFAULT_UPDATE_INTERVAL_DIAGNOSTICS,
+    OPTION_UPDATE_INTERVAL_CAPABILITIES,
+    DEFAULT_UPDATE_INTERVAL_CAPABILITIES,
+    SYSTEM_TIER_DIAGNOSTICS,
+    SYSTEM_TIER_CAPABILITIES,
 )
+from custom_components.mypyllant.commands import CommandQueue
+from custom_components.mypyllant.model_index import ModelIndex, ModelKey
+from custom_components.mypyllant.optimistic import OptimisticState
+from custom_components.mypyllant.quota import ApiBudget, QuotaController
+from custom_components.mypyllant.statistics import StatisticsWriter
+from custom_components.mypyllant.totals import DailyTotals, PeriodTotals
 from custom_components.mypyllant.utils import (
     is_quota_exceeded_exception,
-    extract_quota_duration,
 )
 from myPyllant.api import AmbisenseNoFacilityError, MyPyllantAPI
 from myPyllant.enums import DeviceDataBucketResolution
-from myPyllant.models import System, DeviceData, Home
+from myPyllant.http_client import (
+    AuthenticationFailed,
+    LoginEndpointInvalid,
+    RealmInvalid,
+)
+from myPyllant.models import System, DeviceData, Home, Device
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -59,9 +87,9 @@ class MyPyllantCoordinator(DataUpdateCoordinator):
         self.api = api
         self.hass = hass
         self.entry = entry
-        self._quota_hit_time_key = f"quota_time_{self.__class__.__name__.lower()}"
-        self._quota_end_time_key = f"quota_end_time_{self.__class__.__name__.lower()}"
-        self._quota_exc_info_key = f"quota_exc_info_{self.__class__.__name__.lower()}"
+        self._base_update_interval = update_interval
+        self._refresh_deadline: float | None = None
+        self._unsub_delayed_refresh: Callable[[], None] | None = None
 
         super().__init__(
             hass,
@@ -75,63 +103,75 @@ class MyPyllantCoordinator(DataUpdateCoordinator):
         return self.hass.data[DOMAIN][self.entry.entry_id]
 
     @property
-    def _quota_hit_time(self) -> dt | None:
+    def quota(self) -> QuotaController:
         """
-        Get the time when the quota was hit, separately for each subclass
+        Get the quota state of the account, shared between all coordinators and entity actions
         """
-        if self._quota_hit_time_key not in self.hass_data:
-            self.hass_data[self._quota_hit_time_key] = None
-        return self.hass_data[self._quota_hit_time_key]
+        if "quota" not in self.hass_data:
+            self.hass_data["quota"] = QuotaController(self.api)
+        return self.hass_data["quota"]
 
-    @_quota_hit_time.setter
-    def _quota_hit_time(self, value):
-        self.hass_data[self._quota_hit_time_key] = value
+    @property
+    def api_budget(self) -> ApiBudget:
+        return self.quota.budget
 
-    @_quota_hit_time.deleter
-    def _quota_hit_time(self):
-        del self.hass_data[self._quota_hit_time_key]
+    @property
+    def _quota_hit_time(self) -> dt | None:
+        return self.quota.hit_time
 
     @property
     def _quota_end_time(self) -> dt | None:
-        """
-        Get the time when the quota was hit, separately for each subclass
-        """
-        if self._quota_end_time_key not in self.hass_data:
-            self.hass_data[self._quota_end_time_key] = None
-        return self.hass_data[self._quota_end_time_key]
-
-    @_quota_end_time.setter
-    def _quota_end_time(self, value):
-        self.hass_data[self._quota_end_time_key] = value
-
-    @_quota_end_time.deleter
-    def _quota_end_time(self):
-        del self.hass_data[self._quota_end_time_key]
+        return self.quota.end_time
 
     @property
     def _quota_exc_info(self) -> BaseException | None:
+        return self.quota.exc_info
+
+    def _skip_for_budget(self) -> bool:
         """
-        Get the exception that happened when the quota was hit, separately for each subclass
+        Check if a background update would use up the calls that are kept for writes
+        Updates are only skipped if there is previous data to keep showing
         """
-        if self._quota_exc_info_key not in self.hass_data:
-            self.hass_data[self._quota_exc_info_key] = None
-        return self.hass_data[self._quota_exc_info_key]
-
-    @_quota_exc_info.setter
-    def _quota_exc_info(self, value):
-        self.hass_data[self._quota_exc_info_key] = value
+        self._stretch_update_interval()
+        if self.data is None or self.api_budget.allows_background_update():
+            return False
+        _LOGGER.info(
+            "Used %s of %s API calls for background updates in the last %ss, "
+            "skipping update of myVAILLANT %s",
+            self.api_budget.calls_in_window,
+            self.api_budget.background_limit,
+            API_BUDGET_WINDOW,
+            self.__class__.__name__,
+        )
+        return True
 
-    @_quota_exc_info.deleter
-    def _quota_exc_info(self):
-        del self.hass_data[self._quota_exc_info_key]
+    def _stretch_update_interval(self) -> None:
+        """
+        Lengthen the update interval when the account gets close to its API quota
+        """
+        self.api_budget.record()
+        interval = self.api_budget.stretch(self._base_update_interval)
+        if interval != self.update_interval:
+            _LOGGER.debug(
+                "Changing update interval of %s to %s",
+                self.__class__.__name__,
+                interval,
+            )
+            self.update_interval = interval
 
     def _clear_quota_state(self) -> None:
         """Clear all quota-related state to allow fresh retries."""
-        self._quota_hit_time = None
-        self._quota_end_time = None
-        self._quota_exc_info = None
+        self.quota.clear()
 
     async def _refresh_session(self):
+        if not self.api.oauth_session:
+            # Not logged in yet, if the entry was set up from a snapshot
+            _LOGGER.debug("Logging in with %s", self.api.username)
+            try:
+                await self.api.login()
+            except (AuthenticationFailed, LoginEndpointInvalid, RealmInvalid) as e:
+                raise ConfigEntryAuthFailed from e
+            return
         if (
             self.api.oauth_session_expires is None
             or self.api.oauth_session_expires
@@ -152,30 +192,61 @@ class MyPyllantCoordinator(DataUpdateCoordinator):
     async def async_request_refresh_delayed(self, delay=None):
         """
         The API takes a long time to return updated values (i.e. after setting a new heating mode)
-        This function waits for a few second and then refreshes
+        This function schedules a refresh after a few seconds and returns immediately
+
+        There is only one pending refresh, further calls push it back to the latest requested time
         """
 
         # API calls sometimes update the models, so we update the data before waiting for the refresh
         # to see immediate changes in the UI
         self.async_set_updated_data(self.data)
-        if not delay:
+        if delay is None:
             delay = self.entry.options.get(OPTION_REFRESH_DELAY, DEFAULT_REFRESH_DELAY)
-        if delay:
-            _LOGGER.debug("Waiting %ss before refreshing data", delay)
-            await asyncio.sleep(delay)
+        deadline = self.hass.loop.time() + delay
+        if self._refresh_deadline is not None and deadline <= self._refresh_deadline:
+            _LOGGER.debug("Refresh is already scheduled in at least %ss", delay)
+            return
+        if not delay:
+            await self.async_request_refresh()
+            return
+        self._cancel_delayed_refresh()
+        _LOGGER.debug("Scheduling refresh in %ss", delay)
+        self._refresh_deadline = deadline
+        self._unsub_delayed_refresh = async_call_later(
+            self.hass,
+            delay,
+            HassJob(
+                self._async_handle_delayed_refresh,
+                f"{DOMAIN} {self.__class__.__name__} delayed refresh",
+                cancel_on_shutdown=True,
+            ),
+        )
+
+    async def _async_handle_delayed_refresh(self, _now: dt) -> None:
+        self._unsub_delayed_refresh = None
+        self._refresh_deadline = None
         await self.async_request_refresh()
 
+    def _cancel_delayed_refresh(self) -> None:
+        if self._unsub_delayed_refresh is not None:
+            self._unsub_delayed_refresh()
+            self._unsub_delayed_refresh = None
+        self._refresh_deadline = None
+
+    async def async_shutdown(self) -> None:
+        self._cancel_delayed_refresh()
+        await super().async_shutdown()
+
     def _raise_api_down(self, exc_info: CancelledError | TimeoutError) -> None:
         """
         Raises UpdateFailed if a TimeoutError or CancelledError occurred during updating
 
         Sets a quota time, so the API isn't queried as often while it is down
         """
-        self._quota_hit_time = dt.now(timezone.utc)
-        self._quota_exc_info = exc_info
+        self.quota.set_api_down(exc_info)
         raise UpdateFailed(
             f"myVAILLANT API is down, skipping update of myVAILLANT {self.__class__.__name__} "
-            f"for another {QUOTA_PAUSE_INTERVAL}s"
+            f"for another {API_DOWN_PAUSE_INTERVAL}s"
         ) from exc_info
 
     def _set_quota_and_raise(self, exc_info: ClientResponseError) -> None:
@@ -183,96 +254,164 @@ class MyPyllantCoordinator(DataUpdateCoordinator):
         Check if the API raises a ClientResponseError with "Quota Exceeded" in the message
         Raises UpdateFailed if a quota error is detected
         """
-        if is_quota_exceeded_exception(exc_info):
-            duration = extract_quota_duration(exc_info)
-            self._quota_hit_time = dt.now(timezone.utc)
-            if duration:
-                self._quota_end_time = dt.now(timezone.utc) + timedelta(
-                    seconds=duration
-                )
-            self._quota_exc_info = exc_info
+        if self.quota.set_quota_exceeded(exc_info):
             self._raise_if_quota_hit()
 
     def _raise_if_quota_hit(self) -> None:
         """
-        Check if we previously hit a quota, and if the quota was hit within a certain interval
+        Check if any request of this account hit a quota recently
         If yes, we keep raising UpdateFailed() until after the interval to avoid spamming the API
         """
-        if not self._quota_hit_time:
-            return
+        self.quota.raise_if_locked(f"update of myVAILLANT {self.__class__.__name__}")
 
-        time_elapsed = (dt.now(timezone.utc) - self._quota_hit_time).total_seconds()
 
-        if is_quota_exceeded_exception(self._quota_exc_info):
-            _LOGGER.debug(
-                "Quota was hit %ss ago on %s by %s",
-                int(time_elapsed),
-                self._quota_hit_time,
-                self.__class__,
-                exc_info=self._quota_exc_info,
-            )
-            if self._quota_end_time:
-                # If the API responded with an end time, we use that instead of the default QUOTA_PAUSE_INTERVAL
-                if dt.now(timezone.utc) < self._quota_end_time:
-                    remaining = int(
-                        (self._quota_end_time - dt.now(timezone.utc)).total_seconds()
-                    )
-                    raise UpdateFailed(
-                        f"{self._quota_exc_info.message} on {self._quota_exc_info.request_info.real_url}, "  # type: ignore
-                        f"skipping update of myVAILLANT {self.__class__.__name__} for another"
-                        f" {remaining}s"
-                    ) from self._quota_exc_info
-                else:
-                    # Quota backoff period has expired, clear state and allow retry
-                    _LOGGER.info(
-                        "Quota backoff expired for %s, clearing quota state and resuming updates",
-                        self.__class__.__name__,
-                    )
-                    self._clear_quota_state()
-                    return
-            elif time_elapsed < QUOTA_PAUSE_INTERVAL:
-                # No end time provided, use default interval
-                raise UpdateFailed(
-                    f"{self._quota_exc_info.message} on {self._quota_exc_info.request_info.real_url}, "  # type: ignore
-                    f"skipping update of myVAILLANT {self.__class__.__name__} for another"
-                    f" {int(QUOTA_PAUSE_INTERVAL - time_elapsed)}s"
-                ) from self._quota_exc_info
-            else:
-                # Default backoff period has expired, clear state and allow retry
-                _LOGGER.info(
-                    "Quota backoff expired for %s (no end time), clearing quota state and resuming updates",
-                    self.__class__.__name__,
-                )
-                self._clear_quota_state()
-                return
-        else:
+class SystemCoordinator(MyPyllantCoordinator):
+    data: list[System]  # type: ignore
+    homes: list[Home] = []
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: MyPyllantAPI,
+        entry: ConfigEntry,
+        update_interval: timedelta | None,
+    ) -> None:
+        super().__init__(hass, api, entry, update_interval)
+        # Slow-changing system attributes per tier and system id, which are fetched on their own
+        # interval and merged into the systems on every update
+        self._tier_attributes: dict[str, dict[str, dict[str, Any]]] = {}
+        self._tier_fetched_at: dict[str, dt] = {}
+        self.optimistic = OptimisticState(self)
+        self.command_queue = CommandQueue(self)
+        self._model_index: ModelIndex | None = None
+        # Keys of all known models, to find models that were added or removed. Models that are missing
+        # from updates are kept, until they were missing for MODEL_REMOVAL_UPDATES updates in a row
+        self._topology: frozenset[ModelKey] = frozenset()
+        self._missing_updates: dict[ModelKey, int] = {}
+        self._topology_index: ModelIndex | None = None
+        self._topology_listeners: list[
+            Callable[[frozenset[ModelKey], frozenset[ModelKey]], None]
+        ] = []
+
+    async def async_shutdown(self) -> None:
+        await self.command_queue.async_shutdown()
+        await super().async_shutdown()
+
+    @property
+    def model_index(self) -> ModelIndex:
+        """
+        Models of the current data by stable key, indexed once after each update
+        """
+        if self._model_index is None or self._model_index.data is not self.data:
+            self._model_index = ModelIndex(self.data)
+        return self._model_index
+
+    @callback
+    def async_add_topology_listener(
+        self, listener: Callable[[frozenset[ModelKey], frozenset[ModelKey]], None]
+    ) -> CALLBACK_TYPE:
+        """
+        Calls listener with the keys of added and removed models after updates that added or removed
+        systems, zones, circuits, domestic hot water, ventilation, devices or Ambisense rooms
+
+        Models only count as removed after they were missing for MODEL_REMOVAL_UPDATES updates in a row,
+        so they survive a flaky API response. Updates without any systems are ignored.
+
+        Returns a function that removes the listener again
+        """
+        self._topology_listeners.append(listener)
+
+        @callback
+        def _async_remove_listener() -> None:
+            self._topology_listeners.remove(listener)
+
+        return _async_remove_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        # Entities of removed models are removed before they are updated
+        self._async_update_topology()
+        super().async_update_listeners()
+
+    @callback
+    def _async_update_topology(self) -> None:
+        model_index = self.model_index
+        if model_index is self._topology_index:
+            return
+        self._topology_index = model_index
+        if not self.data:
+            # The API can return no systems for a while, i.e. while it's down
+            return
+        present = frozenset(model_index.keys())
+        added = present - self._topology
+        for key in present:
+            self._missing_updates.pop(key, None)
+        for key in self._topology - present:
+            self._missing_updates[key] = self._missing_updates.get(key, 0) + 1
             _LOGGER.debug(
-                "myVAILLANT API is down since %ss (%s)",
-                int(time_elapsed),
-                self._quota_hit_time,
-                exc_info=self._quota_exc_info,
+                "Model %s missing for %s updates", key, self._missing_updates[key]
             )
-            if time_elapsed < API_DOWN_PAUSE_INTERVAL:
-                raise UpdateFailed(
-                    f"myVAILLANT API is down, skipping update of myVAILLANT {self.__class__.__name__} for another"
-                    f" {int(API_DOWN_PAUSE_INTERVAL - time_elapsed)}s"
-                ) from self._quota_exc_info
-            else:
-                # API down backoff has expired, clear state and allow retry
-                _LOGGER.info(
-                    "API down backoff expired for %s, clearing state and resuming updates",
-                    self.__class__.__name__,
-                )
-                self._clear_quota_state()
-                return
+        removed = frozenset(
+            key
+            for key, updates in self._missing_updates.items()
+            if updates >= MODEL_REMOVAL_UPDATES
+        )
+        for key in removed:
+            del self._missing_updates[key]
+        self._topology = (self._topology | present) - removed
+        if not added and not removed:
+            return
+        _LOGGER.debug("Models added: %s, removed: %s", added, removed)
+        for listener in list(self._topology_listeners):
+            listener(added, removed)
 
+    def invalidate_tier(self, tier: str) -> None:
+        """
+        Fetches a tier again on the next update, i.e. after changing one of its values
+        """
+        self._tier_fetched_at.pop(tier, None)
 
-class SystemCoordinator(MyPyllantCoordinator):
-    data: list[System]  # type: ignore
-    homes: list[Home] = []
+    def _is_tier_due(self, tier: str, interval: int, systems: list[System]) -> bool:
+        fetched_at = self._tier_fetched_at.get(tier)
+        if fetched_at is None or dt.now(timezone.utc) >= fetched_at + timedelta(
+            seconds=interval
+        ):
+            return True
+        # Systems that were added since the last fetch don't have any data yet
+        return any(s.id not in self._tier_attributes[tier] for s in systems)
+
+    async def _update_tier(
+        self,
+        tier: str,
+        interval: int,
+        systems: list[System],
+        fetchers: dict[str, Callable[[str], Awaitable[Any]]],
+    ) -> None:
+        """
+        Fetches the attributes of a tier if its interval has passed, and sets them on the systems
+        """
+        if not fetchers:
+            return
+        if self._is_tier_due(tier, interval, systems):
+            _LOGGER.debug("Fetching %s for %s systems", tier, len(systems))
+            self._tier_attributes[tier] = {
+                system.id: {
+                    attribute: await fetcher(system.id)
+                    for attribute, fetcher in fetchers.items()
+                }
+                for system in systems
+            }
+            self._tier_fetched_at[tier] = dt.now(timezone.utc)
+        else:
+            _LOGGER.debug("Using cached %s for systems fetch", tier)
+        for system in systems:
+            for attribute, value in self._tier_attributes[tier][system.id].items():
+                setattr(system, attribute, value)
 
     async def _async_update_data(self) -> list[System]:  # type: ignore
         self._raise_if_quota_hit()
+        if self._skip_for_budget():
+            return self.data
         include_connection_status = self.entry.options.get(
             OPTION_FETCH_CONNECTION_STATUS, DEFAULT_FETCH_CONNECTION_STATUS
         )
@@ -304,21 +443,64 @@ class SystemCoordinator(MyPyllantCoordinator):
                 ]
             else:
                 _LOGGER.debug("Using cached homes for systems fetch")
+            # Connection status, trouble codes, EEBUS and Ambisense capability are
+            # fetched in separate tiers with longer intervals below
             data = [
                 s
                 async for s in await self.hass.async_add_executor_job(
                     self.api.get_systems,
-                    include_connection_status,
-                    include_diagnostic_trouble_codes,
+                    False,
+                    False,
                     include_rts,
                     include_mpc,
                     include_ambisense_rooms,
                     include_energy_management,
-                    include_eebus,
-                    include_ambisense_capability,
+                    False,
+                    False,
                     self.homes,
                 )
             ]
+            diagnostics: dict[str, Callable[[str], Awaitable[Any]]] = {}
+            if include_connection_status:
+                diagnostics["connected"] = self.api.get_connection_status
+            if include_diagnostic_trouble_codes:
+                diagnostics["diagnostic_trouble_codes"] = (
+                    self.api.get_diagnostic_trouble_codes
+                )
+            await self._update_tier(
+                SYSTEM_TIER_DIAGNOSTICS,
+                self.entry.options.get(
+                    OPTION_UPDATE_INTERVAL_DIAGNOSTICS,
+                    DEFAULT_UPDATE_INTERVAL_DIAGNOSTICS,
+                ),
+                data,
+                diagnostics,
+            )
+            capabilities: dict[str, Callable[[str], Awaitable[Any]]] = {}
+            if include_eebus:
+                capabilities["eebus"] = self.api.get_eebus
+            if include_ambisense_capability:
+                capabilities["ambisense_capability"] = self.api.get_ambisense_capability
+            await self._update_tier(
+                SYSTEM_TIER_CAPABILITIES,
+                self.entry.options.get(
+                    OPTION_UPDATE_INTERVAL_CAPABILITIES,
+                    DEFAULT_UPDATE_INTERVAL_CAPABILITIES,
+                ),
+                data,
+                capabilities,
+            )
+            if include_diagnostic_trouble_codes:
+                for system in data:
+                    for device in system.devices:
+                        device.diagnostic_trouble_codes = (
+                            system.diagnostic_trouble_codes_by_serial_number(
+                                device.device_serial_number
+                            )
+                        )
+            # Keep showing written values that the API doesn't return yet
+            self.optimistic.reconcile(data)
+            self._stretch_update_interval()
             # Clear quota state on successful fetch so future updates aren't blocked
             self._clear_quota_state()
             return data
@@ -345,19 +527,197 @@ class SystemWithDeviceData(TypedDict):
 class DailyDataCoordinator(MyPyllantCoordinator):
     data: dict[str, SystemWithDeviceData]
 
-    async def is_sensor_disabled(self, unique_id: str) -> bool:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: MyPyllantAPI,
+        entry: ConfigEntry,
+        update_interval: timedelta | None,
+    ) -> None:
+        super().__init__(hass, api, entry, update_interval)
+        # End of the last finalised hourly bucket for each (device uuid, data index)
+        self._finalised_until: dict[tuple[str, int], dt] = {}
+        self.statistics_writer = StatisticsWriter(hass)
+        self._daily_totals: DailyTotals | None = None
+        self._period_totals = PeriodTotals()
+        self._merged_totals: DailyTotals | None = None
+
+    @property
+    def daily_totals(self) -> DailyTotals:
+        """
+        Per-day totals of the current data, computed once after each update
+        """
+        if self._daily_totals is None or self._daily_totals.data is not self.data:
+            self._daily_totals = DailyTotals(self.data)
+        return self._daily_totals
+
+    @property
+    def period_totals(self) -> PeriodTotals:
+        """
+        Month and year to date totals, with the days of the current data merged in once after each update
+        """
+        daily_totals = self.daily_totals
+        if self._merged_totals is not daily_totals:
+            self._period_totals.update(daily_totals)
+            self._merged_totals = daily_totals
+        return self._period_totals
+
+    async def async_seed_period_totals(self) -> None:
         """
-        Check if a sensor is disabled to be able to skip its API update
+        Adds the days of the current year before the fetched data from the recorder statistics of the data
+        sensors, so month and year to date totals don't need any API requests
+        """
+        sensors = [
+            sensor
+            for sensor in self.statistics_writer.sensors
+            if sensor.statistic_id is not None
+            and sensor.device_data is not None
+            and sensor.device_data.energy_type is not None
+            and sensor.device_data.data
+        ]
+        if not sensors:
+            return
+        window_start = min(s.device_data.data[0].start_date for s in sensors)  # type: ignore
+        year_start = window_start.replace(
+            month=1, day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+        if window_start <= year_start:
+            return
+        try:
+            rows = await self.statistics_writer.async_load_statistics(
+                {s.statistic_id for s in sensors},  # type: ignore
+                year_start,
+                window_start,
+                {"change"},
+                "day",
+            )
+        except Exception:  # noqa: BLE001
+            _LOGGER.warning(
+                "Failed to read statistics for month and year to date totals",
+                exc_info=True,
+            )
+            return
+        days: dict[tuple[str, str], dict[date, float]] = defaultdict(
+            lambda: defaultdict(float)
+        )
+        for sensor in sensors:
+            tzinfo = sensor.device_data.data[0].start_date.tzinfo  # type: ignore
+            key = (sensor.system_id, sensor.device_data.energy_type)  # type: ignore
+            for row in rows.get(sensor.statistic_id, []):  # type: ignore
+                if row.get("start") is None or row.get("change") is None:
+                    continue
+                days[key][dt.fromtimestamp(row["start"], tzinfo).date()] += row[
+                    "change"
+                ]
+        for (system_id, energy_type), totals in days.items():
+            self._period_totals.seed(system_id, energy_type, totals)
+        self.async_update_listeners()
+
+    def _disabled_sensor_ids(self) -> set[str]:
+        """
+        Collects the unique ids of all disabled sensors to be able to skip their API update
         """
         entity_registry = er.async_get(self.hass)
-        entity_id = entity_registry.async_get_entity_id("sensor", DOMAIN, unique_id)
-        if entity_id:
-            entity_entry = entity_registry.async_get(entity_id)
-            return entity_entry is not None and bool(entity_entry.disabled)
-        return False
+        return {
+            entity_entry.unique_id
+            for entity_entry in er.async_entries_for_config_entry(
+                entity_registry, self.entry.entry_id
+            )
+            if entity_entry.domain == "sensor" and entity_entry.disabled
+        }
+
+    def _previous_device_data(
+        self, system_id: str, device_uuid: str
+    ) -> list[DeviceData]:
+        """
+        Returns the device data of the last successful update, used when fetching a single device fails
+        """
+        if not self.data or system_id not in self.data:
+            return []
+        for device_data in self.data[system_id]["devices_data"]:
+            if any(
+                dd.device is not None and dd.device.device_uuid == device_uuid
+                for dd in device_data
+            ):
+                return device_data
+        return []
+
+    def _incremental_start(self, device: Device, start: dt) -> dt:
+        """
+        Returns the start of the fetch window for a device, skipping hourly buckets that are already final
+        """
+        checkpoints: list[dt] = []
+        for da_index, dd in enumerate(device.data):
+            if dd.skip_data_update:
+                continue
+            checkpoint = self._finalised_until.get((device.device_uuid, da_index))
+            if checkpoint is None:
+                return start
+            checkpoints.append(checkpoint)
+        if not checkpoints:
+            return start
+        return max(start, min(checkpoints))
+
+    def _merge_device_data(
+        self,
+        system_id: str,
+        device: Device,
+        device_data: list[DeviceData],
+        start: dt,
+        fetch_start: dt,
+    ) -> list[DeviceData]:
+        """
+        Prepends the buckets of the previous update, that weren't fetched again, to the freshly fetched buckets
+        """
+        previous = self._previous_device_data(system_id, device.device_uuid)
+        for da_index, dd in enumerate(device_data):
+            if dd.skip_data_update or da_index >= len(previous):
+                continue
+            dd.data = [
+                b
+                for b in previous[da_index].data
+                if start <= b.start_date < fetch_start
+            ] + [b for b in dd.data if b.start_date >= fetch_start]
+            dd.data_from = start
+            dd.total_consumption = sum(b.value for b in dd.data if b.value is not None)
+        return device_data
+
+    def _finalised_buckets(
+        self, device: Device, device_data: list[DeviceData]
+    ) -> dict[tuple[str, int], dt]:
+        """
+        Returns the end of the last hourly bucket that won't change anymore, for each data index of a device
+        """
+        settled = dt.now(timezone.utc) - timedelta(seconds=DAILY_DATA_SETTLE_TIME)
+        finalised: dict[tuple[str, int], dt] = {}
+        for da_index, dd in enumerate(device_data):
+            if dd.skip_data_update:
+                continue
+            end_dates = [b.end_date for b in dd.data if b.end_date <= settled]
+            if end_dates:
+                finalised[(device.device_uuid, da_index)] = max(end_dates)
+        return finalised
+
+    async def _fetch_device_data(
+        self,
+        semaphore: asyncio.Semaphore,
+        device: Device,
+        resolution: DeviceDataBucketResolution,
+        start: dt,
+        end: dt,
+    ) -> list[DeviceData]:
+        async with semaphore:
+            return [
+                da
+                async for da in self.api.get_data_by_device(
+                    device, resolution, start, end
+                )
+            ]
 
     async def _async_update_data(self) -> dict[str, SystemWithDeviceData]:
         self._raise_if_quota_hit()
+        if self._skip_for_budget():
+            return self.data
         _LOGGER.debug("Starting async update data for DailyDataCoordinator")
         try:
             await self._refresh_session()
@@ -367,6 +727,22 @@ class DailyDataCoordinator(MyPyllantCoordinator):
                 or not self.hass_data["system_coordinator"].data
             ):
                 raise UpdateFailed("No systems available for daily data fetch")
+            semaphore = asyncio.Semaphore(
+                self.entry.options.get(
+                    OPTION_DAILY_DATA_CONCURRENCY, DEFAULT_DAILY_DATA_CONCURRENCY
+                )
+            )
+            incremental = self.entry.options.get(
+                OPTION_DAILY_DATA_INCREMENTAL, DEFAULT_DAILY_DATA_INCREMENTAL
+            )
+            resolution = DeviceDataBucketResolution(
+                self.entry.options.get(
+                    OPTION_DAILY_DATA_RESOLUTION, DEFAULT_DAILY_DATA_RESOLUTION
+                )
+            )
+            disabled_sensor_ids = self._disabled_sensor_ids()
+            fetched_devices: list[tuple[str, Device, dt, dt]] = []
+            fetches = []
             for system in self.hass_data["system_coordinator"].data:
                 today = dt.now(system.timezone).replace(
                     microsecond=0, second=0, minute=0, hour=0
@@ -396,14 +772,60 @@ class DailyDataCoordinator(MyPyllantCoordinator):
                 for de_index, device in enumerate(system.devices):
                     for da_index, dd in enumerate(device.data):
                         sensor_id = f"{DOMAIN}_{device.system_id}_{device.device_uuid}_{da_index}_{de_index}"
-                        if await self.is_sensor_disabled(sensor_id):
+                        if sensor_id in disabled_sensor_ids:
                             device.data[da_index].skip_data_update = True
-                    device_data = self.api.get_data_by_device(
-                        device, DeviceDataBucketResolution.HOUR, start, end
+                    # In incremental mode, hourly buckets that are already final are kept from the
+                    # previous update. Yesterday's last hour isn't final until after midnight,
+                    # so it's still fetched once more on the next day.
+                    fetch_start = (
+                        self._incremental_start(device, start) if incremental else start
+                    )
+                    fetched_devices.append((system.id, device, start, fetch_start))
+                    fetches.append(
+                        self._fetch_device_data(
+                            semaphore, device, resolution, fetch_start, end
+                        )
+                    )
+
+            # Devices are fetched concurrently, a failing device keeps its previous data
+            # instead of discarding the whole update
+            results = await asyncio.gather(*fetches, return_exceptions=True)
+            failures: list[BaseException] = []
+            finalised_until: dict[tuple[str, int], dt] = {}
+            for (system_id, device, start, fetch_start), result in zip(
+                fetched_devices, results
+            ):
+                if isinstance(result, BaseException):
+                    if isinstance(
+                        result, ClientResponseError
+                    ) and is_quota_exceeded_exception(result):
+                        raise result
+                    _LOGGER.warning(
+                        "Could not fetch energy data for %s in %s, keeping previous data: %s",
+                        device.name_display,
+                        system_id,
+                        result,
                     )
-                    data[system.id]["devices_data"].append(
-                        [da async for da in device_data]
+                    failures.append(result)
+                    data[system_id]["devices_data"].append(
+                        self._previous_device_data(system_id, device.device_uuid)
+                    )
+                    finalised_until |= {
+                        k: v
+                        for k, v in self._finalised_until.items()
+                        if k[0] == device.device_uuid
+                    }
+                    continue
+                if fetch_start > start:
+                    result = self._merge_device_data(
+                        system_id, device, result, start, fetch_start
                     )
+                data[system_id]["devices_data"].append(result)
+                finalised_until |= self._finalised_buckets(device, result)
+            if failures and len(failures) == len(results):
+                raise failures[0]
+            self._finalised_until = finalised_until
+            self._stretch_update_interval()
             # Clear quota state on successful fetch so future updates aren't blocked
             self._clear_quota_state()
             return data
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime
+from functools import partial
 
 from homeassistant.components.datetime import DateTimeEntity
 from homeassistant.config_entries import ConfigEntry
@@ -12,9 +13,13 @@ from custom_components.mypyllant.const import (
     DOMAIN,
     DEFAULT_HOLIDAY_SETPOINT,
     DEFAULT_DHW_LEGIONELLA_PROTECTION_TEMPERATURE,
+    REFRESH_DELAY_LONG,
+    REFRESH_DELAY_MEDIUM,
 )
 from custom_components.mypyllant.decorators import ensure_token_refresh
 from custom_components.mypyllant.coordinator import SystemCoordinator
+from custom_components.mypyllant.model_index import ModelKey, is_added
+from custom_components.mypyllant.topology import EntityTracker
 from custom_components.mypyllant.utils import (
     HolidayEntity,
     EntityList,
@@ -30,22 +35,46 @@ async def async_setup_entry(
     hass: HomeAssistant, config: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up the sensor platform."""
+    coordinator: SystemCoordinator = hass.data[DOMAIN][config.entry_id][
+        "system_coordinator"
+    ]
+    await EntityTracker(
+        hass,
+        config,
+        coordinator,
+        async_add_entities,
+        partial(create_datetimes, hass, config),
+    ).async_setup()
+
+
+async def create_datetimes(
+    hass: HomeAssistant,
+    config: ConfigEntry,
+    added: frozenset[ModelKey] | None = None,
+) -> EntityList[DateTimeEntity]:
     coordinator: SystemCoordinator = hass.data[DOMAIN][config.entry_id][
         "system_coordinator"
     ]
     if not coordinator.data:
         _LOGGER.warning("No system data, skipping date time entities")
-        return
+        return EntityList()
 
+    model_index = coordinator.model_index
     sensors: EntityList[DateTimeEntity] = EntityList()
     for index, system in enumerate(coordinator.data):
-        sensors.append(
-            lambda: SystemHolidayStartDateTimeEntity(index, coordinator, config)
-        )
-        sensors.append(
-            lambda: SystemHolidayEndDateTimeEntity(index, coordinator, config)
-        )
+        system_added = is_added(added, model_index.key(index, "system"))
+        if system_added:
+            sensors.append(
+                lambda: SystemHolidayStartDateTimeEntity(index, coordinator, config)
+            )
+            sensors.append(
+                lambda: SystemHolidayEndDateTimeEntity(index, coordinator, config)
+            )
         for dhw_index, dhw in enumerate(system.domestic_hot_water):
+            if not is_added(
+                added, model_index.key(index, "domestic_hot_water", dhw_index)
+            ):
+                continue
             if dhw.current_dhw_temperature is not None:
                 key = f"{DOMAIN}_{system.id}_{dhw_index}_legionella_protection_datetime"
                 if key not in hass.data[DOMAIN][config.entry_id]:
@@ -58,7 +87,11 @@ async def async_setup_entry(
                         hass.data[DOMAIN][config.entry_id][key],
                     )
                 )
-        if not system.control_identifier.is_vrc700 and system.is_cooling_allowed:
+        if (
+            system_added
+            and not system.control_identifier.is_vrc700
+            and system.is_cooling_allowed
+        ):
             sensors.append(
                 lambda: SystemManualCoolingStartDateTimeEntity(
                     index, coordinator, config
@@ -67,7 +100,7 @@ async def async_setup_entry(
             sensors.append(
                 lambda: SystemManualCoolingEndDateTimeEntity(index, coordinator, config)
             )
-    async_add_entities(sensors)  # type: ignore
+    return sensors
 
 
 class SystemHolidayStartDateTimeEntity(HolidayEntity, DateTimeEntity):
@@ -100,7 +133,7 @@ class SystemHolidayStartDateTimeEntity(HolidayEntity, DateTimeEntity):
             self.system, start=value, end=end, setpoint=setpoint
         )
         # Holiday values need a long time to show up in the API
-        await self.coordinator.async_request_refresh_delayed(10)
+        await self.coordinator.async_request_refresh_delayed(REFRESH_DELAY_MEDIUM)
 
     @property
     def unique_id(self) -> str:
@@ -132,7 +165,7 @@ class SystemHolidayEndDateTimeEntity(SystemHolidayStartDateTimeEntity):
             self.system, start=self.holiday_start, end=value, setpoint=setpoint
         )
         # Holiday values need a long time to show up in the API
-        await self.coordinator.async_request_refresh_delayed(10)
+        await self.coordinator.async_request_refresh_delayed(REFRESH_DELAY_MEDIUM)
 
     @property
     def unique_id(self) -> str:
@@ -167,7 +200,7 @@ class SystemManualCoolingStartDateTimeEntity(ManualCoolingEntity, DateTimeEntity
             start=value,
             end=end,
         )
-        await self.coordinator.async_request_refresh_delayed(20)
+        await self.coordinator.async_request_refresh_delayed(REFRESH_DELAY_LONG)
 
     @property
     def unique_id(self) -> str:
@@ -196,7 +229,7 @@ class SystemManualCoolingEndDateTimeEntity(SystemManualCoolingStartDateTimeEntit
             start=self.manual_cooling_start,
             end=value,
         )
-        await self.coordinator.async_request_refresh_delayed(20)
+        await self.coordinator.async_request_refresh_delayed(REFRESH_DELAY_LONG)
 
     @property
     def unique_id(self) -> str:
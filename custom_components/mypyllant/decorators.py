@@ -1,12 +1,42 @@
 import functools
+from contextlib import asynccontextmanager
+
+from aiohttp.client_exceptions import ClientResponseError
+from homeassistant.exceptions import HomeAssistantError
+
+
+@asynccontextmanager
+async def refreshed_session(coordinator, action: str):
+    """
+    Yields the logged in API of a coordinator, after making sure its session token is refreshed
+
+    Requests are refused while the account is locked out by a quota, and quota errors of the request
+    are stored on the account, so coordinators pause as well.
+
+    Parameters:
+        coordinator: Any coordinator of the config entry
+        action: What is refused during a lockout, for the error message
+    """
+    quota = coordinator.quota
+    quota.raise_if_locked(action, HomeAssistantError)
+    await coordinator._refresh_session()
+    try:
+        yield coordinator.api
+    except ClientResponseError as e:
+        quota.set_quota_exceeded(e)
+        raise
 
 
 def ensure_token_refresh(func):
-    """Decorator that adds a check to ensure the session token is refreshed."""
+    """
+    Decorator that adds a check to ensure the session token is refreshed.
+
+    See refreshed_session, for requests made by entities.
+    """
 
     @functools.wraps(func)
     async def wrapper(self, *args, **kwargs):
-        await self.coordinator._refresh_session()
-        return await func(self, *args, **kwargs)
+        async with refreshed_session(self.coordinator, "request to the myVAILLANT API"):
+            return await func(self, *args, **kwargs)
 
     return wrapper
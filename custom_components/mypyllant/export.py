@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Literal
+
+from homeassistant.core import HomeAssistant
+from myPyllant.api import MyPyllantAPI
+from myPyllant.enums import DeviceDataBucketResolution
+from myPyllant.export import prepare_data
+from myPyllant.models import Device
+
+from custom_components.mypyllant.const import (
+    DOMAIN,
+    EXPORT_CHUNK_DAYS,
+    EXPORT_DIRECTORY,
+)
+from custom_components.mypyllant.decorators import refreshed_session
+
+if TYPE_CHECKING:
+    from custom_components.mypyllant.coordinator import MyPyllantCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+ExportFormat = Literal["ndjson", "csv"]
+EXPORT_FORMATS: tuple[ExportFormat, ...] = ("ndjson", "csv")
+EXPORT_FIELDS = (
+    "system_id",
+    "device_uuid",
+    "device_name",
+    "operation_mode",
+    "energy_type",
+    "resolution",
+    "start_date",
+    "end_date",
+    "value",
+)
+
+
+async def async_export(
+    api: MyPyllantAPI,
+    data: bool = False,
+    resolution: DeviceDataBucketResolution | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Exports systems, or the historical data of their devices, like myPyllant.export but on an API that is
+    already logged in
+    """
+    export_list: list[dict[str, Any]] = []
+    async for system in api.get_systems(
+        include_connection_status=True,
+        include_diagnostic_trouble_codes=True,
+        include_rts=True,
+        include_mpc=True,
+        include_ambisense_rooms=True,
+        include_energy_management=True,
+        include_eebus=True,
+    ):
+        if not data:
+            export_list.append(system.prepare_dict())
+            continue
+        for device in system.devices:
+            device_dict = device.prepare_dict()
+            # Data in the device doesn't contain any actual data,
+            # only information on what kind of data is available
+            del device_dict["data"]
+            export_list.append(
+                dict(
+                    device=device_dict,
+                    data=[
+                        prepare_data(d)
+                        async for d in api.get_data_by_device(
+                            device, resolution, start, end
+                        )
+                    ],
+                )
+            )
+    return export_list
+
+
+async def async_report(api: MyPyllantAPI, year: int) -> dict[str, str]:
+    """
+    Returns the yearly reports of all systems by file name, like myPyllant.report but on an API that is
+    already logged in
+    """
+    return {
+        report.file_name: report.file_content
+        async for system in api.get_systems()
+        async for report in api.get_yearly_reports(system, year)
+    }
+
+
+class ExportFile:
+    """
+    Appends rows of energy data to an NDJSON or CSV file, optionally gzip compressed
+
+    All methods do blocking I/O, and need to run in the executor
+    """
+
+    def __init__(self, path: Path, file_format: ExportFormat, compress: bool) -> None:
+        self.path = path
+        self.file_format = file_format
+        self.compress = compress
+        self._file: IO[str] | None = None
+        self._csv: csv.DictWriter | None = None
+
+    def open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.compress:
+            self._file = gzip.open(self.path, "wt", encoding="utf-8", newline="")
+        else:
+            self._file = open(self.path, "w", encoding="utf-8", newline="")
+        if self.file_format == "csv":
+            self._csv = csv.DictWriter(self._file, EXPORT_FIELDS)
+            self._csv.writeheader()
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        if self._csv is not None:
+            self._csv.writerows(rows)
+        else:
+            self._file.writelines(json.dumps(row) + "\n" for row in rows)  # type: ignore
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _export_chunks(
+    start: datetime, end: datetime, resolution: DeviceDataBucketResolution
+) -> list[tuple[datetime, datetime]]:
+    chunk = timedelta(days=EXPORT_CHUNK_DAYS[resolution])
+    chunks = []
+    while start < end:
+        chunks.append((start, min(start + chunk, end)))
+        start += chunk
+    return chunks
+
+
+async def async_export_file(
+    hass: HomeAssistant,
+    coordinator: MyPyllantCoordinator,
+    start: datetime,
+    end: datetime | None = None,
+    resolution: DeviceDataBucketResolution = DeviceDataBucketResolution.HOUR,
+    file_format: ExportFormat = "ndjson",
+    compress: bool = False,
+) -> dict[str, Any]:
+    """
+    Exports the energy data of all devices to a file in the config directory, one chunk of the date range
+    at a time, so memory use doesn't depend on the length of the range
+
+    The session is refreshed before each chunk, so long exports outlive the token, and a quota lockout stops
+    the export. Progress is fired as mypyllant_export_progress event after each chunk.
+    Returns the path and a summary.
+    """
+    end = end or datetime.now(start.tzinfo)
+    async with refreshed_session(coordinator, "export") as api:
+        devices: list[Device] = [
+            device async for system in api.get_systems() for device in system.devices
+        ]
+    chunks = _export_chunks(start, end, resolution)
+    total = len(devices) * len(chunks)
+
+    suffix = f".{file_format}.gz" if compress else f".{file_format}"
+    export_file = ExportFile(
+        Path(hass.config.path(EXPORT_DIRECTORY))
+        / f"export_{datetime.now():%Y%m%d_%H%M%S}{suffix}",
+        file_format,
+        compress,
+    )
+    await hass.async_add_executor_job(export_file.open)
+    rows_written = 0
+    done = 0
+    try:
+        for device in devices:
+            for chunk_start, chunk_end in chunks:
+                async with refreshed_session(coordinator, "export") as api:
+                    rows = [
+                        {
+                            "system_id": device.system_id,
+                            "device_uuid": device.device_uuid,
+                            "device_name": device.name_display,
+                            "operation_mode": device_data.operation_mode,
+                            "energy_type": device_data.energy_type,
+                            "resolution": str(resolution),
+                            "start_date": bucket.start_date.isoformat(),
+                            "end_date": bucket.end_date.isoformat(),
+                            "value": bucket.value,
+                        }
+                        async for device_data in api.get_data_by_device(
+                            device, resolution, chunk_start, chunk_end
+                        )
+                        if not device_data.skip_data_update
+                        for bucket in device_data.data
+                    ]
+                await hass.async_add_executor_job(export_file.write, rows)
+                rows_written += len(rows)
+                done += 1
+                _LOGGER.debug("Exported chunk %s of %s", done, total)
+                hass.bus.async_fire(
+                    f"{DOMAIN}_export_progress",
+                    {
+                        "path": str(export_file.path),
+                        "chunks_done": done,
+                        "chunks_total": total,
+                        "rows": rows_written,
+                    },
+                )
+    finally:
+        await hass.async_add_executor_job(export_file.close)
+
+    return {
+        "path": str(export_file.path),
+        "format": file_format,
+        "compressed": compress,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "devices": len(devices),
+        "chunks": total,
+        "rows": rows_written,
+    }
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from collections.abc import Collection, Hashable, KeysView
+from typing import TYPE_CHECKING, Any, Literal
+
+if TYPE_CHECKING:
+    from myPyllant.models import System
+
+ModelKind = Literal[
+    "system",
+    "zone",
+    "circuit",
+    "domestic_hot_water",
+    "ventilation",
+    "device",
+    "ambisense_room",
+]
+ModelKey = tuple[str, ModelKind, Hashable]
+
+# Maps model kinds to the list on System that contains them, and the attribute with their stable id
+MODEL_LISTS: dict[ModelKind, tuple[str, str]] = {
+    "zone": ("zones", "index"),
+    "circuit": ("circuits", "index"),
+    "domestic_hot_water": ("domestic_hot_water", "index"),
+    "ventilation": ("ventilation", "index"),
+    "device": ("devices", "device_uuid"),
+    "ambisense_room": ("ambisense_rooms", "room_index"),
+}
+
+# Attributes in which entities keep the keys of the models they are built from
+ENTITY_KEY_ATTRIBUTES = (
+    "_system_key",
+    "_zone_key",
+    "_circuit_key",
+    "_dhw_key",
+    "_ventilation_key",
+    "_device_key",
+    "_room_key",
+)
+
+
+def entity_model_keys(entity: object) -> list[ModelKey]:
+    """
+    Keys of all models an entity is built from
+    """
+    return [
+        key
+        for attribute in ENTITY_KEY_ATTRIBUTES
+        if (key := getattr(entity, attribute, None)) is not None
+    ]
+
+
+def is_added(added: Collection[ModelKey] | None, key: ModelKey) -> bool:
+    """
+    Whether entities of a model should be created: all of them on setup (added is None), afterward only
+    the ones of added models
+    """
+    return added is None or key in added
+
+
+class ModelIndex:
+    """
+    Models of all systems by (system id, kind, stable id), built once per update
+
+    Stable ids are the indexes the API assigns to zones, circuits, domestic hot water and ventilation,
+    device uuids and room indexes. Entities keep the key of their model, so they find it without walking
+    the systems, and still find the same model if the API returns them in a different order.
+    """
+
+    def __init__(self, systems: list[System] | None) -> None:
+        self.data = systems
+        self._models: dict[ModelKey, Any] = {}
+        for system in systems or []:
+            self._models[(system.id, "system", system.id)] = system
+            for kind, (model_list, attribute) in MODEL_LISTS.items():
+                for model in getattr(system, model_list, None) or []:
+                    self._models[(system.id, kind, getattr(model, attribute))] = model
+
+    def __getitem__(self, key: ModelKey) -> Any:
+        return self._models[key]
+
+    def __contains__(self, key: ModelKey) -> bool:
+        return key in self._models
+
+    def keys(self) -> KeysView[ModelKey]:
+        return self._models.keys()
+
+    def key(
+        self, system_index: int, kind: ModelKind, position: int | None = None
+    ) -> ModelKey:
+        """
+        Key of the model at a position in the current data, i.e. the n-th zone of the first system
+        """
+        system = self.data[system_index]  # type: ignore
+        if kind == "system":
+            return system.id, kind, system.id
+        model_list, attribute = MODEL_LISTS[kind]
+        return self.id_key(
+            system_index,
+            kind,
+            getattr(getattr(system, model_list)[position], attribute),
+        )
+
+    def id_key(
+        self, system_index: int, kind: ModelKind, stable_id: Hashable
+    ) -> ModelKey:
+        """
+        Key of a model by its stable id, i.e. the room index of an Ambisense room
+        """
+        return self.data[system_index].id, kind, stable_id  # type: ignore
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timedelta
+from functools import partial
+from typing import Any
 
 from homeassistant.components.number import NumberEntity
 from homeassistant.config_entries import ConfigEntry
@@ -9,9 +11,16 @@ from homeassistant.const import UnitOfTime, UnitOfTemperature
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from custom_components.mypyllant.const import DOMAIN, DEFAULT_HOLIDAY_SETPOINT
+from custom_components.mypyllant.const import (
+    DOMAIN,
+    DEFAULT_HOLIDAY_SETPOINT,
+    REFRESH_DELAY_LONG,
+    REFRESH_DELAY_MEDIUM,
+)
 from custom_components.mypyllant.decorators import ensure_token_refresh
 from custom_components.mypyllant.coordinator import SystemCoordinator
+from custom_components.mypyllant.model_index import ModelKey, is_added
+from custom_components.mypyllant.topology import EntityTracker
 from custom_components.mypyllant.utils import (
     HolidayEntity,
     SystemCoordinatorEntity,
@@ -27,24 +36,47 @@ async def async_setup_entry(
     hass: HomeAssistant, config: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up the sensor platform."""
+    coordinator: SystemCoordinator = hass.data[DOMAIN][config.entry_id][
+        "system_coordinator"
+    ]
+    await EntityTracker(
+        hass,
+        config,
+        coordinator,
+        async_add_entities,
+        partial(create_numbers, hass, config),
+    ).async_setup()
+
+
+async def create_numbers(
+    hass: HomeAssistant,
+    config: ConfigEntry,
+    added: frozenset[ModelKey] | None = None,
+) -> EntityList[NumberEntity]:
     coordinator: SystemCoordinator = hass.data[DOMAIN][config.entry_id][
         "system_coordinator"
     ]
     if not coordinator.data:
         _LOGGER.warning("No system data, skipping number entities")
-        return
+        return EntityList()
 
+    model_index = coordinator.model_index
     sensors: EntityList[NumberEntity] = EntityList()
     for index, system in enumerate(coordinator.data):
-        sensors.append(lambda: SystemHolidayDurationNumber(index, coordinator))
-        if system.is_cooling_allowed:
-            sensors.append(lambda: SystemManualCoolingDays(index, coordinator))
+        if is_added(added, model_index.key(index, "system")):
+            sensors.append(lambda: SystemHolidayDurationNumber(index, coordinator))
+            if system.is_cooling_allowed:
+                sensors.append(lambda: SystemManualCoolingDays(index, coordinator))
 
         for zone_index, zone in enumerate(system.zones):
+            if not is_added(added, model_index.key(index, "zone", zone_index)):
+                continue
             sensors.append(
                 lambda: ZoneQuickVetoDurationNumber(index, zone_index, coordinator)
             )
         for circuit_index, circuit in enumerate(system.circuits):
+            if not is_added(added, model_index.key(index, "circuit", circuit_index)):
+                continue
             sensors.append(
                 lambda: CircuitHeatingCurve(index, circuit_index, coordinator)
             )
@@ -58,7 +90,7 @@ async def async_setup_entry(
                     index, circuit_index, coordinator
                 )
             )
-    async_add_entities(sensors)  # type: ignore
+    return sensors
 
 
 class SystemHolidayDurationNumber(HolidayEntity, NumberEntity):
@@ -68,6 +100,7 @@ class SystemHolidayDurationNumber(HolidayEntity, NumberEntity):
     def __init__(self, index: int, coordinator: "SystemCoordinator") -> None:
         super(SystemCoordinatorEntity, self).__init__(coordinator)
         self.index = index
+        self._system_key = coordinator.model_index.key(index, "system")
 
     @property
     def native_max_value(self) -> float:
@@ -116,7 +149,7 @@ class SystemHolidayDurationNumber(HolidayEntity, NumberEntity):
         if value == 0:
             await self.coordinator.api.cancel_holiday(self.system)
             # Holiday values need a long time to show up in the API
-            await self.coordinator.async_request_refresh_delayed(20)
+            await self.coordinator.async_request_refresh_delayed(REFRESH_DELAY_LONG)
         else:
             if self.native_unit_of_measurement == UnitOfTime.DAYS:
                 value = value * 24
@@ -128,7 +161,7 @@ class SystemHolidayDurationNumber(HolidayEntity, NumberEntity):
                 self.system, end=end, setpoint=setpoint
             )
             # Holiday values need a long time to show up in the API
-            await self.coordinator.async_request_refresh_delayed(20)
+            await self.coordinator.async_request_refresh_delayed(REFRESH_DELAY_LONG)
 
     @property
     def unique_id(self) -> str:
@@ -156,7 +189,7 @@ class SystemManualCoolingDays(SystemCoordinatorEntity, NumberEntity):
             await self.coordinator.api.set_cooling_for_days(
                 self.system, duration_days=int(value)
             )
-        await self.coordinator.async_request_refresh_delayed(20)
+        await self.coordinator.async_request_refresh_delayed(REFRESH_DELAY_LONG)
 
     @property
     def unique_id(self) -> str:
@@ -177,6 +210,10 @@ class ZoneQuickVetoDurationNumber(ZoneCoordinatorEntity, NumberEntity):
     def name(self):
         return f"{self.name_prefix} Quick Veto Duration"
 
+    def fingerprint(self) -> tuple[Any, ...] | None:
+        # The remaining duration changes with time
+        return None
+
     @property
     def native_value(self):
         return (
@@ -189,10 +226,10 @@ class ZoneQuickVetoDurationNumber(ZoneCoordinatorEntity, NumberEntity):
     async def async_set_native_value(self, value: float) -> None:
         if value == 0:
             await self.coordinator.api.cancel_quick_veto_zone_temperature(self.zone)
-            await self.coordinator.async_request_refresh_delayed(10)
+            await self.coordinator.async_request_refresh_delayed(REFRESH_DELAY_MEDIUM)
         else:
             await self.coordinator.api.quick_veto_zone_duration(self.zone, value)
-            await self.coordinator.async_request_refresh_delayed(10)
+            await self.coordinator.async_request_refresh_delayed(REFRESH_DELAY_MEDIUM)
 
     @property
     def unique_id(self) -> str:
@@ -215,8 +252,15 @@ class CircuitHeatingCurve(CircuitEntity, NumberEntity):
 
     @ensure_token_refresh
     async def async_set_native_value(self, value: float) -> None:
-        await self.coordinator.api.set_circuit_heating_curve(self.circuit, value)
-        await self.coordinator.async_request_refresh_delayed()
+        self.coordinator.optimistic.apply(
+            (self.unique_id, "heating_curve"), self.circuit, {"heating_curve": value}
+        )
+        await self.coordinator.command_queue.async_submit(
+            (self.unique_id, "heating_curve"),
+            partial(
+                self.coordinator.api.set_circuit_heating_curve, self.circuit, value
+            ),
+        )
 
     @property
     def name(self) -> str:
@@ -240,12 +284,19 @@ class CircuitHeatDemandLimitedByOutsideTemperature(CircuitEntity, NumberEntity):
 
     @ensure_token_refresh
     async def async_set_native_value(self, value: float) -> None:
-        await (
-            self.coordinator.api.set_circuit_heat_demand_limited_by_outside_temperature(
-                self.circuit, value
-            )
+        self.coordinator.optimistic.apply(
+            (self.unique_id, "heat_demand_limited_by_outside_temperature"),
+            self.circuit,
+            {"heat_demand_limited_by_outside_temperature": value},
+        )
+        await self.coordinator.command_queue.async_submit(
+            (self.unique_id, "heat_demand_limited_by_outside_temperature"),
+            partial(
+                self.coordinator.api.set_circuit_heat_demand_limited_by_outside_temperature,
+                self.circuit,
+                value,
+            ),
         )
-        await self.coordinator.async_request_refresh_delayed()
 
     @property
     def name(self) -> str:
@@ -269,10 +320,19 @@ class CircuitMinFlowTemperatureSetpoint(CircuitEntity, NumberEntity):
 
     @ensure_token_refresh
     async def async_set_native_value(self, value: float) -> None:
-        await self.coordinator.api.set_circuit_min_flow_temperature_setpoint(
-            self.circuit, value
+        self.coordinator.optimistic.apply(
+            (self.unique_id, "min_flow_temperature_setpoint"),
+            self.circuit,
+            {"heating_flow_temperature_minimum_setpoint": value},
+        )
+        await self.coordinator.command_queue.async_submit(
+            (self.unique_id, "min_flow_temperature_setpoint"),
+            partial(
+                self.coordinator.api.set_circuit_min_flow_temperature_setpoint,
+                self.circuit,
+                value,
+            ),
         )
-        await self.coordinator.async_request_refresh_delayed()
 
     @property
     def name(self) -> str:
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Hashable
+from dataclasses import dataclass
+from datetime import datetime as dt, timedelta, timezone
+from typing import TYPE_CHECKING, Any
+
+from myPyllant.models import Circuit, DomesticHotWater, System, Zone
+
+from custom_components.mypyllant.const import OPTIMISTIC_STATE_TIMEOUT
+
+if TYPE_CHECKING:
+    from custom_components.mypyllant.coordinator import SystemCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Maps model classes to the list on System that contains them
+MODEL_LISTS: dict[type, str] = {
+    Zone: "zones",
+    Circuit: "circuits",
+    DomesticHotWater: "domestic_hot_water",
+}
+
+
+def _get_attribute(model: Any, attribute: str) -> Any:
+    for name in attribute.split("."):
+        model = getattr(model, name, None)
+    return model
+
+
+def _set_attribute(model: Any, attribute: str, value: Any) -> None:
+    *path, name = attribute.split(".")
+    for part in path:
+        model = getattr(model, part, None)
+    if model is not None:
+        setattr(model, name, value)
+
+
+@dataclass
+class OptimisticValue:
+    """
+    A value that was written to the API, but might not be returned by it yet
+    """
+
+    model_list: str
+    system_id: str
+    index: int
+    attribute: str
+    value: Any
+    previous: Any
+    expires: dt
+
+    def find_model(self, systems: list[System]) -> Any | None:
+        for system in systems:
+            if system.id != self.system_id:
+                continue
+            return next(
+                (m for m in getattr(system, self.model_list) if m.index == self.index),
+                None,
+            )
+        return None
+
+
+class OptimisticState:
+    """
+    Applies written values to the models before the API returns them, so entities show the new state
+    immediately
+
+    Values are kept on top of refreshed data until the API confirms them, or until they expire. A failed
+    write restores the previous value.
+    """
+
+    def __init__(self, coordinator: SystemCoordinator) -> None:
+        self.coordinator = coordinator
+        self._values: dict[Hashable, list[OptimisticValue]] = {}
+
+    def apply(
+        self,
+        key: Hashable,
+        model: Zone | Circuit | DomesticHotWater,
+        attributes: dict[str, Any],
+    ) -> None:
+        """
+        Sets attributes on a model and updates the entities
+
+        Parameters:
+            key: Identifies the write, a later apply() with the same key replaces the pending values
+            model: The zone, circuit or domestic hot water model in the coordinator data
+            attributes: New values by attribute name, nested attributes are separated by a dot
+        """
+        expires = dt.now(timezone.utc) + timedelta(seconds=OPTIMISTIC_STATE_TIMEOUT)
+        previous = {v.attribute: v.previous for v in self._values.get(key, [])}
+        self._values[key] = []
+        for attribute, value in attributes.items():
+            self._values[key].append(
+                OptimisticValue(
+                    model_list=MODEL_LISTS[type(model)],
+                    system_id=model.system_id,
+                    index=model.index,
+                    attribute=attribute,
+                    value=value,
+                    previous=previous.get(attribute, _get_attribute(model, attribute)),
+                    expires=expires,
+                )
+            )
+            _set_attribute(model, attribute, value)
+        self.coordinator.async_set_updated_data(self.coordinator.data)
+
+    def rollback(self, key: Hashable) -> None:
+        """
+        Restores the values from before apply(), i.e. when the write failed
+        """
+        values = self._values.pop(key, [])
+        for value in values:
+            model = value.find_model(self.coordinator.data or [])
+            if model is not None and _get_attribute(model, value.attribute) == (
+                value.value
+            ):
+                _LOGGER.debug("Rolling back %s on %s", value.attribute, key)
+                _set_attribute(model, value.attribute, value.previous)
+        if values:
+            self.coordinator.async_set_updated_data(self.coordinator.data)
+
+    def reconcile(self, systems: list[System]) -> None:
+        """
+        Compares pending values with freshly fetched systems
+
+        Confirmed and expired values are dropped, values the API doesn't return yet are applied again
+        """
+        now = dt.now(timezone.utc)
+        for key, values in list(self._values.items()):
+            pending = []
+            for value in values:
+                model = value.find_model(systems)
+                if model is None:
+                    continue
+                if _get_attribute(model, value.attribute) == value.value:
+                    _LOGGER.debug("API confirmed %s on %s", value.attribute, key)
+                elif now >= value.expires:
+                    _LOGGER.debug(
+                        "API didn't confirm %s on %s, using the returned value",
+                        value.attribute,
+                        key,
+                    )
+                else:
+                    _set_attribute(model, value.attribute, value.value)
+                    pending.append(value)
+            if pending:
+                self._values[key] = pending
+            else:
+                del self._values[key]
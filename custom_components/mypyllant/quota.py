@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import logging
+from asyncio import CancelledError
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime as dt, timedelta, timezone
+
+from aiohttp.client_exceptions import ClientResponseError
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from myPyllant.api import MyPyllantAPI
+
+from custom_components.mypyllant.const import (
+    API_BUDGET_MAX_STRETCH,
+    API_BUDGET_SAFETY_MARGIN,
+    API_BUDGET_STRETCH_THRESHOLD,
+    API_BUDGET_WINDOW,
+    API_BUDGET_WRITE_RESERVE,
+    API_DOWN_PAUSE_INTERVAL,
+    QUOTA_PAUSE_INTERVAL,
+)
+from custom_components.mypyllant.utils import (
+    extract_quota_duration,
+    is_quota_exceeded_exception,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ApiBudget:
+    """
+    Tracks API calls of an account in a rolling window and learns the quota from past lockouts
+
+    Background updates slow down when the calls get close to the learned quota, and stop before reaching it,
+    so a part of the quota is always left for user initiated writes
+    """
+
+    def __init__(self, api: MyPyllantAPI) -> None:
+        self.api = api
+        self.learned_limit: int | None = None
+        self._samples: deque[tuple[dt, int]] = deque()
+
+    @property
+    def _request_count(self) -> int:
+        return self.api.aiohttp_session.request_count
+
+    def record(self) -> None:
+        """
+        Samples the request counter of the API session, should be called around each update
+        """
+        now = dt.now(timezone.utc)
+        count = self._request_count
+        if self._samples and count < self._samples[-1][1]:
+            # The session was replaced, old samples can't be compared anymore
+            self._samples.clear()
+        self._samples.append((now, count))
+        while self._samples and self._samples[0][0] < now - timedelta(
+            seconds=API_BUDGET_WINDOW
+        ):
+            self._samples.popleft()
+        if self.learned_limit is not None and self.calls_in_window > self.learned_limit:
+            # More calls than the learned quota went through, so the quota must be higher
+            _LOGGER.debug(
+                "Raising learned API quota from %s to %s",
+                self.learned_limit,
+                self.calls_in_window,
+            )
+            self.learned_limit = self.calls_in_window
+
+    @property
+    def calls_in_window(self) -> int:
+        if not self._samples:
+            return 0
+        return max(0, self._request_count - self._samples[0][1])
+
+    def record_lockout(self) -> None:
+        """
+        Learns the quota from the number of calls that led to a lockout
+        """
+        self.record()
+        calls = self.calls_in_window
+        if calls and (self.learned_limit is None or calls < self.learned_limit):
+            _LOGGER.info(
+                "Hit API quota after %s calls in %ss, slowing down updates before that",
+                calls,
+                API_BUDGET_WINDOW,
+            )
+            self.learned_limit = calls
+
+    @property
+    def background_limit(self) -> int | None:
+        """
+        Number of calls in the window that background updates may use, None if the quota is unknown
+        """
+        if self.learned_limit is None:
+            return None
+        return int(
+            self.learned_limit
+            * API_BUDGET_SAFETY_MARGIN
+            * (1 - API_BUDGET_WRITE_RESERVE)
+        )
+
+    def allows_background_update(self) -> bool:
+        limit = self.background_limit
+        return limit is None or self.calls_in_window < limit
+
+    def stretch(self, interval: timedelta | None) -> timedelta | None:
+        """
+        Lengthens an update interval proportionally to the used budget
+
+        The interval stays the same below API_BUDGET_STRETCH_THRESHOLD of the background limit
+        """
+        limit = self.background_limit
+        if interval is None or not limit:
+            return interval
+        usage = self.calls_in_window / limit
+        factor = min(
+            API_BUDGET_MAX_STRETCH, max(1.0, usage / API_BUDGET_STRETCH_THRESHOLD)
+        )
+        return interval * factor
+
+
+class QuotaController:
+    """
+    Quota and API down state of an account, shared by all coordinators and entity actions of a config entry
+
+    Holds the only lockout end time, so a quota error on one endpoint pauses all requests until it expires
+    """
+
+    def __init__(self, api: MyPyllantAPI) -> None:
+        self.budget = ApiBudget(api)
+        self.hit_time: dt | None = None
+        self.end_time: dt | None = None
+        self.exc_info: BaseException | None = None
+        self._listeners: list[Callable[[], None]] = []
+
+    def async_add_listener(
+        self, update_callback: Callable[[], None]
+    ) -> Callable[[], None]:
+        """
+        Calls update_callback whenever the lockout state changes, returns a function to remove the listener
+        """
+        self._listeners.append(update_callback)
+        return lambda: self._listeners.remove(update_callback)
+
+    def _notify_listeners(self) -> None:
+        for update_callback in self._listeners:
+            update_callback()
+
+    def clear(self) -> None:
+        """Clear all quota-related state to allow fresh retries."""
+        changed = self.hit_time is not None
+        self.hit_time = None
+        self.end_time = None
+        self.exc_info = None
+        if changed:
+            self._notify_listeners()
+
+    def set_api_down(self, exc_info: CancelledError | TimeoutError) -> None:
+        self.hit_time = dt.now(timezone.utc)
+        self.exc_info = exc_info
+        self._notify_listeners()
+
+    def set_quota_exceeded(self, exc_info: ClientResponseError) -> bool:
+        """
+        Stores the lockout if the exception is a quota error, with the end time from Retry-After or the message
+
+        Returns True if it was a quota error
+        """
+        if not is_quota_exceeded_exception(exc_info):
+            return False
+        duration = extract_quota_duration(exc_info)
+        self.hit_time = dt.now(timezone.utc)
+        self.end_time = (
+            self.hit_time + timedelta(seconds=duration) if duration else None
+        )
+        self.exc_info = exc_info
+        self.budget.record_lockout()
+        self._notify_listeners()
+        return True
+
+    @property
+    def lockout_end_time(self) -> dt | None:
+        """
+        Get the time until which no requests should be made, None if there is no lockout
+        """
+        if not self.hit_time:
+            return None
+        if is_quota_exceeded_exception(self.exc_info):
+            return self.end_time or self.hit_time + timedelta(
+                seconds=QUOTA_PAUSE_INTERVAL
+            )
+        return self.hit_time + timedelta(seconds=API_DOWN_PAUSE_INTERVAL)
+
+    def raise_if_locked(
+        self,
+        action: str,
+        error: type[HomeAssistantError] = UpdateFailed,
+    ) -> None:
+        """
+        Check if we previously hit a quota, and if the quota was hit within a certain interval
+        If yes, we keep raising until after the interval to avoid spamming the API
+
+        Parameters:
+            action: What is skipped, for the error message
+            error: Exception class to raise, UpdateFailed for coordinators
+        """
+        end_time = self.lockout_end_time
+        if end_time is None:
+            return
+
+        now = dt.now(timezone.utc)
+        time_elapsed = (now - self.hit_time).total_seconds()  # type: ignore
+        if now >= end_time:
+            # Backoff period has expired, clear state and allow retry
+            _LOGGER.info(
+                "Backoff after %s expired, clearing quota state and resuming requests",
+                "quota error"
+                if is_quota_exceeded_exception(self.exc_info)
+                else "API down",
+            )
+            self.clear()
+            return
+
+        remaining = int((end_time - now).total_seconds())
+        if is_quota_exceeded_exception(self.exc_info):
+            _LOGGER.debug(
+                "Quota was hit %ss ago on %s",
+                int(time_elapsed),
+                self.hit_time,
+                exc_info=self.exc_info,
+            )
+            raise error(
+                f"{self.exc_info.message} on {self.exc_info.request_info.real_url}, "  # type: ignore
+                f"skipping {action} for another {remaining}s"
+            ) from self.exc_info
+        _LOGGER.debug(
+            "myVAILLANT API is down since %ss (%s)",
+            int(time_elapsed),
+            self.hit_time,
+            exc_info=self.exc_info,
+        )
+        raise error(
+            f"myVAILLANT API is down, skipping {action} for another {remaining}s"
+        ) from self.exc_info
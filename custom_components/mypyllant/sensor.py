@@ -2,17 +2,10 @@ from __future__ import annotations
 
 import logging
 from collections.abc import Mapping
-from datetime import datetime, timedelta
+from datetime import date, datetime, time
+from functools import partial
 from typing import Any
 
-from homeassistant.components.recorder import get_instance
-from homeassistant.components.recorder.statistics import (
-    StatisticData,
-    StatisticMeanType,
-    StatisticMetaData,
-    async_add_external_statistics,
-    statistics_during_period,
-)
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
@@ -39,22 +32,30 @@ from myPyllant.models import (
     System,
 )
 
+from custom_components.mypyllant.model_index import ModelKey, is_added
+from custom_components.mypyllant.topology import EntityTracker
 from custom_components.mypyllant.utils import (
     SystemCoordinatorEntity,
     DomesticHotWaterCoordinatorEntity,
     ZoneCoordinatorEntity,
+    ChangeDetectingEntity,
     EntityList,
+    IdentityCachingEntity,
+    identity_property,
 )
 from myPyllant.utils import prepare_field_value_for_dict
 
 from . import DailyDataCoordinator, SystemCoordinator
 from .const import DOMAIN
+from .totals import TO_DATE_PERIODS, ToDatePeriod, period_start
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def create_system_sensors(
-    hass: HomeAssistant, config: ConfigEntry
+    hass: HomeAssistant,
+    config: ConfigEntry,
+    added: frozenset[ModelKey] | None = None,
 ) -> EntityList[SensorEntity]:
     system_coordinator: SystemCoordinator = hass.data[DOMAIN][config.entry_id][
         "system_coordinator"
@@ -65,41 +66,48 @@ async def create_system_sensors(
 
     sensors: EntityList[SensorEntity] = EntityList()
     _LOGGER.debug("Creating system sensors for %s", system_coordinator.data)
-    sensors.append(lambda: SystemAPIRequestCount(system_coordinator))
+    model_index = system_coordinator.model_index
+    if added is None:
+        sensors.append(lambda: SystemAPIRequestCount(system_coordinator))
     for index, system in enumerate(system_coordinator.data):
-        if system.outdoor_temperature is not None:
-            sensors.append(
-                lambda: SystemOutdoorTemperatureSensor(index, system_coordinator)
-            )
-        if system.water_pressure is not None:
-            sensors.append(lambda: SystemWaterPressureSensor(index, system_coordinator))
-        if system.cylinder_temperature_sensor_top_dhw is not None:
-            sensors.append(
-                lambda: SystemTopDHWTemperatureSensor(index, system_coordinator)
-            )
-        if system.cylinder_temperature_sensor_bottom_dhw is not None:
-            sensors.append(
-                lambda: SystemBottomDHWTemperatureSensor(index, system_coordinator)
-            )
-        if system.cylinder_temperature_sensor_top_ch is not None:
-            sensors.append(
-                lambda: SystemTopCHTemperatureSensor(index, system_coordinator)
-            )
-        if system.cylinder_temperature_sensor_bottom_ch is not None:
-            sensors.append(
-                lambda: SystemBottomCHTemperatureSensor(index, system_coordinator)
-            )
-        if system.system_flow_temperature is not None:
-            sensors.append(
-                lambda: SystemFlowTemperatureSensor(index, system_coordinator)
-            )
-        if system.energy_manager_state is not None:
-            sensors.append(
-                lambda: SystemEnergyManagerStateSensor(index, system_coordinator)
-            )
-        sensors.append(lambda: HomeEntity(index, system_coordinator))
+        if is_added(added, model_index.key(index, "system")):
+            if system.outdoor_temperature is not None:
+                sensors.append(
+                    lambda: SystemOutdoorTemperatureSensor(index, system_coordinator)
+                )
+            if system.water_pressure is not None:
+                sensors.append(
+                    lambda: SystemWaterPressureSensor(index, system_coordinator)
+                )
+            if system.cylinder_temperature_sensor_top_dhw is not None:
+                sensors.append(
+                    lambda: SystemTopDHWTemperatureSensor(index, system_coordinator)
+                )
+            if system.cylinder_temperature_sensor_bottom_dhw is not None:
+                sensors.append(
+                    lambda: SystemBottomDHWTemperatureSensor(index, system_coordinator)
+                )
+            if system.cylinder_temperature_sensor_top_ch is not None:
+                sensors.append(
+                    lambda: SystemTopCHTemperatureSensor(index, system_coordinator)
+                )
+            if system.cylinder_temperature_sensor_bottom_ch is not None:
+                sensors.append(
+                    lambda: SystemBottomCHTemperatureSensor(index, system_coordinator)
+                )
+            if system.system_flow_temperature is not None:
+                sensors.append(
+                    lambda: SystemFlowTemperatureSensor(index, system_coordinator)
+                )
+            if system.energy_manager_state is not None:
+                sensors.append(
+                    lambda: SystemEnergyManagerStateSensor(index, system_coordinator)
+                )
+            sensors.append(lambda: HomeEntity(index, system_coordinator))
 
         for device_index, device in enumerate(system.devices):
+            if not is_added(added, model_index.key(index, "device", device_index)):
+                continue
             _LOGGER.debug("Creating SystemDevice sensors for %s", device)
 
             if "water_pressure" in device.operational_data:
@@ -128,6 +136,8 @@ async def create_system_sensors(
                 )
 
         for zone_index, zone in enumerate(system.zones):
+            if not is_added(added, model_index.key(index, "zone", zone_index)):
+                continue
             _LOGGER.debug("Creating Zone sensors for %s", zone)
             sensors.append(
                 lambda: ZoneDesiredRoomTemperatureSetpointSensor(
@@ -178,6 +188,8 @@ async def create_system_sensors(
             )
 
         for circuit_index, circuit in enumerate(system.circuits):
+            if not is_added(added, model_index.key(index, "circuit", circuit_index)):
+                continue
             _LOGGER.debug("Creating Circuit sensors for %s", circuit)
             sensors.append(
                 lambda: CircuitStateSensor(index, circuit_index, system_coordinator)
@@ -208,6 +220,10 @@ async def create_system_sensors(
                 )
 
         for dhw_index, dhw in enumerate(system.domestic_hot_water):
+            if not is_added(
+                added, model_index.key(index, "domestic_hot_water", dhw_index)
+            ):
+                continue
             _LOGGER.debug("Creating Domestic Hot Water sensors for %s", dhw)
             if dhw.current_dhw_temperature:
                 sensors.append(
@@ -252,6 +268,13 @@ async def create_daily_data_sensors(
         sensors.append(
             lambda: EfficiencySensor(system_id, None, daily_data_coordinator)
         )
+        for energy_type in daily_data_coordinator.period_totals.energy_types(system_id):
+            for period in TO_DATE_PERIODS:
+                sensors.append(
+                    lambda: PeriodTotalSensor(
+                        system_id, energy_type, period, daily_data_coordinator
+                    )
+                )
         for de_index, devices_data in enumerate(system_devices["devices_data"]):
             if len(devices_data) == 0:
                 continue
@@ -278,7 +301,16 @@ async def create_daily_data_sensors(
 async def async_setup_entry(
     hass: HomeAssistant, config: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
-    async_add_entities(await create_system_sensors(hass, config))  # type: ignore
+    system_coordinator: SystemCoordinator = hass.data[DOMAIN][config.entry_id][
+        "system_coordinator"
+    ]
+    await EntityTracker(
+        hass,
+        config,
+        system_coordinator,
+        async_add_entities,
+        partial(create_system_sensors, hass, config),
+    ).async_setup()
     async_add_entities(await create_daily_data_sensors(hass, config))  # type: ignore
 
 
@@ -298,11 +330,11 @@ class SystemOutdoorTemperatureSensor(SystemSensor):
         else:
             return None
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_outdoor_temperature"
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Outdoor Temperature"
 
@@ -320,11 +352,11 @@ class SystemTopDHWTemperatureSensor(SystemSensor):
         else:
             return None
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_top_dhw_temperature"
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Top DHW Cylinder Temperature"
 
@@ -342,11 +374,11 @@ class SystemBottomDHWTemperatureSensor(SystemSensor):
         else:
             return None
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_bottom_dhw_temperature"
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Bottom DHW Cylinder Temperature"
 
@@ -364,11 +396,11 @@ class SystemTopCHTemperatureSensor(SystemSensor):
         else:
             return None
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_top_ch_temperature"
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Top Central Heating Cylinder Temperature"
 
@@ -386,11 +418,11 @@ class SystemBottomCHTemperatureSensor(SystemSensor):
         else:
             return None
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_bottom_ch_temperature"
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Bottom Central Heating Cylinder Temperature"
 
@@ -408,16 +440,16 @@ class SystemWaterPressureSensor(SystemSensor):
         else:
             return None
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_water_pressure"
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} System Water Pressure"
 
 
-class HomeEntity(CoordinatorEntity, SensorEntity):
+class HomeEntity(IdentityCachingEntity, SensorEntity):
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     coordinator: SystemCoordinator
 
@@ -428,10 +460,14 @@ class HomeEntity(CoordinatorEntity, SensorEntity):
     ):
         super().__init__(coordinator)
         self.system_index = system_index
+        self._system_key = coordinator.model_index.key(system_index, "system")
 
     @property
     def system(self) -> System:
-        return self.coordinator.data[self.system_index]
+        return self.coordinator.model_index[self._system_key]
+
+    def identity(self) -> tuple[Any, ...] | None:
+        return self.system.home, self.system.brand_name
 
     @property
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
@@ -452,15 +488,15 @@ class HomeEntity(CoordinatorEntity, SensorEntity):
             | eebus
         )
 
-    @property
+    @identity_property
     def name_prefix(self) -> str:
         return f"{self.system.home.home_name or self.system.home.nomenclature}"
 
-    @property
+    @identity_property
     def id_infix(self) -> str:
         return f"{self.system.id}_home"
 
-    @property
+    @identity_property
     def device_info(self):
         return DeviceInfo(
             identifiers={(DOMAIN, self.id_infix)},
@@ -470,7 +506,7 @@ class HomeEntity(CoordinatorEntity, SensorEntity):
             sw_version=self.system.home.firmware_version,
         )
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_base"
 
@@ -478,7 +514,7 @@ class HomeEntity(CoordinatorEntity, SensorEntity):
     def native_value(self):
         return self.system.home.firmware_version
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.system.home.home_name or self.system.home.nomenclature} Firmware Version"
 
@@ -488,7 +524,7 @@ class ZoneDesiredRoomTemperatureSetpointSensor(ZoneCoordinatorEntity, SensorEnti
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_state_class = SensorStateClass.MEASUREMENT
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Desired Temperature"
 
@@ -496,7 +532,7 @@ class ZoneDesiredRoomTemperatureSetpointSensor(ZoneCoordinatorEntity, SensorEnti
     def native_value(self):
         return self.zone.desired_room_temperature_setpoint
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_desired_temperature"
 
@@ -504,7 +540,7 @@ class ZoneDesiredRoomTemperatureSetpointSensor(ZoneCoordinatorEntity, SensorEnti
 class ZoneDesiredRoomTemperatureSetpointHeatingSensor(
     ZoneDesiredRoomTemperatureSetpointSensor
 ):
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Desired Heating Temperature"
 
@@ -512,7 +548,7 @@ class ZoneDesiredRoomTemperatureSetpointHeatingSensor(
     def native_value(self):
         return self.zone.desired_room_temperature_setpoint_heating
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_desired_heating_temperature"
 
@@ -520,7 +556,7 @@ class ZoneDesiredRoomTemperatureSetpointHeatingSensor(
 class ZoneDesiredRoomTemperatureSetpointCoolingSensor(
     ZoneDesiredRoomTemperatureSetpointSensor
 ):
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Desired Cooling Temperature"
 
@@ -528,7 +564,7 @@ class ZoneDesiredRoomTemperatureSetpointCoolingSensor(
     def native_value(self):
         return self.zone.desired_room_temperature_setpoint_cooling
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_desired_cooling_temperature"
 
@@ -538,7 +574,7 @@ class ZoneCurrentRoomTemperatureSensor(ZoneCoordinatorEntity, SensorEntity):
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_state_class = SensorStateClass.MEASUREMENT
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Current Temperature"
 
@@ -550,7 +586,7 @@ class ZoneCurrentRoomTemperatureSensor(ZoneCoordinatorEntity, SensorEntity):
             else round(self.zone.current_room_temperature, 1)
         )
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_current_temperature"
 
@@ -560,7 +596,7 @@ class ZoneHumiditySensor(ZoneCoordinatorEntity, SensorEntity):
     _attr_device_class = SensorDeviceClass.HUMIDITY
     _attr_state_class = SensorStateClass.MEASUREMENT
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Humidity"
 
@@ -568,7 +604,7 @@ class ZoneHumiditySensor(ZoneCoordinatorEntity, SensorEntity):
     def native_value(self):
         return self.zone.current_room_humidity
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_humidity"
 
@@ -576,7 +612,7 @@ class ZoneHumiditySensor(ZoneCoordinatorEntity, SensorEntity):
 class ZoneHeatingOperatingModeSensor(ZoneCoordinatorEntity, SensorEntity):
     _attr_entity_category = EntityCategory.DIAGNOSTIC
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Heating Operating Mode"
 
@@ -584,7 +620,7 @@ class ZoneHeatingOperatingModeSensor(ZoneCoordinatorEntity, SensorEntity):
     def native_value(self):
         return self.zone.heating.operation_mode_heating.display_value
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_heating_operating_mode"
 
@@ -592,7 +628,7 @@ class ZoneHeatingOperatingModeSensor(ZoneCoordinatorEntity, SensorEntity):
 class ZoneCoolingOperatingModeSensor(ZoneCoordinatorEntity, SensorEntity):
     _attr_entity_category = EntityCategory.DIAGNOSTIC
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Cooling Operating Mode"
 
@@ -603,7 +639,7 @@ class ZoneCoolingOperatingModeSensor(ZoneCoordinatorEntity, SensorEntity):
         else:
             return None
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_cooling_operating_mode"
 
@@ -611,7 +647,7 @@ class ZoneCoolingOperatingModeSensor(ZoneCoordinatorEntity, SensorEntity):
 class ZoneHeatingStateSensor(ZoneCoordinatorEntity, SensorEntity):
     _attr_entity_category = EntityCategory.DIAGNOSTIC
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Heating State"
 
@@ -622,7 +658,7 @@ class ZoneHeatingStateSensor(ZoneCoordinatorEntity, SensorEntity):
         else:
             return None
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_heating_state"
 
@@ -630,7 +666,7 @@ class ZoneHeatingStateSensor(ZoneCoordinatorEntity, SensorEntity):
 class ZoneCurrentSpecialFunctionSensor(ZoneCoordinatorEntity, SensorEntity):
     _attr_entity_category = EntityCategory.DIAGNOSTIC
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Current Special Function"
 
@@ -638,12 +674,12 @@ class ZoneCurrentSpecialFunctionSensor(ZoneCoordinatorEntity, SensorEntity):
     def native_value(self):
         return self.zone.current_special_function.display_value
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_current_special_function"
 
 
-class CircuitSensor(CoordinatorEntity, SensorEntity):
+class CircuitSensor(ChangeDetectingEntity, SensorEntity):
     coordinator: SystemCoordinator
 
     def __init__(
@@ -652,24 +688,34 @@ class CircuitSensor(CoordinatorEntity, SensorEntity):
         super().__init__(coordinator)
         self.system_index = system_index
         self.circuit_index = circuit_index
+        self._system_key = coordinator.model_index.key(system_index, "system")
+        self._circuit_key = coordinator.model_index.key(
+            system_index, "circuit", circuit_index
+        )
 
     @property
     def system(self) -> System:
-        return self.coordinator.data[self.system_index]
+        return self.coordinator.model_index[self._system_key]
 
     @property
     def circuit(self) -> Circuit:
-        return self.system.circuits[self.circuit_index]
+        return self.coordinator.model_index[self._circuit_key]
 
-    @property
+    def fingerprint(self) -> tuple[Any, ...] | None:
+        return self.circuit, self.system.home, self.system.brand_name
+
+    def identity(self) -> tuple[Any, ...] | None:
+        return self.system.home, self.system.brand_name
+
+    @identity_property
     def name_prefix(self) -> str:
         return f"{self.system.home.home_name or self.system.home.nomenclature} Circuit {self.circuit_index}"
 
-    @property
+    @identity_property
     def id_infix(self) -> str:
         return f"{self.system.id}_circuit_{self.circuit.index}"
 
-    @property
+    @identity_property
     def device_info(self):
         return {"identifiers": {(DOMAIN, self.id_infix)}}
 
@@ -680,7 +726,7 @@ class CircuitFlowTemperatureSensor(CircuitSensor):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_entity_category = EntityCategory.DIAGNOSTIC
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Current Flow Temperature"
 
@@ -688,7 +734,7 @@ class CircuitFlowTemperatureSensor(CircuitSensor):
     def native_value(self):
         return self.circuit.current_circuit_flow_temperature
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_flow_temperature"
 
@@ -699,7 +745,7 @@ class CircuitFlowTemperatureSetpointSensor(CircuitSensor):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_entity_category = EntityCategory.DIAGNOSTIC
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Flow Temperature Setpoint"
 
@@ -707,7 +753,7 @@ class CircuitFlowTemperatureSetpointSensor(CircuitSensor):
     def native_value(self):
         return self.circuit.heating_circuit_flow_setpoint
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_flow_temperature_setpoint"
 
@@ -715,7 +761,7 @@ class CircuitFlowTemperatureSetpointSensor(CircuitSensor):
 class CircuitStateSensor(CircuitSensor):
     _attr_entity_category = EntityCategory.DIAGNOSTIC
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} State"
 
@@ -736,7 +782,7 @@ class CircuitStateSensor(CircuitSensor):
             "heating_circuit_flow_setpoint": self.circuit.heating_circuit_flow_setpoint,
         }
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_state"
 
@@ -747,7 +793,7 @@ class CircuitMinFlowTemperatureSetpointSensor(CircuitSensor):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_entity_category = EntityCategory.DIAGNOSTIC
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Min Flow Temperature Setpoint"
 
@@ -755,7 +801,7 @@ class CircuitMinFlowTemperatureSetpointSensor(CircuitSensor):
     def native_value(self):
         return self.circuit.min_flow_temperature_setpoint
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_min_flow_temperature_setpoint"
 
@@ -764,7 +810,7 @@ class CircuitHeatingCurveSensor(CircuitSensor):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_entity_category = EntityCategory.DIAGNOSTIC
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Heating Curve"
 
@@ -775,7 +821,7 @@ class CircuitHeatingCurveSensor(CircuitSensor):
         else:
             return None
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_heating_curve"
 
@@ -787,7 +833,7 @@ class DomesticHotWaterTankTemperatureSensor(
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_state_class = SensorStateClass.MEASUREMENT
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Tank Temperature"
 
@@ -795,7 +841,7 @@ class DomesticHotWaterTankTemperatureSensor(
     def native_value(self):
         return self.domestic_hot_water.current_dhw_temperature
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_tank_temperature"
 
@@ -805,7 +851,7 @@ class DomesticHotWaterSetPointSensor(DomesticHotWaterCoordinatorEntity, SensorEn
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_state_class = SensorStateClass.MEASUREMENT
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Setpoint"
 
@@ -813,7 +859,7 @@ class DomesticHotWaterSetPointSensor(DomesticHotWaterCoordinatorEntity, SensorEn
     def native_value(self) -> float | None:
         return self.domestic_hot_water.tapping_setpoint
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_set_point"
 
@@ -823,7 +869,7 @@ class DomesticHotWaterOperationModeSensor(
 ):
     _attr_entity_category = EntityCategory.DIAGNOSTIC
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Operation Mode"
 
@@ -831,7 +877,7 @@ class DomesticHotWaterOperationModeSensor(
     def native_value(self):
         return self.domestic_hot_water.operation_mode_dhw.display_value
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_operation_mode"
 
@@ -841,7 +887,7 @@ class DomesticHotWaterCurrentSpecialFunctionSensor(
 ):
     _attr_entity_category = EntityCategory.DIAGNOSTIC
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Current Special Function"
 
@@ -849,7 +895,7 @@ class DomesticHotWaterCurrentSpecialFunctionSensor(
     def native_value(self):
         return self.domestic_hot_water.current_special_function.display_value
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_current_special_function"
 
@@ -881,8 +927,9 @@ class DataSensor(CoordinatorEntity, SensorEntity):
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.statistics_writer.async_register(self))
         if self.coordinator.data:
-            await self._safe_write_hourly_statistics()
+            self.coordinator.statistics_writer.async_schedule()
         self._unsub_midnight = async_track_time_change(
             self.hass, self._handle_midnight, hour=0, minute=0, second=1
         )
@@ -939,12 +986,12 @@ class DataSensor(CoordinatorEntity, SensorEntity):
     @property
     def today_total_consumption(self) -> float:
         # The coordinator fetches a 2-day window (yesterday + today) so
-        # _write_hourly_statistics can backfill yesterday's last hour after
+        # the StatisticsWriter can backfill yesterday's last hour after
         # midnight (see coordinator.py). device_data.total_consumption is the
         # API's own aggregate for that whole 2-day range, so it can't be used
-        # here - it would never reset to 0 at midnight. Sum only today's own
-        # buckets instead, using the same bucket-midnight comparison
-        # _write_hourly_statistics already uses, so the two stay consistent.
+        # here - it would never reset to 0 at midnight. Use the total of only
+        # today's own buckets instead, which the coordinator indexes by the
+        # bucket's local day, the same day compute_hourly_statistics resets on.
         #
         # "Today" is anchored to the actual current time in the device's own
         # timezone, not to the last fetched bucket's date: right after
@@ -954,13 +1001,11 @@ class DataSensor(CoordinatorEntity, SensorEntity):
         if self.device_data is None or not self.device_data.data:
             return 0.0
         tzinfo = self.device_data.data[-1].start_date.tzinfo
-        today = datetime.now(tzinfo).replace(hour=0, minute=0, second=0, microsecond=0)
-        total = sum(
-            bucket.value
-            for bucket in self.device_data.data
-            if bucket.value is not None
-            and bucket.start_date.replace(hour=0, minute=0, second=0, microsecond=0)
-            == today
+        total = self.coordinator.daily_totals.device_data_total(
+            self.system_id,
+            self.de_index,
+            self.da_index,
+            datetime.now(tzinfo).date(),
         )
         return round(total / 1000, 1) * 1000 if total else 0.0
 
@@ -970,6 +1015,12 @@ class DataSensor(CoordinatorEntity, SensorEntity):
             return None
         return f"{DOMAIN}_{self.system_id}_{self.device.device_uuid}_{self.da_index}_{self.de_index}"
 
+    @property
+    def statistic_id(self) -> str | None:
+        if self.unique_id is None:
+            return None
+        return f"{DOMAIN}:{self.unique_id}".lower().replace("-", "_")
+
     @property
     def name_prefix(self) -> str:
         name_display = f" {self.device.name_display}" if self.device is not None else ""
@@ -1007,122 +1058,7 @@ class DataSensor(CoordinatorEntity, SensorEntity):
             self.last_reset,
             self.device_data.data if self.device_data is not None else None,
         )
-        self.hass.async_create_task(self._safe_write_hourly_statistics())
-
-    async def _safe_write_hourly_statistics(self) -> None:
-        try:
-            await self._write_hourly_statistics()
-        except Exception:  # noqa: BLE001
-            _LOGGER.warning(
-                "Failed to write hourly statistics for %s; will retry on next update",
-                self.unique_id,
-                exc_info=True,
-            )
-
-    async def _write_hourly_statistics(self) -> None:
-        if (
-            self.unique_id is None
-            or self.device_data is None
-            or not self.device_data.data
-        ):
-            return
-        statistic_id = f"{DOMAIN}:{self.unique_id}".lower().replace("-", "_")
-
-        window_start = self.device_data.data[0].start_date
-        window_end = self.device_data.data[-1].start_date + timedelta(hours=1)
-
-        # Baseline is the last-published sum strictly BEFORE this window, never the
-        # single most-recent stat ever recorded. get_last_statistics(1, ...) is
-        # unbounded - once any later window has been written, it returns a value
-        # that already includes this window's own buckets, so recomputing
-        # baseline + sum(this window's buckets) double-counts them and the sum
-        # grows on every single poll forever. Bounding the lookup to end at
-        # window_start keeps the baseline stable across repeated polls of the
-        # same window, so the existing-buckets dedup guard below can actually
-        # recognize unchanged buckets instead of rewriting everything every time.
-        last_stats = await get_instance(self.hass).async_add_executor_job(
-            statistics_during_period,
-            self.hass,
-            window_start - timedelta(days=7),
-            window_start,
-            {statistic_id},
-            "hour",
-            None,
-            {"sum"},
-        )
-        baseline_sum = (
-            last_stats[statistic_id][-1]["sum"] or 0.0
-            if statistic_id in last_stats and last_stats[statistic_id]
-            else 0.0
-        )
-
-        # Buckets already published for this window, keyed by start timestamp, so we
-        # only (re)write buckets that are new or whose value actually changed (a
-        # late API correction) - not every bucket on every run. Rewriting the whole
-        # window unconditionally re-anchors already-published, stable history to
-        # whatever baseline happens to be current, which breaks the daily reset.
-        existing_stats = await get_instance(self.hass).async_add_executor_job(
-            statistics_during_period,
-            self.hass,
-            window_start,
-            window_end,
-            {statistic_id},
-            "hour",
-            None,
-            {"sum"},
-        )
-        existing_sums = {
-            row["start"]: row["sum"]
-            for row in existing_stats.get(statistic_id, [])
-            if "start" in row
-        }
-
-        # The coordinator fetches a 2-day window (yesterday + today) so the previous
-        # day's final hour can still be backfilled once it finalises after midnight.
-        # sum stays monotonic (cumulative since baseline), while state and last_reset
-        # reset to the start of each day, mirroring octopus_energy's day-cumulative
-        # state.
-        running_sum = baseline_sum
-        running_state = 0.0
-        current_day = None
-        stats: list[StatisticData] = []
-        for bucket in self.device_data.data:
-            if bucket.value is None:
-                continue
-            bucket_midnight = bucket.start_date.replace(
-                hour=0, minute=0, second=0, microsecond=0
-            )
-            if current_day != bucket_midnight:
-                running_state = 0.0
-                current_day = bucket_midnight
-            running_sum += bucket.value
-            running_state += bucket.value
-            existing_sum = existing_sums.get(bucket.start_date.timestamp())
-            if existing_sum is not None and existing_sum == running_sum:
-                continue
-            stats.append(
-                StatisticData(
-                    start=bucket.start_date,
-                    last_reset=bucket_midnight,
-                    sum=running_sum,
-                    state=running_state,
-                )
-            )
-        if not stats:
-            return
-        async_add_external_statistics(
-            self.hass,
-            StatisticMetaData(
-                mean_type=StatisticMeanType.NONE,
-                has_sum=True,
-                name=self.name,
-                source=DOMAIN,
-                statistic_id=statistic_id,
-                unit_class="energy",
-                unit_of_measurement=UnitOfEnergy.WATT_HOUR,
-            ),
-            stats,
-        )
+        self.coordinator.statistics_writer.async_schedule()
 
 
 class EfficiencySensor(CoordinatorEntity, SensorEntity):
@@ -1151,31 +1087,26 @@ class EfficiencySensor(CoordinatorEntity, SensorEntity):
     def home_name(self) -> str:
         return self.coordinator.data[self.system_id]["home_name"]
 
+    def _today_total(self, energy_type: str) -> float:
+        daily_totals = self.coordinator.daily_totals
+        today = datetime.now(daily_totals.timezone(self.system_id)).date()
+        return daily_totals.energy_type_total(
+            self.system_id, self.de_index, energy_type, today
+        )
+
     @property
     def energy_consumed(self) -> float:
         """
         Returns total consumed electrical energy for the current day
         """
-        return sum(
-            [
-                v.total_consumption_rounded
-                for v in self.device_data_list
-                if v.energy_type == "CONSUMED_ELECTRICAL_ENERGY"
-            ]
-        )
+        return self._today_total("CONSUMED_ELECTRICAL_ENERGY")
 
     @property
     def heat_energy_generated(self) -> float:
         """
         Returns total generated heating energy for the current day
         """
-        return sum(
-            [
-                v.total_consumption_rounded
-                for v in self.device_data_list
-                if v.energy_type == "HEAT_GENERATED"
-            ]
-        )
+        return self._today_total("HEAT_GENERATED")
 
     @property
     def unique_id(self) -> str:
@@ -1208,8 +1139,9 @@ class EfficiencySensor(CoordinatorEntity, SensorEntity):
 
     @property
     def native_value(self) -> float | None:
-        if self.energy_consumed is not None and self.energy_consumed > 0:
-            return round(self.heat_energy_generated / self.energy_consumed, 1)
+        energy_consumed = self.energy_consumed
+        if energy_consumed > 0:
+            return round(self.heat_energy_generated / energy_consumed, 1)
         else:
             return None
 
@@ -1225,7 +1157,79 @@ class EfficiencySensor(CoordinatorEntity, SensorEntity):
             return f"{self.home_name} Heating Energy Efficiency"
 
 
-class SystemDeviceSensor(CoordinatorEntity, SensorEntity):
+class PeriodTotalSensor(CoordinatorEntity, SensorEntity):
+    """
+    Month or year to date total of an energy type for all devices of a system, accumulated from the daily data
+    """
+
+    coordinator: DailyDataCoordinator
+    _attr_state_class = SensorStateClass.TOTAL
+    _attr_native_unit_of_measurement = UnitOfEnergy.WATT_HOUR
+    _attr_device_class = SensorDeviceClass.ENERGY
+
+    def __init__(
+        self,
+        system_id: str,
+        energy_type: str,
+        period: ToDatePeriod,
+        coordinator: DailyDataCoordinator,
+    ) -> None:
+        super().__init__(coordinator)
+        self.system_id = system_id
+        self.energy_type = energy_type
+        self.period = period
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        # The total starts over at the first midnight of a month or year, without an update
+        self.async_on_remove(
+            async_track_time_change(
+                self.hass, self._handle_midnight, hour=0, minute=0, second=1
+            )
+        )
+
+    @callback
+    def _handle_midnight(self, now: datetime) -> None:
+        self.async_write_ha_state()
+
+    @property
+    def home_name(self) -> str:
+        return self.coordinator.data[self.system_id]["home_name"]
+
+    @property
+    def today(self) -> date:
+        return datetime.now(
+            self.coordinator.daily_totals.timezone(self.system_id)
+        ).date()
+
+    @property
+    def name(self):
+        energy_type = self.energy_type.replace("_", " ").title()
+        return f"{self.home_name} {energy_type} {self.period.title()} to Date"
+
+    @property
+    def unique_id(self) -> str:
+        return f"{DOMAIN}_{self.system_id}_{self.energy_type.lower()}_{self.period}_to_date"
+
+    @property
+    def device_info(self):
+        return {"identifiers": {(DOMAIN, f"{self.system_id}_home")}}
+
+    @property
+    def last_reset(self) -> datetime:
+        start = period_start(self.today, self.period)
+        return datetime.combine(
+            start, time(), self.coordinator.daily_totals.timezone(self.system_id)
+        )
+
+    @property
+    def native_value(self) -> float:
+        return self.coordinator.period_totals.total(
+            self.system_id, self.energy_type, self.today, self.period
+        )
+
+
+class SystemDeviceSensor(ChangeDetectingEntity, SensorEntity):
     coordinator: SystemCoordinator
 
     def __init__(
@@ -1234,25 +1238,35 @@ class SystemDeviceSensor(CoordinatorEntity, SensorEntity):
         super().__init__(coordinator)
         self.system_index = system_index
         self.device_index = device_index
+        self._system_key = coordinator.model_index.key(system_index, "system")
+        self._device_key = coordinator.model_index.key(
+            system_index, "device", device_index
+        )
 
-    @property
+    @identity_property
     def name_prefix(self) -> str:
         name_display = f" {self.device.name_display}" if self.device is not None else ""
         return f"{self.system.home.home_name or self.system.home.nomenclature} Device {self.device_index}{name_display}"
 
-    @property
+    @identity_property
     def id_infix(self) -> str:
         return f"{self.system.id}_device_{self.device.device_uuid if self.device is not None else ''}"
 
     @property
     def system(self) -> System:
-        return self.coordinator.data[self.system_index]
+        return self.coordinator.model_index[self._system_key]
 
     @property
     def device(self) -> Device:
-        return self.system.devices[self.device_index]
+        return self.coordinator.model_index[self._device_key]
 
-    @property
+    def fingerprint(self) -> tuple[Any, ...] | None:
+        return self.device, self.system.home, self.system.brand_name
+
+    def identity(self) -> tuple[Any, ...] | None:
+        return self.system.home, self.device.name_display
+
+    @identity_property
     def device_info(self):
         return {"identifiers": {(DOMAIN, self.id_infix)}}
 
@@ -1263,7 +1277,7 @@ class SystemDeviceWaterPressureSensor(SystemDeviceSensor):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_entity_category = EntityCategory.DIAGNOSTIC
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Water Pressure"
 
@@ -1271,7 +1285,7 @@ class SystemDeviceWaterPressureSensor(SystemDeviceSensor):
     def native_value(self):
         return self.device.operational_data.get("water_pressure", {}).get("value")
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_water_pressure"
 
@@ -1289,11 +1303,11 @@ class SystemDeviceOperationTimeSensor(SystemDeviceSensor):
         else:
             return None
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_operation_time"
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Operation Time"
 
@@ -1310,11 +1324,11 @@ class SystemDeviceOnOffCyclesSensor(SystemDeviceSensor):
         else:
             return None
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_on_off_cycles"
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} On/Off Cycles"
 
@@ -1332,11 +1346,11 @@ class SystemDeviceCurrentPowerSensor(SystemDeviceSensor):
         else:
             return None
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_current_power"
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Current Power"
 
@@ -1371,11 +1385,11 @@ class SystemFlowTemperatureSensor(SystemSensor):
         else:
             return None
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_system_flow_temperature"
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} System Flow Temperature"
 
@@ -1387,10 +1401,10 @@ class SystemEnergyManagerStateSensor(SystemSensor):
     def native_value(self):
         return self.system.energy_manager_state
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_energy_manager_state"
 
-    @property
+    @identity_property
     def name(self):
         return f"{self.name_prefix} Energy Manager State"
@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Literal
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.statistics import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+    async_add_external_statistics,
+    statistics_during_period,
+)
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import HomeAssistant, callback
+from myPyllant.enums import DeviceDataBucketResolution
+from myPyllant.models import DeviceDataBucket
+
+from custom_components.mypyllant.const import DOMAIN
+
+if TYPE_CHECKING:
+    from custom_components.mypyllant.sensor import DataSensor
+
+_LOGGER = logging.getLogger(__name__)
+
+# How far before a window the last published sum is looked up
+BASELINE_LOOKBACK = timedelta(days=7)
+
+
+def compute_hourly_statistics(
+    buckets: list[DeviceDataBucket],
+    baseline_sum: float,
+    existing_sums: dict[float, float | None],
+) -> list[StatisticData]:
+    """
+    Turns hourly buckets into statistics rows, skipping rows that were already published with the same sum
+
+    The coordinator fetches a 2-day window (yesterday + today) so the previous day's final hour can still be
+    backfilled once it finalises after midnight. sum stays monotonic (cumulative since baseline), while state
+    and last_reset reset to the start of each day, mirroring octopus_energy's day-cumulative state.
+
+    Parameters:
+        buckets: Hourly buckets of one DeviceData, in chronological order
+        baseline_sum: The last published sum before the first bucket
+        existing_sums: Already published sums in the window, keyed by start timestamp
+    """
+    running_sum = baseline_sum
+    running_state = 0.0
+    current_day = None
+    stats: list[StatisticData] = []
+    for bucket in buckets:
+        if bucket.value is None:
+            continue
+        bucket_midnight = bucket.start_date.replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        if current_day != bucket_midnight:
+            running_state = 0.0
+            current_day = bucket_midnight
+        running_sum += bucket.value
+        running_state += bucket.value
+        # Only (re)write buckets that are new or whose value actually changed (a late API correction).
+        # Rewriting the whole window unconditionally re-anchors already-published, stable history to
+        # whatever baseline happens to be current, which breaks the daily reset.
+        existing_sum = existing_sums.get(bucket.start_date.timestamp())
+        if existing_sum is not None and existing_sum == running_sum:
+            continue
+        stats.append(
+            StatisticData(
+                start=bucket.start_date,
+                last_reset=bucket_midnight,
+                sum=running_sum,
+                state=running_state,
+            )
+        )
+    return stats
+
+
+class StatisticsWriter:
+    """
+    Writes the hourly statistics of all DataSensors of a DailyDataCoordinator in one batch
+
+    Published sums are read with a single recorder query for all statistic ids once, and then kept in memory
+    and updated with every write, so regular updates don't read from the recorder at all
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._sensors: set[DataSensor] = set()
+        # Published sums by statistic id and start timestamp, for the current window and its baseline
+        self._published: dict[str, dict[float, float | None]] = {}
+        # Start timestamp from which the published sums of a statistic id were loaded
+        self._loaded_from: dict[str, float] = {}
+        self._write_task: asyncio.Task | None = None
+        self._write_again = False
+
+    @callback
+    def async_register(self, sensor: DataSensor) -> Callable[[], None]:
+        """
+        Adds a sensor to the batch, returns a function that removes it again
+        """
+        self._sensors.add(sensor)
+
+        @callback
+        def _async_unregister() -> None:
+            self._sensors.discard(sensor)
+            if sensor.statistic_id is not None:
+                self._published.pop(sensor.statistic_id, None)
+                self._loaded_from.pop(sensor.statistic_id, None)
+
+        return _async_unregister
+
+    @property
+    def sensors(self) -> set[DataSensor]:
+        return self._sensors
+
+    @callback
+    def async_schedule(self) -> None:
+        """
+        Writes statistics of all registered sensors in the background
+
+        Calls while a write is running are coalesced into one more write afterward
+        """
+        if self._write_task is not None and not self._write_task.done():
+            self._write_again = True
+            return
+        self._write_task = self.hass.async_create_task(
+            self._async_write_scheduled(), f"{DOMAIN}_statistics"
+        )
+
+    async def _async_write_scheduled(self) -> None:
+        self._write_again = True
+        while self._write_again:
+            self._write_again = False
+            try:
+                await self.async_write()
+            except Exception:  # noqa: BLE001
+                _LOGGER.warning(
+                    "Failed to write hourly statistics; will retry on next update",
+                    exc_info=True,
+                )
+
+    async def async_load_statistics(
+        self,
+        statistic_ids: set[str],
+        start: datetime,
+        end: datetime,
+        types: set[Literal["change", "sum", "state"]] | None = None,
+        period: Literal["hour", "day"] = "hour",
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Reads statistics rows of several statistic ids with a single recorder query
+        """
+        return await get_instance(self.hass).async_add_executor_job(
+            statistics_during_period,
+            self.hass,
+            start,
+            end,
+            statistic_ids,
+            period,
+            None,
+            types or {"sum"},
+        )
+
+    async def async_write(self, sensors: Iterable[DataSensor] | None = None) -> None:
+        """
+        Writes statistics for the given sensors, or all registered sensors
+        """
+        # Statistics are hourly, series fetched with a coarser resolution are left out
+        jobs = [
+            (sensor.statistic_id, sensor)
+            for sensor in (self._sensors if sensors is None else sensors)
+            if sensor.statistic_id is not None
+            and sensor.device_data is not None
+            and sensor.device_data.resolution in (None, DeviceDataBucketResolution.HOUR)
+            and sensor.device_data.data
+        ]
+        if not jobs:
+            return
+
+        # Only statistic ids that aren't cached yet, or whose window moved back, are read from the recorder
+        to_load = [
+            (statistic_id, sensor)
+            for statistic_id, sensor in jobs
+            if self._needs_load(statistic_id, sensor)  # type: ignore
+        ]
+        if to_load:
+            await self._async_load_cache(to_load)
+
+        for statistic_id, sensor in jobs:
+            buckets = sensor.device_data.data  # type: ignore
+            sensor_start = buckets[0].start_date.timestamp()
+            published = self._published.setdefault(statistic_id, {})  # type: ignore
+            baseline_start, baseline_sum = self._baseline(published, sensor_start)
+            existing_sums = {
+                start: value
+                for start, value in published.items()
+                if start >= sensor_start
+            }
+            # Rows before the baseline are not needed anymore, the window only moves forward
+            for start in list(published):
+                if baseline_start is not None and start < baseline_start:
+                    del published[start]
+            self.async_import(
+                sensor, compute_hourly_statistics(buckets, baseline_sum, existing_sums)
+            )
+
+    @staticmethod
+    def _baseline(
+        published: dict[float, float | None], window_start: float
+    ) -> tuple[float | None, float]:
+        # Baseline is the last-published sum strictly BEFORE this sensor's window, never the
+        # single most-recent stat ever recorded. Once any later window has been written, that
+        # value already includes this window's own buckets, so recomputing baseline + sum(this
+        # window's buckets) would double-count them and the sum would grow on every poll forever.
+        baseline_start = max(
+            (start for start in published if start < window_start), default=None
+        )
+        if baseline_start is None:
+            return None, 0.0
+        return baseline_start, published[baseline_start] or 0.0
+
+    async def async_get_baseline(self, sensor: DataSensor) -> float:
+        """
+        Returns the published sum before the current window of a sensor, which its window counts up from
+        """
+        statistic_id: str = sensor.statistic_id  # type: ignore
+        if self._needs_load(statistic_id, sensor):
+            await self._async_load_cache([(statistic_id, sensor)])
+        return self._baseline(
+            self._published[statistic_id],
+            sensor.device_data.data[0].start_date.timestamp(),  # type: ignore
+        )[1]
+
+    @callback
+    def async_import(self, sensor: DataSensor, stats: list[StatisticData]) -> None:
+        """
+        Imports statistics rows of a sensor and keeps their sums in the cache
+        """
+        if not stats or sensor.statistic_id is None:
+            return
+        async_add_external_statistics(
+            self.hass,
+            StatisticMetaData(
+                mean_type=StatisticMeanType.NONE,
+                has_sum=True,
+                name=sensor.name,
+                source=DOMAIN,
+                statistic_id=sensor.statistic_id,
+                unit_class="energy",
+                unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+            ),
+            stats,
+        )
+        published = self._published.get(sensor.statistic_id)
+        if published is not None:
+            published.update({stat["start"].timestamp(): stat["sum"] for stat in stats})  # type: ignore
+
+    @callback
+    def async_adjust(
+        self, sensor: DataSensor, start: datetime, adjustment: float
+    ) -> None:
+        """
+        Raises the published sums of a sensor from start onward, and the cached ones
+        """
+        if sensor.statistic_id is None:
+            return
+        get_instance(self.hass).async_adjust_statistics(
+            sensor.statistic_id, start, adjustment, UnitOfEnergy.WATT_HOUR
+        )
+        published = self._published.get(sensor.statistic_id)
+        if published is not None:
+            for published_start, value in published.items():
+                if published_start >= start.timestamp() and value is not None:
+                    published[published_start] = value + adjustment
+
+    def _needs_load(self, statistic_id: str, sensor: DataSensor) -> bool:
+        return (
+            statistic_id not in self._loaded_from
+            or sensor.device_data.data[0].start_date.timestamp()  # type: ignore
+            < self._loaded_from[statistic_id]
+        )
+
+    async def _async_load_cache(self, jobs: list[tuple[str, DataSensor]]) -> None:
+        """
+        Reads the published sums of the given sensors' windows and baselines with a single recorder query
+        """
+        window_start = min(s.device_data.data[0].start_date for _, s in jobs)  # type: ignore
+        window_end = max(
+            s.device_data.data[-1].start_date  # type: ignore
+            for _, s in jobs
+        ) + timedelta(hours=1)
+        rows = await self.async_load_statistics(
+            {statistic_id for statistic_id, _ in jobs},
+            window_start - BASELINE_LOOKBACK,
+            window_end,
+        )
+        for statistic_id, sensor in jobs:
+            self._published[statistic_id] = {
+                row["start"]: row["sum"]
+                for row in rows.get(statistic_id, [])
+                if row.get("start") is not None
+            }
+            self._loaded_from[statistic_id] = sensor.device_data.data[  # type: ignore
+                0
+            ].start_date.timestamp()
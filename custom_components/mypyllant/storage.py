@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+import logging
+from asyncio import CancelledError
+from dataclasses import fields
+from datetime import datetime as dt, tzinfo
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from aiohttp import RequestInfo
+from aiohttp.client_exceptions import ClientResponseError
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from myPyllant.enums import ControlIdentifier, DeviceDataBucketResolution
+from myPyllant.models import Device, DeviceData, DeviceDataBucket, Home, System
+from yarl import URL
+
+from custom_components.mypyllant.const import DOMAIN, SNAPSHOT_SAVE_DELAY
+from custom_components.mypyllant.coordinator import (
+    DailyDataCoordinator,
+    SystemCoordinator,
+    SystemWithDeviceData,
+)
+from custom_components.mypyllant.quota import QuotaController
+from custom_components.mypyllant.totals import PeriodTotals
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+Snapshot = tuple[list[Home], list[System], dict[str, SystemWithDeviceData]]
+
+
+def _isoformat(value: dt | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def _parse_datetime(value: str, timezone: tzinfo | None) -> dt:
+    if timezone is None:
+        return dt.fromisoformat(value)
+    return dt.fromisoformat(value).astimezone(timezone)
+
+
+def _fromisoformat(value: str | None, timezone: tzinfo | None) -> dt | None:
+    return _parse_datetime(value, timezone) if value is not None else None
+
+
+def serialize_home(home: Home) -> dict[str, Any]:
+    return home.prepare_dict()
+
+
+def deserialize_home(data: dict[str, Any]) -> Home:
+    data = dict(data)
+    return Home.from_api(timezone=ZoneInfo(data.pop("timezone")), **data)
+
+
+def serialize_system(system: System) -> dict[str, Any]:
+    """
+    Stores the raw API values of a system, the related models (zones, circuits, devices, ...) are
+    created from them again in System.from_api()
+    """
+    system_fields = {f.name for f in fields(System)}
+    return {
+        **{k: v for k, v in system.extra_fields.items() if k not in system_fields},
+        "id": system.id,
+        "state": system.state,
+        "configuration": system.configuration,
+        "properties": system.properties,
+        "current_system": system.current_system,
+        "home": serialize_home(system.home),
+        "brand": system.brand,
+        "timezone": str(system.timezone),
+        "control_identifier": str(system.control_identifier),
+        "connected": system.connected,
+        "diagnostic_trouble_codes": system.diagnostic_trouble_codes,
+        "mpc": system.mpc,
+        "rts": system.rts,
+        "energy_management": system.energy_management,
+        "eebus": system.eebus,
+        "ambisense_capability": system.ambisense_capability,
+    }
+
+
+def deserialize_system(data: dict[str, Any]) -> System:
+    data = dict(data)
+    return System.from_api(
+        home=deserialize_home(data.pop("home")),
+        timezone=ZoneInfo(data.pop("timezone")),
+        control_identifier=ControlIdentifier(data.pop("control_identifier")),
+        ambisense_rooms=[],
+        **data,
+    )
+
+
+def serialize_device_data(device_data: DeviceData) -> dict[str, Any]:
+    return {
+        "device_uuid": device_data.device.device_uuid if device_data.device else None,
+        "operation_mode": device_data.operation_mode,
+        "skip_data_update": device_data.skip_data_update,
+        "data_from": _isoformat(device_data.data_from),
+        "data_to": _isoformat(device_data.data_to),
+        "start_date": _isoformat(device_data.start_date),
+        "end_date": _isoformat(device_data.end_date),
+        "resolution": str(device_data.resolution) if device_data.resolution else None,
+        "energy_type": device_data.energy_type,
+        "value_type": device_data.value_type,
+        "calculated": device_data.calculated,
+        "total_consumption": device_data.total_consumption,
+        "data": [
+            {
+                "start_date": b.start_date.isoformat(),
+                "end_date": b.end_date.isoformat(),
+                "value": b.value,
+            }
+            for b in device_data.data
+        ],
+    }
+
+
+def deserialize_device_data(
+    data: dict[str, Any], devices: dict[str, Device]
+) -> DeviceData:
+    device = devices.get(data["device_uuid"])
+    timezone = device.timezone if device is not None else None
+    return DeviceData(
+        operation_mode=data["operation_mode"],
+        skip_data_update=data["skip_data_update"],
+        device=device,
+        data_from=_fromisoformat(data["data_from"], timezone),
+        data_to=_fromisoformat(data["data_to"], timezone),
+        start_date=_fromisoformat(data["start_date"], timezone),
+        end_date=_fromisoformat(data["end_date"], timezone),
+        resolution=DeviceDataBucketResolution(data["resolution"])
+        if data["resolution"]
+        else None,
+        energy_type=data["energy_type"],
+        value_type=data["value_type"],
+        calculated=data["calculated"],
+        total_consumption=data["total_consumption"],
+        data=[
+            DeviceDataBucket(
+                start_date=_parse_datetime(b["start_date"], timezone),
+                end_date=_parse_datetime(b["end_date"], timezone),
+                value=b["value"],
+            )
+            for b in data["data"]
+        ],
+    )
+
+
+class SnapshotStore:
+    """
+    Persists the homes, systems and energy data of the last successful updates, so entities can be
+    created on startup without waiting for the API
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.snapshot.{entry_id}"
+        )
+
+    async def async_load(self) -> Snapshot | None:
+        stored = await self._store.async_load()
+        if not stored or not stored.get("systems"):
+            return None
+        try:
+            homes = [deserialize_home(h) for h in stored["homes"]]
+            systems = [deserialize_system(s) for s in stored["systems"]]
+            devices = {d.device_uuid: d for s in systems for d in s.devices}
+            daily_data: dict[str, SystemWithDeviceData] = {
+                system_id: {
+                    "home_name": system_data["home_name"],
+                    "devices_data": [
+                        [deserialize_device_data(dd, devices) for dd in device_data]
+                        for device_data in system_data["devices_data"]
+                    ],
+                }
+                for system_id, system_data in stored["daily_data"].items()
+            }
+        except Exception as e:  # noqa: BLE001
+            _LOGGER.warning("Ignoring invalid snapshot: %s", e)
+            return None
+        return homes, systems, daily_data
+
+    @callback
+    def async_save(
+        self,
+        system_coordinator: SystemCoordinator,
+        daily_data_coordinator: DailyDataCoordinator,
+    ) -> None:
+        """
+        Schedules writing a snapshot, the data is only serialized when it's written
+        """
+        if not system_coordinator.data:
+            return
+
+        def _data_to_save() -> dict[str, Any]:
+            return {
+                "homes": [serialize_home(h) for h in system_coordinator.homes],
+                "systems": [serialize_system(s) for s in system_coordinator.data],
+                "daily_data": {
+                    system_id: {
+                        "home_name": system_data["home_name"],
+                        "devices_data": [
+                            [serialize_device_data(dd) for dd in device_data]
+                            for device_data in system_data["devices_data"]
+                        ],
+                    }
+                    for system_id, system_data in (
+                        daily_data_coordinator.data or {}
+                    ).items()
+                },
+            }
+
+        self._store.async_delay_save(_data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
+
+
+def serialize_exception(exc_info: BaseException | None) -> dict[str, Any] | None:
+    if exc_info is None:
+        return None
+    if isinstance(exc_info, ClientResponseError):
+        return {
+            "type": "ClientResponseError",
+            "status": exc_info.status,
+            "message": exc_info.message,
+            "method": exc_info.request_info.method,
+            "url": str(exc_info.request_info.real_url),
+        }
+    return {"type": exc_info.__class__.__name__}
+
+
+def deserialize_exception(data: dict[str, Any] | None) -> BaseException | None:
+    if data is None:
+        return None
+    if data["type"] == "ClientResponseError":
+        return ClientResponseError(
+            request_info=RequestInfo(
+                url=URL(data["url"]),
+                method=data["method"],
+                headers=None,  # type: ignore
+            ),
+            history=(),
+            status=data["status"],
+            message=data["message"],
+        )
+    if data["type"] == "CancelledError":
+        return CancelledError()
+    return TimeoutError()
+
+
+class QuotaStore:
+    """
+    Persists the quota state of an account, so a restart during a lockout doesn't make new requests
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.quota.{entry_id}"
+        )
+
+    async def async_load(self, quota: QuotaController) -> None:
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        try:
+            quota.hit_time = _fromisoformat(stored["hit_time"], None)
+            quota.end_time = _fromisoformat(stored["end_time"], None)
+            quota.exc_info = deserialize_exception(stored["exc_info"])
+            quota.budget.learned_limit = stored["learned_limit"]
+        except Exception as e:  # noqa: BLE001
+            _LOGGER.warning("Ignoring invalid quota state: %s", e)
+            quota.clear()
+
+    @callback
+    def async_save(self, quota: QuotaController) -> None:
+        def _data_to_save() -> dict[str, Any]:
+            return {
+                "hit_time": _isoformat(quota.hit_time),
+                "end_time": _isoformat(quota.end_time),
+                "exc_info": serialize_exception(quota.exc_info),
+                "learned_limit": quota.budget.learned_limit,
+            }
+
+        # Saved right away, a restart shortly after a lockout is the case this is for
+        self._store.async_delay_save(_data_to_save, 0)
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
+
+
+class BackfillStore:
+    """
+    Persists the progress of historical statistics backfills, so they continue after a restart
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.backfill.{entry_id}"
+        )
+
+    async def async_load(self) -> dict[str, dict[str, Any]]:
+        return await self._store.async_load() or {}
+
+    @callback
+    def async_save(self, checkpoints: dict[str, dict[str, Any]]) -> None:
+        # Saved right away, the checkpoint is only useful if it survives an interruption
+        self._store.async_delay_save(lambda: checkpoints, 0)
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
+
+
+class PeriodTotalsStore:
+    """
+    Persists the daily totals behind the month and year to date sensors, so they continue after a restart
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.period_totals.{entry_id}"
+        )
+
+    async def async_load(self, period_totals: PeriodTotals) -> None:
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        try:
+            period_totals.load(stored)
+        except Exception as e:  # noqa: BLE001
+            _LOGGER.warning("Ignoring invalid period totals: %s", e)
+
+    @callback
+    def async_save(self, daily_data_coordinator: DailyDataCoordinator) -> None:
+        def _data_to_save() -> dict[str, Any]:
+            return daily_data_coordinator.period_totals.as_dict()
+
+        self._store.async_delay_save(_data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
@@ -1,15 +1,23 @@
 from __future__ import annotations
 
 import logging
+from functools import partial
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from custom_components.mypyllant.const import DOMAIN, DEFAULT_HOLIDAY_SETPOINT
+from custom_components.mypyllant.const import (
+    DOMAIN,
+    DEFAULT_HOLIDAY_SETPOINT,
+    REFRESH_DELAY_LONG,
+    SYSTEM_TIER_CAPABILITIES,
+)
 from custom_components.mypyllant.decorators import ensure_token_refresh
 from custom_components.mypyllant.coordinator import SystemCoordinator
+from custom_components.mypyllant.model_index import ModelKey, is_added
+from custom_components.mypyllant.topology import EntityTracker
 from custom_components.mypyllant.utils import (
     HolidayEntity,
     DomesticHotWaterCoordinatorEntity,
@@ -28,32 +36,57 @@ async def async_setup_entry(
     hass: HomeAssistant, config: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up the sensor platform."""
+    coordinator: SystemCoordinator = hass.data[DOMAIN][config.entry_id][
+        "system_coordinator"
+    ]
+    await EntityTracker(
+        hass,
+        config,
+        coordinator,
+        async_add_entities,
+        partial(create_switches, hass, config),
+    ).async_setup()
+
+
+async def create_switches(
+    hass: HomeAssistant,
+    config: ConfigEntry,
+    added: frozenset[ModelKey] | None = None,
+) -> EntityList[SwitchEntity]:
     coordinator: SystemCoordinator = hass.data[DOMAIN][config.entry_id][
         "system_coordinator"
     ]
     if not coordinator.data:
         _LOGGER.warning("No system data, skipping switch entities")
-        return
+        return EntityList()
 
+    model_index = coordinator.model_index
     sensors: EntityList[SwitchEntity] = EntityList()
     for index, system in enumerate(coordinator.data):
-        sensors.append(lambda: SystemHolidaySwitch(index, coordinator, config))
-        if system.eebus:
-            sensors.append(lambda: SystemEebusSwitch(index, coordinator))
-
-        if system.is_cooling_allowed:
-            sensors.append(
-                lambda: SystemManualCoolingSwitch(index, coordinator, config)
-            )
+        if is_added(added, model_index.key(index, "system")):
+            sensors.append(lambda: SystemHolidaySwitch(index, coordinator, config))
+            if system.eebus:
+                sensors.append(lambda: SystemEebusSwitch(index, coordinator))
+
+            if system.is_cooling_allowed:
+                sensors.append(
+                    lambda: SystemManualCoolingSwitch(index, coordinator, config)
+                )
         for dhw_index, dhw in enumerate(system.domestic_hot_water):
+            if not is_added(
+                added, model_index.key(index, "domestic_hot_water", dhw_index)
+            ):
+                continue
             sensors.append(
                 lambda: DomesticHotWaterBoostSwitch(index, dhw_index, coordinator)
             )
         for zone_index, zone in enumerate(system.zones):
+            if not is_added(added, model_index.key(index, "zone", zone_index)):
+                continue
             sensors.append(
                 lambda: ZoneVentilationBoostSwitch(index, zone_index, coordinator)
             )
-    async_add_entities(sensors)  # type: ignore
+    return sensors
 
 
 class SystemHolidaySwitch(HolidayEntity, SwitchEntity):
@@ -80,13 +113,13 @@ class SystemHolidaySwitch(HolidayEntity, SwitchEntity):
             setpoint = DEFAULT_HOLIDAY_SETPOINT
         await self.coordinator.api.set_holiday(self.system, end=end, setpoint=setpoint)
         # Holiday values need a long time to show up in the API
-        await self.coordinator.async_request_refresh_delayed(20)
+        await self.coordinator.async_request_refresh_delayed(REFRESH_DELAY_LONG)
 
     @ensure_token_refresh
     async def async_turn_off(self, **kwargs):
         await self.coordinator.api.cancel_holiday(self.system)
         # Holiday values need a long time to show up in the API
-        await self.coordinator.async_request_refresh_delayed(20)
+        await self.coordinator.async_request_refresh_delayed(REFRESH_DELAY_LONG)
 
     @property
     def unique_id(self) -> str:
@@ -109,12 +142,12 @@ class SystemManualCoolingSwitch(ManualCoolingEntity, SwitchEntity):
         await self.coordinator.api.set_cooling_for_days(
             self.system, duration_days=self.default_manual_cooling_duration
         )
-        await self.coordinator.async_request_refresh_delayed(20)
+        await self.coordinator.async_request_refresh_delayed(REFRESH_DELAY_LONG)
 
     @ensure_token_refresh
     async def async_turn_off(self, **kwargs):
         await self.coordinator.api.cancel_cooling_for_days(self.system)
-        await self.coordinator.async_request_refresh_delayed(20)
+        await self.coordinator.async_request_refresh_delayed(REFRESH_DELAY_LONG)
 
     @property
     def unique_id(self) -> str:
@@ -147,11 +180,13 @@ class SystemEebusSwitch(SystemCoordinatorEntity, SwitchEntity):
     @ensure_token_refresh
     async def async_turn_on(self, **kwargs):
         await self.coordinator.api.toggle_eebus(self.system, enabled=True)
+        self.coordinator.invalidate_tier(SYSTEM_TIER_CAPABILITIES)
         await self.coordinator.async_request_refresh_delayed()
 
     @ensure_token_refresh
     async def async_turn_off(self, **kwargs):
         await self.coordinator.api.toggle_eebus(self.system, enabled=False)
+        self.coordinator.invalidate_tier(SYSTEM_TIER_CAPABILITIES)
         await self.coordinator.async_request_refresh_delayed()
 
     @property
@@ -176,12 +211,12 @@ class ZoneVentilationBoostSwitch(ZoneCoordinatorEntity, SwitchEntity):
     @ensure_token_refresh
     async def async_turn_on(self, **kwargs):
         await self.coordinator.api.set_ventilation_boost(self.system)
-        await self.coordinator.async_request_refresh_delayed(20)
+        await self.coordinator.async_request_refresh_delayed(REFRESH_DELAY_LONG)
 
     @ensure_token_refresh
     async def async_turn_off(self, **kwargs):
         await self.coordinator.api.cancel_ventilation_boost(self.system)
-        await self.coordinator.async_request_refresh_delayed(20)
+        await self.coordinator.async_request_refresh_delayed(REFRESH_DELAY_LONG)
 
     @property
     def unique_id(self) -> str:
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Awaitable, Callable, Iterable
+from typing import TYPE_CHECKING
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from custom_components.mypyllant.const import DOMAIN
+from custom_components.mypyllant.model_index import ModelKey, entity_model_keys
+
+if TYPE_CHECKING:
+    from custom_components.mypyllant.coordinator import SystemCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class EntityTracker:
+    """
+    Adds the entities of a platform, and keeps them in sync with the models of the system coordinator
+
+    When an update adds models (i.e. a new zone, device or Ambisense room), only the entities of the added
+    models are created, and the ones with a new unique id are added. Entities of removed models are removed
+    from the entity registry, together with devices that have no entities left.
+    Unchanged entities are kept as they are, and the config entry doesn't need to be reloaded.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config: ConfigEntry,
+        coordinator: SystemCoordinator,
+        async_add_entities: AddEntitiesCallback,
+        create_entities: Callable[
+            [frozenset[ModelKey] | None], Awaitable[Iterable[Entity]]
+        ],
+    ) -> None:
+        self.hass = hass
+        self.config = config
+        self.coordinator = coordinator
+        self.async_add_entities = async_add_entities
+        self.create_entities = create_entities
+        self._entities: dict[str, Entity] = {}
+
+    @property
+    def entities(self) -> list[Entity]:
+        return list(self._entities.values())
+
+    async def async_setup(self) -> None:
+        self.async_add_entities(await self._async_create_new_entities())
+        self.config.async_on_unload(
+            self.coordinator.async_add_topology_listener(self._async_topology_changed)
+        )
+
+    async def _async_create_new_entities(
+        self, added: frozenset[ModelKey] | None = None
+    ) -> list[Entity]:
+        entities = [
+            entity
+            for entity in await self.create_entities(added)
+            if entity.unique_id is None or entity.unique_id not in self._entities
+        ]
+        for entity in entities:
+            if entity.unique_id is not None:
+                self._entities[entity.unique_id] = entity
+        return entities
+
+    async def _async_add_new_entities(self, added: frozenset[ModelKey]) -> None:
+        if entities := await self._async_create_new_entities(added):
+            _LOGGER.debug("Adding %s entities of added models", len(entities))
+            self.async_add_entities(entities)
+
+    @callback
+    def _async_topology_changed(
+        self, added: frozenset[ModelKey], removed: frozenset[ModelKey]
+    ) -> None:
+        if removed:
+            self._async_remove_entities(removed)
+        if added:
+            self.config.async_create_background_task(
+                self.hass,
+                self._async_add_new_entities(added),
+                f"{DOMAIN}_add_entities",
+            )
+
+    @callback
+    def _async_remove_entities(self, removed: frozenset[ModelKey]) -> None:
+        entity_registry = er.async_get(self.hass)
+        device_ids: set[str] = set()
+        for unique_id, entity in list(self._entities.items()):
+            if not any(key in removed for key in entity_model_keys(entity)):
+                continue
+            _LOGGER.debug("Removing %s, its model was removed", entity.entity_id)
+            del self._entities[unique_id]
+            if entity.registry_entry is None:
+                self.config.async_create_background_task(
+                    self.hass,
+                    entity.async_remove(force_remove=True),
+                    f"{DOMAIN}_remove_entity",
+                )
+                continue
+            if entity.registry_entry.device_id is not None:
+                device_ids.add(entity.registry_entry.device_id)
+            # Removing the registry entry also removes the entity from its platform
+            entity_registry.async_remove(entity.registry_entry.entity_id)
+
+        device_registry = dr.async_get(self.hass)
+        for device_id in device_ids:
+            if not er.async_entries_for_device(
+                entity_registry, device_id, include_disabled_entities=True
+            ):
+                device_registry.async_remove_device(device_id)
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from datetime import date, tzinfo
+from typing import TYPE_CHECKING, Literal
+
+from myPyllant.enums import DeviceDataBucketResolution
+from myPyllant.models import DeviceData, DeviceDataBucket
+
+if TYPE_CHECKING:
+    from custom_components.mypyllant.coordinator import SystemWithDeviceData
+
+RollupPeriod = Literal["day", "month", "year"]
+ROLLUP_PERIODS: tuple[RollupPeriod, ...] = ("day", "month", "year")
+ToDatePeriod = Literal["month", "year"]
+TO_DATE_PERIODS: tuple[ToDatePeriod, ...] = ("month", "year")
+
+# Periods that buckets of a resolution can be rolled up into
+_RESOLUTION_PERIODS: dict[
+    DeviceDataBucketResolution | None, tuple[RollupPeriod, ...]
+] = {
+    None: ROLLUP_PERIODS,
+    DeviceDataBucketResolution.HOUR: ROLLUP_PERIODS,
+    DeviceDataBucketResolution.DAY: ROLLUP_PERIODS,
+    DeviceDataBucketResolution.MONTH: ("month", "year"),
+}
+
+
+def period_start(day: date, period: RollupPeriod) -> date:
+    """
+    First day of the day, month or year that contains day
+    """
+    if period == "month":
+        return day.replace(day=1)
+    if period == "year":
+        return day.replace(month=1, day=1)
+    return day
+
+
+def rollup(
+    buckets: Iterable[DeviceDataBucket], period: RollupPeriod
+) -> dict[date, float]:
+    """
+    Sums buckets into coarser periods by their local start date, keyed by the first day of each period
+    """
+    totals: dict[date, float] = defaultdict(float)
+    for bucket in buckets:
+        if bucket.value is not None:
+            totals[period_start(bucket.start_date.date(), period)] += bucket.value
+    return dict(totals)
+
+
+def rollup_periods(device_data: DeviceData) -> tuple[RollupPeriod, ...]:
+    return _RESOLUTION_PERIODS.get(device_data.resolution, ROLLUP_PERIODS)
+
+
+class DailyTotals:
+    """
+    Energy totals per day, month and year of all buckets in the daily data, rolled up once per update
+
+    Totals are kept by device data entry for DataSensor, and by energy type per device and per system for
+    EfficiencySensor, so sensors don't have to walk the buckets whenever their state is read
+
+    The index is a dict keyed by (system, device, energy type, period, start day) rather than arrays of days.
+    An update spans two days, so an array per series would hold one or two values behind a base date offset,
+    while a dict lookup is already O(1) and keeps month and year totals in the same structure.
+    """
+
+    def __init__(self, data: dict[str, SystemWithDeviceData] | None) -> None:
+        self.data = data
+        self._device_data: dict[tuple[str, int, int, RollupPeriod, date], float] = (
+            defaultdict(float)
+        )
+        # de_index None holds the totals of all devices of a system
+        self._energy_types: dict[
+            tuple[str, int | None, str, RollupPeriod, date], float
+        ] = defaultdict(float)
+        self._timezones: dict[str, tzinfo | None] = {}
+        for system_id, system in (data or {}).items():
+            for de_index, devices_data in enumerate(system["devices_data"]):
+                for da_index, device_data in enumerate(devices_data):
+                    self._add(system_id, de_index, da_index, device_data)
+
+    def _add(
+        self, system_id: str, de_index: int, da_index: int, device_data: DeviceData
+    ) -> None:
+        if device_data.data:
+            self._timezones.setdefault(system_id, device_data.data[0].start_date.tzinfo)
+        for period in rollup_periods(device_data):
+            for start, total in rollup(device_data.data, period).items():
+                self._device_data[(system_id, de_index, da_index, period, start)] += (
+                    total
+                )
+                if device_data.energy_type is None:
+                    continue
+                for index in (de_index, None):
+                    key = (system_id, index, device_data.energy_type, period, start)
+                    self._energy_types[key] += total
+
+    def timezone(self, system_id: str) -> tzinfo | None:
+        """
+        Timezone of the buckets of a system, to determine the current day
+        """
+        return self._timezones.get(system_id)
+
+    def device_data_total(
+        self,
+        system_id: str,
+        de_index: int,
+        da_index: int,
+        day: date,
+        period: RollupPeriod = "day",
+    ) -> float:
+        """
+        Total of a device data entry in the day, month or year that contains day
+        """
+        return self._device_data.get(
+            (system_id, de_index, da_index, period, period_start(day, period)), 0.0
+        )
+
+    def energy_type_total(
+        self,
+        system_id: str,
+        de_index: int | None,
+        energy_type: str,
+        day: date,
+        period: RollupPeriod = "day",
+    ) -> float:
+        """
+        Total of an energy type in the day, month or year that contains day, for one device or for all devices
+        of a system if de_index is None
+        """
+        return self._energy_types.get(
+            (system_id, de_index, energy_type, period, period_start(day, period)),
+            0.0,
+        )
+
+    def energy_type_days(self) -> Iterator[tuple[str, str, dict[date, float]]]:
+        """
+        Yields the daily totals of each energy type for all devices of a system
+        """
+        days: dict[tuple[str, str], dict[date, float]] = defaultdict(dict)
+        for (
+            system_id,
+            de_index,
+            energy_type,
+            period,
+            start,
+        ), total in self._energy_types.items():
+            if de_index is None and period == "day":
+                days[(system_id, energy_type)][start] = total
+        for (system_id, energy_type), totals in days.items():
+            yield system_id, energy_type, totals
+
+
+class PeriodTotals:
+    """
+    Month and year to date totals of each energy type of a system, accumulated from the daily totals of
+    every update
+
+    The days of the current year are kept, so a day that is fetched again (today, or yesterday until its
+    last hour is final) replaces its previous total instead of being counted twice. Days are kept in a dict
+    per series, like DailyTotals, because they are sparse (restored, seeded and fetched days can leave gaps)
+    and are summed at most once per state read.
+    """
+
+    def __init__(self) -> None:
+        self._days: dict[tuple[str, str], dict[date, float]] = {}
+
+    def update(self, daily_totals: DailyTotals) -> None:
+        """
+        Merges the days of an update, replacing the totals of days that were already known
+        """
+        for system_id, energy_type, days in daily_totals.energy_type_days():
+            known = self._days.setdefault((system_id, energy_type), {})
+            known.update(days)
+            self._prune(known)
+
+    def seed(self, system_id: str, energy_type: str, days: dict[date, float]) -> None:
+        """
+        Adds totals of days that aren't known yet, e.g. from recorder statistics
+        """
+        known = self._days.setdefault((system_id, energy_type), {})
+        for day, total in days.items():
+            known.setdefault(day, total)
+        self._prune(known)
+
+    @staticmethod
+    def _prune(days: dict[date, float]) -> None:
+        # Only the current year is needed, the latest day decides which year that is
+        if not days:
+            return
+        year_start = period_start(max(days), "year")
+        for day in [d for d in days if d < year_start]:
+            del days[day]
+
+    def energy_types(self, system_id: str) -> list[str]:
+        return sorted(
+            energy_type for (s_id, energy_type) in self._days if s_id == system_id
+        )
+
+    def total(
+        self, system_id: str, energy_type: str, day: date, period: ToDatePeriod
+    ) -> float:
+        """
+        Total of an energy type from the start of the month or year that contains day up to and including day
+        """
+        start = period_start(day, period)
+        return sum(
+            total
+            for d, total in self._days.get((system_id, energy_type), {}).items()
+            if start <= d <= day
+        )
+
+    def as_dict(self) -> dict[str, dict[str, dict[str, float]]]:
+        data: dict[str, dict[str, dict[str, float]]] = defaultdict(dict)
+        for (system_id, energy_type), days in self._days.items():
+            data[system_id][energy_type] = {
+                day.isoformat(): total for day, total in days.items()
+            }
+        return dict(data)
+
+    def load(self, data: dict[str, dict[str, dict[str, float]]]) -> None:
+        """
+        Adds stored days, days that were already merged from newer data are kept
+        """
+        for system_id, energy_types in data.items():
+            for energy_type, days in energy_types.items():
+                self.seed(
+                    system_id,
+                    energy_type,
+                    {date.fromisoformat(day): total for day, total in days.items()},
+                )
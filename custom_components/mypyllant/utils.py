@@ -5,12 +5,15 @@ import typing
 from asyncio.exceptions import CancelledError
 from collections.abc import MutableSequence
 from datetime import datetime, timedelta
+from functools import wraps
 from typing import TypeVar
 
 from aiohttp.client_exceptions import ClientResponseError
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from custom_components.mypyllant.model_index import entity_model_keys
 from custom_components.mypyllant.const import (
     DOMAIN,
     OPTION_DEFAULT_HOLIDAY_DURATION,
@@ -86,26 +89,119 @@ class EntityList(MutableSequence[_T | typing.Callable[[], _T]]):
         return str(self.list)
 
 
-class SystemCoordinatorEntity(CoordinatorEntity):
+def identity_property(
+    func: typing.Callable[[typing.Any], _T],
+) -> property:
+    """
+    A property that is computed once and cached until the identity of its IdentityCachingEntity changes
+    """
+    name = func.__name__
+
+    @wraps(func)
+    def getter(self: IdentityCachingEntity) -> _T:
+        if self._identity_cache is None:
+            self._identity_cache = {}
+            self._identity = self._current_identity()
+        if name not in self._identity_cache:
+            self._identity_cache[name] = func(self)
+        return self._identity_cache[name]
+
+    return property(getter)
+
+
+class IdentityCachingEntity(CoordinatorEntity):
+    """
+    Caches unique ids, names and device infos, which Home Assistant reads on every state write
+
+    They are built from the names and stable ids returned by identity(), and only computed again after an
+    update changed those. Updates that are missing one of the entity's models are ignored. If the model stays
+    missing, the EntityTracker of its platform removes the entity.
+    """
+
+    coordinator: SystemCoordinator
+    _identity_cache: dict[str, typing.Any] | None = None
+    _identity: tuple[typing.Any, ...] | None = None
+
+    def identity(self) -> tuple[typing.Any, ...] | None:
+        return None
+
+    def _current_identity(self) -> tuple[typing.Any, ...] | None:
+        try:
+            return self.identity()
+        except KeyError, IndexError, AttributeError:
+            return None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        model_index = self.coordinator.model_index
+        if any(key not in model_index for key in entity_model_keys(self)):
+            return
+        identity = self._current_identity()
+        if identity is None or identity != self._identity:
+            self._identity_cache = None
+        super()._handle_coordinator_update()
+
+
+class ChangeDetectingEntity(IdentityCachingEntity):
+    """
+    Skips writing state after coordinator updates that didn't change the models the entity is built from
+
+    Entities return these models from fingerprint(), they are compared by value with the ones of the
+    previous update. Updates that keep the same data (optimistic state, failed updates) are always written,
+    as are entities whose fingerprint() returns None, i.e. because their state depends on the current time.
+    Fingerprints contain the models of identity(), so skipped updates never change the identity.
+    """
+
+    _fingerprint: tuple[typing.Any, ...] | None = None
+    _fingerprint_data: typing.Any = None
+
+    def fingerprint(self) -> tuple[typing.Any, ...] | None:
+        return None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        try:
+            fingerprint = self.fingerprint()
+        except KeyError, IndexError, AttributeError:
+            fingerprint = None
+        if fingerprint is not None:
+            fingerprint = (self.coordinator.last_update_success, *fingerprint)
+        unchanged = (
+            fingerprint is not None
+            and self._fingerprint is not None
+            and self.coordinator.data is not self._fingerprint_data
+            and fingerprint == self._fingerprint
+        )
+        self._fingerprint = fingerprint
+        self._fingerprint_data = self.coordinator.data
+        if not unchanged:
+            super()._handle_coordinator_update()
+
+
+class SystemCoordinatorEntity(IdentityCachingEntity):
     coordinator: "SystemCoordinator"
 
     def __init__(self, index: int, coordinator: "SystemCoordinator") -> None:
         super().__init__(coordinator)
         self.index = index
+        self._system_key = coordinator.model_index.key(index, "system")
 
     @property
     def system(self) -> "System":
-        return self.coordinator.data[self.index]
+        return self.coordinator.model_index[self._system_key]
 
-    @property
+    def identity(self) -> tuple[typing.Any, ...] | None:
+        return (self.system.home,)
+
+    @identity_property
     def id_infix(self) -> str:
         return f"{self.system.id}_home"
 
-    @property
+    @identity_property
     def name_prefix(self) -> str:
         return f"{self.system.home.home_name or self.system.home.nomenclature}"
 
-    @property
+    @identity_property
     def device_info(self) -> DeviceInfo | None:
         return {"identifiers": {(DOMAIN, self.id_infix)}}
 
@@ -268,7 +364,7 @@ def is_api_down_exception(exc_info: Exception) -> bool:
     return isinstance(exc_info, CancelledError) or isinstance(exc_info, TimeoutError)
 
 
-class DomesticHotWaterCoordinatorEntity(CoordinatorEntity):
+class DomesticHotWaterCoordinatorEntity(ChangeDetectingEntity):
     coordinator: SystemCoordinator
 
     def __init__(
@@ -277,24 +373,34 @@ class DomesticHotWaterCoordinatorEntity(CoordinatorEntity):
         super().__init__(coordinator)
         self.system_index = system_index
         self.dhw_index = dhw_index
+        self._system_key = coordinator.model_index.key(system_index, "system")
+        self._dhw_key = coordinator.model_index.key(
+            system_index, "domestic_hot_water", dhw_index
+        )
 
     @property
     def system(self) -> System:
-        return self.coordinator.data[self.system_index]
+        return self.coordinator.model_index[self._system_key]
 
-    @property
+    @identity_property
     def name_prefix(self) -> str:
         return f"{self.system.home.home_name or self.system.home.nomenclature} Domestic Hot Water {self.dhw_index}"
 
-    @property
+    @identity_property
     def id_infix(self) -> str:
         return f"{self.system.id}_domestic_hot_water_{self.dhw_index}"
 
     @property
     def domestic_hot_water(self) -> DomesticHotWater:
-        return self.system.domestic_hot_water[self.dhw_index]
+        return self.coordinator.model_index[self._dhw_key]
 
-    @property
+    def fingerprint(self) -> tuple[typing.Any, ...] | None:
+        return self.domestic_hot_water, self.system.home
+
+    def identity(self) -> tuple[typing.Any, ...] | None:
+        return (self.system.home,)
+
+    @identity_property
     def device_info(self):
         return {
             "identifiers": {
@@ -306,7 +412,7 @@ class DomesticHotWaterCoordinatorEntity(CoordinatorEntity):
         }
 
 
-class ZoneCoordinatorEntity(CoordinatorEntity):
+class ZoneCoordinatorEntity(ChangeDetectingEntity):
     coordinator: SystemCoordinator
 
     def __init__(
@@ -315,31 +421,52 @@ class ZoneCoordinatorEntity(CoordinatorEntity):
         super().__init__(coordinator)
         self.system_index = system_index
         self.zone_index = zone_index
+        self._system_key = coordinator.model_index.key(system_index, "system")
+        self._zone_key = coordinator.model_index.key(system_index, "zone", zone_index)
 
     @property
     def system(self) -> System:
-        return self.coordinator.data[self.system_index]
+        return self.coordinator.model_index[self._system_key]
 
     @property
     def zone(self) -> Zone:
-        return self.system.zones[self.zone_index]
+        return self.coordinator.model_index[self._zone_key]
 
-    @property
+    def fingerprint(self) -> tuple[typing.Any, ...] | None:
+        # Quick veto and holidays start and end with time, not only with new data
+        return (
+            self.zone,
+            self.system.home,
+            self.system.brand_name,
+            self.zone.quick_veto_ongoing,
+            self.zone.general.holiday_ongoing,
+            self.zone.general.holiday_planned,
+        )
+
+    def identity(self) -> tuple[typing.Any, ...] | None:
+        return (
+            self.system.home,
+            self.system.brand_name,
+            self.zone.name,
+            self.zone.associated_circuit_index,
+        )
+
+    @identity_property
     def circuit_name_suffix(self) -> str:
         if self.zone.associated_circuit_index is None:
             return ""
         else:
             return f" (Circuit {self.zone.associated_circuit_index})"
 
-    @property
+    @identity_property
     def name_prefix(self) -> str:
         return f"{self.system.home.home_name or self.system.home.nomenclature} Zone {shorten_zone_name(self.zone.name)}{self.circuit_name_suffix}"
 
-    @property
+    @identity_property
     def id_infix(self) -> str:
         return f"{self.system.id}_zone_{self.zone.index}"
 
-    @property
+    @identity_property
     def device_info(self):
         return DeviceInfo(
             identifiers={(DOMAIN, self.id_infix)},
@@ -352,7 +479,7 @@ class ZoneCoordinatorEntity(CoordinatorEntity):
         return bool(self.zone.is_active)
 
 
-class AmbisenseCoordinatorEntity(CoordinatorEntity):
+class AmbisenseCoordinatorEntity(ChangeDetectingEntity):
     coordinator: SystemCoordinator
 
     def __init__(
@@ -364,26 +491,35 @@ class AmbisenseCoordinatorEntity(CoordinatorEntity):
         super().__init__(coordinator)
         self.system_index = system_index
         self.room_index = room_index
+        self._system_key = coordinator.model_index.key(system_index, "system")
+        # Room indexes are already stable ids
+        self._room_key = coordinator.model_index.id_key(
+            system_index, "ambisense_room", room_index
+        )
 
     @property
     def system(self) -> System:
-        return self.coordinator.data[self.system_index]
+        return self.coordinator.model_index[self._system_key]
 
     @property
     def room(self) -> AmbisenseRoom:
-        return [
-            r for r in self.system.ambisense_rooms if r.room_index == self.room_index
-        ][0]
+        return self.coordinator.model_index[self._room_key]
 
-    @property
+    def fingerprint(self) -> tuple[typing.Any, ...] | None:
+        return self.room, self.system.home, self.system.brand_name
+
+    def identity(self) -> tuple[typing.Any, ...] | None:
+        return self.system.home, self.system.brand_name, self.room.name
+
+    @identity_property
     def name_prefix(self) -> str:
         return f"{self.system.home.home_name or self.system.home.nomenclature} {self.room.name}"
 
-    @property
+    @identity_property
     def id_infix(self) -> str:
         return f"{self.system.id}_room_{self.room_index}"
 
-    @property
+    @identity_property
     def device_info(self):
         return DeviceInfo(
             identifiers={(DOMAIN, self.id_infix)},
@@ -391,7 +527,7 @@ class AmbisenseCoordinatorEntity(CoordinatorEntity):
             manufacturer=self.system.brand_name,
         )
 
-    @property
+    @identity_property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.id_infix}_climate"
 
@@ -407,20 +543,20 @@ class AmbisenseDeviceCoordinatorEntity(AmbisenseCoordinatorEntity):
         super().__init__(system_index, room_index, coordinator)
         self.device = device
 
-    @property
+    @identity_property
     def name_prefix(self) -> str:
         return f"{self.system.home.home_name or self.system.home.nomenclature} {self.device.name}"
 
-    @property
+    @identity_property
     def id_infix(self) -> str:
         return f"{self.system.id}_room_{self.room_index}_device_{self.device.sgtin}"
 
-    @property
+    @identity_property
     def unique_id_fragment(self) -> str:
         return f"{DOMAIN}_{self.id_infix}"
 
 
-class CircuitEntity(CoordinatorEntity):
+class CircuitEntity(ChangeDetectingEntity):
     coordinator: SystemCoordinator
 
     def __init__(
@@ -432,24 +568,34 @@ class CircuitEntity(CoordinatorEntity):
         super().__init__(coordinator)
         self.system_index = system_index
         self.circuit_index = circuit_index
+        self._system_key = coordinator.model_index.key(system_index, "system")
+        self._circuit_key = coordinator.model_index.key(
+            system_index, "circuit", circuit_index
+        )
 
     @property
     def system(self) -> System:
-        return self.coordinator.data[self.system_index]
+        return self.coordinator.model_index[self._system_key]
 
     @property
     def circuit(self) -> Circuit:
-        return self.coordinator.data[self.system_index].circuits[self.circuit_index]
+        return self.coordinator.model_index[self._circuit_key]
 
-    @property
+    def fingerprint(self) -> tuple[typing.Any, ...] | None:
+        return self.circuit, self.system.home, self.system.brand_name
+
+    def identity(self) -> tuple[typing.Any, ...] | None:
+        return self.system.home, self.system.brand_name
+
+    @identity_property
     def name_prefix(self) -> str:
         return f"{self.system.home.home_name or self.system.home.nomenclature} Circuit {self.circuit_index}"
 
-    @property
+    @identity_property
     def id_infix(self) -> str:
         return f"{self.system.id}_circuit_{self.circuit.index}"
 
-    @property
+    @identity_property
     def device_info(self) -> DeviceInfo | None:
         return DeviceInfo(
             identifiers={(DOMAIN, self.id_infix)},
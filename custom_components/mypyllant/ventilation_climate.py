@@ -14,11 +14,11 @@ from homeassistant.components.climate import (
 from homeassistant.const import UnitOfTemperature
 from homeassistant.helpers import selector
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from custom_components.mypyllant.const import DOMAIN
 from custom_components.mypyllant.decorators import ensure_token_refresh
 from custom_components.mypyllant.coordinator import SystemCoordinator
+from custom_components.mypyllant.utils import ChangeDetectingEntity
 from myPyllant.enums import (
     VentilationOperationMode,
     VentilationFanStageType,
@@ -48,7 +48,7 @@ VRC700_FAN_MODE_WRITE_MAP = {
 }
 
 
-class VentilationClimate(CoordinatorEntity, ClimateEntity):
+class VentilationClimate(ChangeDetectingEntity, ClimateEntity):
     """
     Used in climate platform
     """
@@ -66,14 +66,26 @@ class VentilationClimate(CoordinatorEntity, ClimateEntity):
         super().__init__(coordinator)
         self.system_index = system_index
         self.ventilation_index = ventilation_index
+        self._system_key = coordinator.model_index.key(system_index, "system")
+        self._ventilation_key = coordinator.model_index.key(
+            system_index, "ventilation", ventilation_index
+        )
 
     @property
     def system(self) -> System:
-        return self.coordinator.data[self.system_index]
+        return self.coordinator.model_index[self._system_key]
 
     @property
     def ventilation(self) -> Ventilation:
-        return self.system.ventilation[self.ventilation_index]
+        return self.coordinator.model_index[self._ventilation_key]
+
+    def fingerprint(self) -> tuple[Any, ...] | None:
+        return (
+            self.ventilation,
+            self.system.home,
+            self.system.brand_name,
+            self.system.devices,
+        )
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -1,5 +1,6 @@
 import logging
 from collections.abc import Mapping
+from functools import partial
 from typing import Any
 
 import voluptuous as vol
@@ -13,7 +14,6 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from myPyllant.models import (
     DHWTimeProgram,
     DomesticHotWater,
@@ -34,7 +34,9 @@ from .const import (
     SERVICE_SET_DHW_TIME_PROGRAM,
 )
 from .decorators import ensure_token_refresh
-from .utils import EntityList
+from .model_index import ModelKey, is_added
+from .topology import EntityTracker
+from .utils import ChangeDetectingEntity, EntityList
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -43,17 +45,58 @@ async def async_setup_entry(
     hass: HomeAssistant, config: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up the climate platform."""
+    coordinator: SystemCoordinator = hass.data[DOMAIN][config.entry_id][
+        "system_coordinator"
+    ]
+    tracker = EntityTracker(
+        hass,
+        config,
+        coordinator,
+        async_add_entities,
+        partial(create_water_heaters, hass, config),
+    )
+    await tracker.async_setup()
+
+    if len(tracker.entities) > 0:
+        platform = entity_platform.async_get_current_platform()
+        _LOGGER.debug("Setting up water heater entity services for %s", platform)
+        platform.async_register_entity_service(
+            SERVICE_SET_DHW_TIME_PROGRAM,
+            {
+                vol.Required("time_program"): vol.All(dict),
+            },
+            "set_dhw_time_program",
+        )
+        platform.async_register_entity_service(
+            SERVICE_SET_DHW_CIRCULATION_TIME_PROGRAM,
+            {
+                vol.Required("time_program"): vol.All(dict),
+            },
+            "set_dhw_circulation_time_program",
+        )
+
+
+async def create_water_heaters(
+    hass: HomeAssistant,
+    config: ConfigEntry,
+    added: frozenset[ModelKey] | None = None,
+) -> EntityList[WaterHeaterEntity]:
     coordinator: SystemCoordinator = hass.data[DOMAIN][config.entry_id][
         "system_coordinator"
     ]
     if not coordinator.data:
         _LOGGER.warning("No system data, skipping water heater")
-        return
+        return EntityList()
 
     dhws: EntityList[WaterHeaterEntity] = EntityList()
 
+    model_index = coordinator.model_index
     for index, system in enumerate(coordinator.data):
         for dhw_index, dhw in enumerate(system.domestic_hot_water):
+            if not is_added(
+                added, model_index.key(index, "domestic_hot_water", dhw_index)
+            ):
+                continue
             data_key = f"dhw_{index}_{dhw_index}"
             if data_key not in hass.data[DOMAIN][config.entry_id]:
                 hass.data[DOMAIN][config.entry_id][data_key] = {}
@@ -66,28 +109,10 @@ async def async_setup_entry(
                 )
             )
 
-    async_add_entities(dhws)  # type: ignore
-
-    if len(dhws) > 0:
-        platform = entity_platform.async_get_current_platform()
-        _LOGGER.debug("Setting up water heater entity services for %s", platform)
-        platform.async_register_entity_service(
-            SERVICE_SET_DHW_TIME_PROGRAM,
-            {
-                vol.Required("time_program"): vol.All(dict),
-            },
-            "set_dhw_time_program",
-        )
-        platform.async_register_entity_service(
-            SERVICE_SET_DHW_CIRCULATION_TIME_PROGRAM,
-            {
-                vol.Required("time_program"): vol.All(dict),
-            },
-            "set_dhw_circulation_time_program",
-        )
+    return dhws
 
 
-class DomesticHotWaterEntity(CoordinatorEntity, WaterHeaterEntity):
+class DomesticHotWaterEntity(ChangeDetectingEntity, WaterHeaterEntity):
     coordinator: SystemCoordinator
     _attr_temperature_unit = UnitOfTemperature.CELSIUS
 
@@ -96,6 +121,10 @@ class DomesticHotWaterEntity(CoordinatorEntity, WaterHeaterEntity):
         super().__init__(coordinator)
         self.system_index = system_index
         self.dhw_index = dhw_index
+        self._system_key = coordinator.model_index.key(system_index, "system")
+        self._dhw_key = coordinator.model_index.key(
+            system_index, "domestic_hot_water", dhw_index
+        )
         self.data = data
         self.data["last_active_operation_mode"] = (
             self.current_operation
@@ -132,11 +161,14 @@ class DomesticHotWaterEntity(CoordinatorEntity, WaterHeaterEntity):
 
     @property
     def system(self) -> System:
-        return self.coordinator.data[self.system_index]
+        return self.coordinator.model_index[self._system_key]
 
     @property
     def domestic_hot_water(self) -> DomesticHotWater:
-        return self.system.domestic_hot_water[self.dhw_index]
+        return self.coordinator.model_index[self._dhw_key]
+
+    def fingerprint(self) -> tuple[Any, ...] | None:
+        return self.domestic_hot_water, self.system.home, self.system.brand_name
 
     @property
     def name_prefix(self) -> str:
@@ -217,10 +249,19 @@ class DomesticHotWaterEntity(CoordinatorEntity, WaterHeaterEntity):
     async def async_set_temperature(self, **kwargs: Any) -> None:
         target_temp = kwargs.get(ATTR_TEMPERATURE)
         if isinstance(target_temp, (int, float)):
-            await self.coordinator.api.set_domestic_hot_water_temperature(
-                self.domestic_hot_water, int(target_temp)
+            self.coordinator.optimistic.apply(
+                (self.unique_id, "temperature"),
+                self.domestic_hot_water,
+                {"tapping_setpoint": int(target_temp)},
+            )
+            await self.coordinator.command_queue.async_submit(
+                (self.unique_id, "temperature"),
+                partial(
+                    self.coordinator.api.set_domestic_hot_water_temperature,
+                    self.domestic_hot_water,
+                    int(target_temp),
+                ),
             )
-            await self.coordinator.async_request_refresh_delayed()
 
     @ensure_token_refresh
     async def async_set_operation_mode(
@@ -136,6 +136,7 @@ async def daily_data_coordinator_mock(hass, mocked_api) -> DailyDataCoordinator:
         new_callable=mock.PropertyMock,
         return_value="mockid",
     ) as entry:
+        entry.options = TEST_OPTIONS
         hass.data = {
             DOMAIN: {
                 entry.entry_id: {},
@@ -0,0 +1,188 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from myPyllant.models import DeviceData, DeviceDataBucket
+
+from custom_components.mypyllant.backfill import (
+    StatisticsBackfill,
+    StatisticsGapScanner,
+)
+from custom_components.mypyllant.coordinator import DailyDataCoordinator
+from custom_components.mypyllant.sensor import DataSensor
+
+_MIDNIGHT = datetime(2026, 5, 27, 0, 0, tzinfo=timezone.utc)
+
+
+def _hourly_buckets(start, end, value):
+    hours = int((end - start).total_seconds() // 3600)
+    return [
+        DeviceDataBucket(
+            start_date=start + timedelta(hours=i),
+            end_date=start + timedelta(hours=i + 1),
+            value=value,
+        )
+        for i in range(hours)
+    ]
+
+
+async def _run_backfill(hass, coordinator: DailyDataCoordinator, rows):
+    """
+    Backfills 10 days of 10 Wh per hour before a window of two hours, with rows as the published statistics
+    """
+    device = mock.MagicMock()
+    device.device_uuid = "test-uuid"
+    device.name_display = "Arotherm Plus"
+    device.timezone = timezone.utc
+
+    def _device_data(buckets):
+        return DeviceData(
+            operation_mode="HEATING",
+            energy_type="CONSUMED_ELECTRICAL_ENERGY",
+            data_from=buckets[0].start_date if buckets else None,
+            total_consumption=sum(b.value for b in buckets),
+            device=device,
+            data=buckets,
+        )
+
+    coordinator.data = {
+        "test_system": {
+            "devices_data": [
+                [
+                    _device_data(
+                        _hourly_buckets(
+                            _MIDNIGHT, _MIDNIGHT + timedelta(hours=2), 100.0
+                        )
+                    )
+                ]
+            ],
+            "home_name": "Test Home",
+        }
+    }
+    sensor = DataSensor("test_system", 0, 0, coordinator)
+    sensor.hass = hass
+    coordinator.statistics_writer.async_register(sensor)
+
+    requests = []
+
+    async def get_data_by_device(device, resolution, start, end):
+        requests.append((start, end))
+        yield _device_data(_hourly_buckets(start, end, 10.0))
+
+    store = mock.MagicMock()
+    store.async_load = mock.AsyncMock(return_value={})
+    backfill = StatisticsBackfill(hass, coordinator, store)
+    await backfill.async_load()
+    coordinator.entry.async_create_background_task = lambda hass, target, name: (
+        hass.async_create_task(target)
+    )
+
+    with (
+        mock.patch.object(coordinator, "_refresh_session", mock.AsyncMock()),
+        mock.patch.object(coordinator.api, "get_data_by_device", get_data_by_device),
+        mock.patch(
+            "custom_components.mypyllant.statistics.get_instance"
+        ) as mock_recorder,
+        mock.patch(
+            "custom_components.mypyllant.statistics.async_add_external_statistics"
+        ) as mock_stats,
+    ):
+        mock_recorder.return_value.async_add_executor_job = mock.AsyncMock(
+            return_value={sensor.statistic_id: rows(sensor)} if rows else {}
+        )
+        backfill.async_start(_MIDNIGHT - timedelta(days=10))
+        await hass.async_block_till_done()
+    return requests, mock_stats, mock_recorder.return_value, store
+
+
+async def test_backfill_joins_window_baseline(
+    hass, daily_data_coordinator_mock: DailyDataCoordinator
+):
+    requests, mock_stats, _, store = await _run_backfill(
+        hass,
+        daily_data_coordinator_mock,
+        lambda sensor: [
+            {"start": (_MIDNIGHT - timedelta(hours=1)).timestamp(), "sum": 10000.0}
+        ],
+    )
+
+    # One week per request, walking back from the earliest published hour
+    assert requests == [
+        (_MIDNIGHT - timedelta(days=7), _MIDNIGHT),
+        (_MIDNIGHT - timedelta(days=10), _MIDNIGHT - timedelta(days=7)),
+    ]
+    assert mock_stats.call_count == 2
+    latest = list(mock_stats.call_args_list[0][0][2])
+    assert len(latest) == 7 * 24
+    # The earliest published hour keeps its sum, so there is no jump
+    assert latest[-1]["start"] == _MIDNIGHT - timedelta(hours=1)
+    assert latest[-1]["sum"] == 10000.0
+    earliest = list(mock_stats.call_args_list[1][0][2])
+    assert earliest[0]["start"] == _MIDNIGHT - timedelta(days=10)
+    assert earliest[0]["sum"] == 10000.0 - 10 * 24 * 10.0 + 10.0
+    # Finished backfills don't leave a checkpoint behind
+    assert store.async_save.call_args[0][0] == {}
+
+
+async def test_backfill_without_published_statistics(
+    hass, daily_data_coordinator_mock: DailyDataCoordinator
+):
+    requests, mock_stats, recorder, _ = await _run_backfill(
+        hass, daily_data_coordinator_mock, None
+    )
+
+    assert len(requests) == 2
+    imported = [stat for call in mock_stats.call_args_list for stat in list(call[0][2])]
+    assert len(imported) == 10 * 24
+    assert all(stat["sum"] > 0 for stat in imported)
+    # The history counts up from 0, later sums are raised by the energy before them
+    earliest = list(mock_stats.call_args_list[1][0][2])
+    assert earliest[0]["start"] == _MIDNIGHT - timedelta(days=10)
+    assert earliest[0]["sum"] == 10.0
+    assert [
+        call.args[1:3] for call in recorder.async_adjust_statistics.call_args_list
+    ] == [
+        (_MIDNIGHT, 7 * 24 * 10.0),
+        (_MIDNIGHT - timedelta(days=7), 3 * 24 * 10.0),
+    ]
+
+
+def test_gap_repair_raises_later_rows():
+    def hour(i):
+        return (_MIDNIGHT + timedelta(hours=i)).timestamp()
+
+    # Hours 2 and 3 are missing, hour 4 continued from hour 1's sum
+    rows = [
+        {"start": hour(0), "sum": 10.0, "state": 10.0},
+        {"start": hour(1), "sum": 20.0, "state": 20.0},
+        {"start": hour(4), "sum": 30.0, "state": 30.0},
+        {"start": hour(5), "sum": 40.0, "state": 40.0},
+    ]
+    stats = StatisticsGapScanner._repaired_statistics(
+        rows, {hour(2): 5.0, hour(3): 5.0}, timezone.utc
+    )
+    assert [s["start"] for s in stats] == [
+        _MIDNIGHT + timedelta(hours=i) for i in (2, 3, 4, 5)
+    ]
+    assert [s["sum"] for s in stats] == [25.0, 30.0, 40.0, 50.0]
+    assert [s["state"] for s in stats] == [25.0, 30.0, 40.0, 50.0]
+    assert all(s["last_reset"] == _MIDNIGHT for s in stats)
+
+
+async def test_gap_scan_recorder_error(
+    hass, daily_data_coordinator_mock: DailyDataCoordinator, caplog
+):
+    writer = daily_data_coordinator_mock.statistics_writer
+    sensor = mock.MagicMock()
+    sensor.device_data.data = _hourly_buckets(
+        _MIDNIGHT, _MIDNIGHT + timedelta(hours=2), 100.0
+    )
+    writer.async_register(sensor)
+    backfill = StatisticsBackfill(hass, daily_data_coordinator_mock, mock.MagicMock())
+    scanner = StatisticsGapScanner(hass, daily_data_coordinator_mock, backfill)
+    with mock.patch.object(
+        writer,
+        "async_load_statistics",
+        mock.AsyncMock(side_effect=RuntimeError("Database is locked")),
+    ):
+        await scanner._async_scan()
+    assert "Could not scan statistics for gaps" in caplog.text
@@ -1,4 +1,4 @@
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 from homeassistant.helpers.entity_registry import DATA_REGISTRY, EntityRegistry
@@ -76,6 +76,13 @@ async def test_system_binary_sensors(
         assert isinstance(
             CircuitIsCoolingAllowed(0, 0, system_coordinator_mock).name, str
         )
+
+        # Updates that removed the system don't write state, the entity is removed instead
+        control_error = ControlError(0, system_coordinator_mock)
+        system_coordinator_mock.data = []
+        with patch.object(control_error, "async_write_ha_state") as write_mock:
+            control_error._handle_coordinator_update()
+        write_mock.assert_not_called()
         await mocked_api.aiohttp_session.close()
 
 
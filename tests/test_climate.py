@@ -19,7 +19,7 @@ from myPyllant.enums import VentilationOperationModeVRC700
 from myPyllant.tests.generate_test_data import DATA_DIR
 from myPyllant.tests.utils import list_test_data, load_test_data
 
-from custom_components.mypyllant.const import DOMAIN
+from custom_components.mypyllant.const import DOMAIN, OPTION_CLIMATE_ATTRIBUTES
 from custom_components.mypyllant.coordinator import SystemCoordinator
 from custom_components.mypyllant.climate import (
     ZoneClimate,
@@ -107,6 +107,36 @@ async def test_zone_climate(
         await mocked_api.aiohttp_session.close()
 
 
+@pytest.mark.parametrize(
+    "test_data", list_test_data(only_with_systems=True, only_with_active_zones=True)
+)
+async def test_zone_climate_attribute_policy(
+    mypyllant_aioresponses,
+    mocked_api: MyPyllantAPI,
+    system_coordinator_mock: SystemCoordinator,
+    test_data,
+):
+    with mypyllant_aioresponses(test_data) as _:
+        system_coordinator_mock.data = (
+            await system_coordinator_mock._async_update_data()
+        )
+        config_entry = get_config_entry()
+        climate = ZoneClimate(0, 0, system_coordinator_mock, config_entry, {})
+        assert "time_program_heating" in climate.extra_state_attributes
+        assert "time_program_heating" in climate._unrecorded_attributes
+
+        config_entry.options = {OPTION_CLIMATE_ATTRIBUTES: "summary"}
+        assert "time_program_heating" not in climate.extra_state_attributes
+        assert "quick_veto_end_date_time" in climate.extra_state_attributes
+
+        config_entry.options = {OPTION_CLIMATE_ATTRIBUTES: "none"}
+        assert climate.extra_state_attributes is None
+
+        time_programs = await climate.get_time_program()
+        assert isinstance(time_programs["time_program_heating"]["monday"], list)
+        await mocked_api.aiohttp_session.close()
+
+
 @pytest.mark.parametrize(
     "test_data_path",
     ["ventilation", "vrc700_ventilation.yaml"],
@@ -0,0 +1,69 @@
+import asyncio
+from unittest import mock
+
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.mypyllant.coordinator import SystemCoordinator
+
+
+async def test_command_queue_coalesces(system_coordinator_mock: SystemCoordinator):
+    first = mock.AsyncMock()
+    last = mock.AsyncMock()
+    other = mock.AsyncMock()
+    queue = system_coordinator_mock.command_queue
+    with mock.patch.object(
+        system_coordinator_mock, "async_request_refresh_delayed"
+    ) as refresh_mock:
+        await asyncio.gather(
+            queue.async_submit(("zone", "heating"), first),
+            queue.async_submit(("zone", "heating"), last),
+            queue.async_submit(("dhw", "temperature"), other, 10),
+        )
+    first.assert_not_awaited()
+    last.assert_awaited_once()
+    other.assert_awaited_once()
+    refresh_mock.assert_awaited_once_with(10)
+
+
+async def test_command_queue_error(system_coordinator_mock: SystemCoordinator):
+    failing = mock.AsyncMock(side_effect=ValueError("Invalid setpoint"))
+    working = mock.AsyncMock()
+    queue = system_coordinator_mock.command_queue
+    with mock.patch.object(
+        system_coordinator_mock, "async_request_refresh_delayed"
+    ) as refresh_mock:
+        results = await asyncio.gather(
+            queue.async_submit(("zone", "heating"), failing),
+            queue.async_submit(("circuit", "heating_curve"), working),
+            return_exceptions=True,
+        )
+    assert isinstance(results[0], ValueError)
+    assert results[1] is None
+    working.assert_awaited_once()
+    refresh_mock.assert_awaited_once()
+
+    with pytest.raises(ValueError):
+        await queue.async_submit(("zone", "heating"), failing)
+
+
+async def test_command_queue_shutdown(system_coordinator_mock: SystemCoordinator):
+    cancelled = mock.AsyncMock(side_effect=asyncio.CancelledError)
+    never_sent = mock.AsyncMock()
+    queue = system_coordinator_mock.command_queue
+    with mock.patch.object(system_coordinator_mock, "async_request_refresh_delayed"):
+        results = await asyncio.gather(
+            queue.async_submit(("zone", "heating"), cancelled),
+            queue.async_submit(("dhw", "temperature"), never_sent),
+            return_exceptions=True,
+        )
+    assert all(isinstance(result, HomeAssistantError) for result in results)
+    never_sent.assert_not_awaited()
+
+    # A flush that is still collecting commands is cancelled on shutdown
+    pending = asyncio.ensure_future(queue.async_submit(("zone", "heating"), never_sent))
+    await asyncio.sleep(0)
+    await queue.async_shutdown()
+    with pytest.raises(HomeAssistantError):
+        await pending
+    never_sent.assert_not_awaited()
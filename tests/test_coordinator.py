@@ -0,0 +1,276 @@
+import pytest as pytest
+from copy import deepcopy
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from myPyllant.api import MyPyllantAPI
+from myPyllant.models import DeviceData, DeviceDataBucket
+from myPyllant.tests.utils import list_test_data
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.mypyllant.const import DOMAIN, SYSTEM_TIER_CAPABILITIES
+from custom_components.mypyllant.utils import ZoneCoordinatorEntity
+from tests.utils import get_config_entry
+
+
+@pytest.mark.parametrize("test_data", list_test_data(only_with_systems=True))
+async def test_daily_data_partial_failure(
+    mypyllant_aioresponses,
+    mocked_api: MyPyllantAPI,
+    daily_data_coordinator_mock,
+    test_data,
+):
+    with mypyllant_aioresponses(test_data) as _:
+        system_coordinator = daily_data_coordinator_mock.hass_data["system_coordinator"]
+        system_coordinator.data = await system_coordinator._async_update_data()
+        system = next((s for s in system_coordinator.data if len(s.devices) > 1), None)
+        if system is None:
+            await mocked_api.aiohttp_session.close()
+            pytest.skip(
+                "No system with multiple devices, skipping partial failure test"
+            )
+
+        failing_device = system.devices[0]
+        get_data_by_device = mocked_api.get_data_by_device
+
+        async def _get_data_by_device(device, *args, **kwargs):
+            if device.device_uuid == failing_device.device_uuid:
+                raise TimeoutError("Device timed out")
+            async for device_data in get_data_by_device(device, *args, **kwargs):
+                yield device_data
+
+        mocked_api.get_data_by_device = _get_data_by_device  # type: ignore
+        daily_data_coordinator_mock.data = (
+            await daily_data_coordinator_mock._async_update_data()
+        )
+        devices_data = daily_data_coordinator_mock.data[system.id]["devices_data"]
+        assert len(devices_data) == len(system.devices)
+        assert devices_data[0] == []
+        assert all(
+            len(device_data) == len(device.data)
+            for device, device_data in zip(system.devices[1:], devices_data[1:])
+        )
+        await mocked_api.aiohttp_session.close()
+
+
+async def test_daily_data_incremental(daily_data_coordinator_mock):
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    start = now - timedelta(hours=6)
+
+    def buckets(hours, value):
+        return [
+            DeviceDataBucket(
+                start_date=now - timedelta(hours=h),
+                end_date=now - timedelta(hours=h - 1),
+                value=value,
+            )
+            for h in hours
+        ]
+
+    device = MagicMock(
+        device_uuid="device", data=[DeviceData(operation_mode="HEATING")]
+    )
+    previous = DeviceData(
+        operation_mode="HEATING", device=device, data=buckets(range(6, 0, -1), 100.0)
+    )
+    daily_data_coordinator_mock.data = {
+        "system": {"home_name": "Home", "devices_data": [[previous]]}
+    }
+
+    # Buckets are final once they are older than the settle time
+    finalised = daily_data_coordinator_mock._finalised_buckets(device, [previous])
+    assert finalised == {("device", 0): now - timedelta(hours=2)}
+    assert daily_data_coordinator_mock._incremental_start(device, start) == start
+
+    daily_data_coordinator_mock._finalised_until = finalised
+    fetch_start = daily_data_coordinator_mock._incremental_start(device, start)
+    assert fetch_start == now - timedelta(hours=2)
+
+    fetched = DeviceData(
+        operation_mode="HEATING", device=device, data=buckets([2, 1], 200.0)
+    )
+    merged = daily_data_coordinator_mock._merge_device_data(
+        "system", device, [fetched], start, fetch_start
+    )
+    assert [b.start_date for b in merged[0].data] == [
+        b.start_date for b in previous.data
+    ]
+    assert merged[0].total_consumption == 4 * 100.0 + 2 * 200.0
+
+
+async def test_disabled_sensor_ids(hass, daily_data_coordinator_mock):
+    config_entry = get_config_entry()
+    config_entry.add_to_hass(hass)
+    daily_data_coordinator_mock.entry = config_entry
+    entity_registry = er.async_get(hass)
+    entity_registry.async_get_or_create(
+        "sensor",
+        DOMAIN,
+        "disabled_sensor",
+        config_entry=config_entry,
+        disabled_by=er.RegistryEntryDisabler.USER,
+    )
+    entity_registry.async_get_or_create(
+        "sensor", DOMAIN, "enabled_sensor", config_entry=config_entry
+    )
+    assert daily_data_coordinator_mock._disabled_sensor_ids() == {"disabled_sensor"}
+
+
+async def test_system_tiers(
+    mypyllant_aioresponses,
+    mocked_api: MyPyllantAPI,
+    system_coordinator_mock,
+):
+    eebus = {"spine_capable": True, "spine_enabled": False}
+    with (
+        mypyllant_aioresponses(list_test_data(only_with_systems=True)[0]) as _,
+        patch.object(
+            mocked_api, "get_eebus", AsyncMock(return_value=eebus)
+        ) as get_eebus,
+    ):
+        system_coordinator_mock.data = (
+            await system_coordinator_mock._async_update_data()
+        )
+        systems = len(system_coordinator_mock.data)
+        assert get_eebus.call_count == systems
+        assert system_coordinator_mock.data[0].eebus == eebus
+
+        # Slow-changing data is reused until its interval has passed
+        system_coordinator_mock.data = (
+            await system_coordinator_mock._async_update_data()
+        )
+        assert get_eebus.call_count == systems
+        assert system_coordinator_mock.data[0].eebus == eebus
+
+        system_coordinator_mock.invalidate_tier(SYSTEM_TIER_CAPABILITIES)
+        system_coordinator_mock.data = (
+            await system_coordinator_mock._async_update_data()
+        )
+        assert get_eebus.call_count == 2 * systems
+    await mocked_api.aiohttp_session.close()
+
+
+async def test_refresh_delayed_deduplicated(hass, system_coordinator_mock):
+    with patch.object(
+        system_coordinator_mock, "async_request_refresh", new_callable=AsyncMock
+    ) as refresh_mock:
+        for delay in (5, 20, 10, 5, 20, 10, 5, 5, 10, 5):
+            await system_coordinator_mock.async_request_refresh_delayed(delay)
+        refresh_mock.assert_not_awaited()
+
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+        await hass.async_block_till_done()
+        refresh_mock.assert_not_awaited()
+
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=21))
+        await hass.async_block_till_done()
+        refresh_mock.assert_awaited_once()
+
+
+@pytest.mark.parametrize("test_data", list_test_data(only_with_systems=True))
+async def test_model_index_survives_reordering(
+    mypyllant_aioresponses,
+    mocked_api: MyPyllantAPI,
+    system_coordinator_mock,
+    test_data,
+):
+    with mypyllant_aioresponses(test_data) as _:
+        system_coordinator_mock.data = (
+            await system_coordinator_mock._async_update_data()
+        )
+        system = next((s for s in system_coordinator_mock.data if s.zones), None)
+        if system is None:
+            await mocked_api.aiohttp_session.close()
+            pytest.skip("No system with zones")
+        zone = system.zones[-1]
+        entity = ZoneCoordinatorEntity(
+            system_coordinator_mock.data.index(system),
+            len(system.zones) - 1,
+            system_coordinator_mock,
+        )
+        assert entity.zone is zone
+
+        # The next update returns the zones in a different order
+        system.zones = list(reversed(system.zones))
+        system_coordinator_mock.data = list(system_coordinator_mock.data)
+        assert entity.zone is zone
+        assert entity.system is system
+        await mocked_api.aiohttp_session.close()
+
+
+@pytest.mark.parametrize("test_data", list_test_data(only_with_systems=True))
+async def test_unchanged_models_skip_state_writes(
+    mypyllant_aioresponses,
+    mocked_api: MyPyllantAPI,
+    system_coordinator_mock,
+    test_data,
+):
+    with mypyllant_aioresponses(test_data) as _:
+        system_coordinator_mock.data = (
+            await system_coordinator_mock._async_update_data()
+        )
+        system = next((s for s in system_coordinator_mock.data if s.zones), None)
+        if system is None:
+            await mocked_api.aiohttp_session.close()
+            pytest.skip("No system with zones")
+        system_index = system_coordinator_mock.data.index(system)
+        entity = ZoneCoordinatorEntity(system_index, 0, system_coordinator_mock)
+        entity.async_write_ha_state = MagicMock()
+        entity._handle_coordinator_update()
+        assert entity.async_write_ha_state.call_count == 1
+
+        # An update with equal data doesn't write state
+        system_coordinator_mock.data = deepcopy(system_coordinator_mock.data)
+        entity._handle_coordinator_update()
+        assert entity.async_write_ha_state.call_count == 1
+
+        # A changed zone does
+        system_coordinator_mock.data = deepcopy(system_coordinator_mock.data)
+        zone = system_coordinator_mock.data[system_index].zones[0]
+        zone.current_room_temperature = (zone.current_room_temperature or 0) + 1
+        entity._handle_coordinator_update()
+        assert entity.async_write_ha_state.call_count == 2
+
+        # Changes in place, i.e. optimistic state, keep the same data and are always written
+        zone.current_room_temperature += 1
+        entity._handle_coordinator_update()
+        assert entity.async_write_ha_state.call_count == 3
+        await mocked_api.aiohttp_session.close()
+
+
+@pytest.mark.parametrize("test_data", list_test_data(only_with_systems=True))
+async def test_identity_properties_follow_renames(
+    mypyllant_aioresponses,
+    mocked_api: MyPyllantAPI,
+    system_coordinator_mock,
+    test_data,
+):
+    with mypyllant_aioresponses(test_data) as _:
+        system_coordinator_mock.data = (
+            await system_coordinator_mock._async_update_data()
+        )
+        system = next((s for s in system_coordinator_mock.data if s.zones), None)
+        if system is None:
+            await mocked_api.aiohttp_session.close()
+            pytest.skip("No system with zones")
+        system_index = system_coordinator_mock.data.index(system)
+        entity = ZoneCoordinatorEntity(system_index, 0, system_coordinator_mock)
+        entity.async_write_ha_state = MagicMock()
+        device_info = entity.device_info
+        assert entity.device_info is device_info
+
+        # Updates that keep the names use the cached values
+        system_coordinator_mock.data = deepcopy(system_coordinator_mock.data)
+        system_coordinator_mock.data[system_index].zones[0].extra_fields["test"] = 1
+        entity._handle_coordinator_update()
+        assert entity.device_info is device_info
+
+        # A renamed zone builds them again
+        system_coordinator_mock.data = deepcopy(system_coordinator_mock.data)
+        system_coordinator_mock.data[system_index].zones[0].general.name = "Renamed"
+        entity._handle_coordinator_update()
+        assert "Renamed" in entity.name_prefix
+        assert entity.device_info["name"] == entity.name_prefix
+        await mocked_api.aiohttp_session.close()
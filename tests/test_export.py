@@ -0,0 +1,38 @@
+import csv
+import gzip
+import json
+
+from custom_components.mypyllant.export import EXPORT_FIELDS, ExportFile
+
+_ROW = {
+    "system_id": "system",
+    "device_uuid": "device",
+    "device_name": "aroTHERM plus",
+    "operation_mode": "HEATING",
+    "energy_type": "CONSUMED_ELECTRICAL_ENERGY",
+    "resolution": "HOUR",
+    "start_date": "2026-05-27T00:00:00+00:00",
+    "end_date": "2026-05-27T01:00:00+00:00",
+    "value": 100.0,
+}
+
+
+def test_export_file_ndjson(tmp_path):
+    export_file = ExportFile(tmp_path / "export" / "data.ndjson", "ndjson", False)
+    export_file.open()
+    export_file.write([_ROW])
+    export_file.write([_ROW, _ROW])
+    export_file.close()
+    lines = (tmp_path / "export" / "data.ndjson").read_text().splitlines()
+    assert [json.loads(line) for line in lines] == [_ROW] * 3
+
+
+def test_export_file_csv_gzip(tmp_path):
+    export_file = ExportFile(tmp_path / "data.csv.gz", "csv", True)
+    export_file.open()
+    export_file.write([_ROW])
+    export_file.close()
+    with gzip.open(tmp_path / "data.csv.gz", "rt", newline="") as fh:
+        rows = list(csv.DictReader(fh))
+    assert list(rows[0]) == list(EXPORT_FIELDS)
+    assert rows[0]["value"] == "100.0"
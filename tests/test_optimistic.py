@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from myPyllant.tests.generate_test_data import DATA_DIR
+from myPyllant.tests.utils import load_test_data
+
+from custom_components.mypyllant.coordinator import SystemCoordinator
+
+
+@pytest.fixture
+async def systems(mypyllant_aioresponses, system_coordinator_mock, mocked_api):
+    test_data = load_test_data(DATA_DIR / "ventilation")
+    with mypyllant_aioresponses(test_data) as _:
+        system_coordinator_mock.data = (
+            await system_coordinator_mock._async_update_data()
+        )
+        yield (
+            system_coordinator_mock.data,
+            await system_coordinator_mock._async_update_data(),
+        )
+        await mocked_api.aiohttp_session.close()
+
+
+async def test_optimistic_reconcile(
+    system_coordinator_mock: SystemCoordinator,
+    systems,
+):
+    data, refreshed = systems
+    zone = data[0].zones[0]
+    refreshed_zone = refreshed[0].zones[0]
+    previous = zone.desired_room_temperature_setpoint_heating
+    optimistic = system_coordinator_mock.optimistic
+
+    optimistic.apply(
+        ("zone", "heating"),
+        zone,
+        {"desired_room_temperature_setpoint_heating": 30.5},
+    )
+    assert zone.desired_room_temperature_setpoint_heating == 30.5
+
+    # The API doesn't return the new value yet
+    optimistic.reconcile(refreshed)
+    assert refreshed_zone.desired_room_temperature_setpoint_heating == 30.5
+    assert ("zone", "heating") in optimistic._values
+
+    # After the timeout, the API value is used
+    for value in optimistic._values[("zone", "heating")]:
+        value.expires = datetime.now(timezone.utc) - timedelta(seconds=1)
+    refreshed_zone.desired_room_temperature_setpoint_heating = previous
+    optimistic.reconcile(refreshed)
+    assert refreshed_zone.desired_room_temperature_setpoint_heating == previous
+    assert not optimistic._values
+
+
+async def test_optimistic_rollback(
+    system_coordinator_mock: SystemCoordinator,
+    systems,
+):
+    data, _ = systems
+    circuit = data[0].circuits[0]
+    previous = circuit.heating_curve
+    optimistic = system_coordinator_mock.optimistic
+
+    optimistic.apply(("circuit", "heating_curve"), circuit, {"heating_curve": 1.1})
+    optimistic.apply(("circuit", "heating_curve"), circuit, {"heating_curve": 1.2})
+    assert circuit.heating_curve == 1.2
+    optimistic.rollback(("circuit", "heating_curve"))
+    assert circuit.heating_curve == previous
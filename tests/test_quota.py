@@ -1,17 +1,23 @@
 from asyncio import CancelledError
 from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest as pytest
 from aiohttp import RequestInfo
 from aiohttp.client_exceptions import ClientResponseError
 from freezegun import freeze_time
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.update_coordinator import UpdateFailed
 
+from custom_components.mypyllant.decorators import ensure_token_refresh
+from custom_components.mypyllant.quota import ApiBudget
 from custom_components.mypyllant.utils import extract_quota_duration
 from myPyllant.api import MyPyllantAPI
 from myPyllant.tests.utils import list_test_data
 
 from custom_components.mypyllant.const import (
+    API_BUDGET_MAX_STRETCH,
+    API_BUDGET_WINDOW,
     API_DOWN_PAUSE_INTERVAL,
     QUOTA_PAUSE_INTERVAL,
 )
@@ -380,3 +386,72 @@ async def test_multiple_quota_hits_then_recovery(
     assert system_coordinator_mock._quota_exc_info is None
 
     await mocked_api.aiohttp_session.close()
+
+
+async def test_api_budget():
+    api = MagicMock()
+    api.aiohttp_session.request_count = 0
+    budget = ApiBudget(api)
+    budget.record()
+    api.aiohttp_session.request_count = 100
+    budget.record()
+    assert budget.calls_in_window == 100
+    # Without a known quota, intervals are not changed
+    assert budget.allows_background_update()
+    assert budget.stretch(timedelta(minutes=30)) == timedelta(minutes=30)
+
+    budget.record_lockout()
+    assert budget.learned_limit == 100
+    assert budget.background_limit == 64
+    assert not budget.allows_background_update()
+    assert budget.stretch(timedelta(minutes=30)) == timedelta(minutes=93.75)
+    api.aiohttp_session.request_count = 200
+    assert budget.stretch(timedelta(minutes=30)) == timedelta(
+        minutes=30 * API_BUDGET_MAX_STRETCH
+    )
+
+    # Calls from the previous window don't count anymore
+    with freeze_time(
+        datetime.now(timezone.utc) + timedelta(seconds=API_BUDGET_WINDOW + 1)
+    ):
+        budget.record()
+        assert budget.calls_in_window == 0
+        assert budget.allows_background_update()
+        api.aiohttp_session.request_count = 240
+        assert budget.stretch(timedelta(minutes=30)) == timedelta(minutes=37.5)
+
+
+async def test_quota_shared_between_coordinators(
+    mypyllant_aioresponses, mocked_api: MyPyllantAPI, daily_data_coordinator_mock
+):
+    system_coordinator = daily_data_coordinator_mock.hass_data["system_coordinator"]
+    quota_exception = ClientResponseError(
+        request_info=RequestInfo(
+            url="https://api.vaillant-group.com/service-connected-control/end-user-app-api/v1/homes",  # type: ignore
+            method="GET",
+            headers=None,  # type: ignore
+        ),
+        history=None,  # type: ignore
+        status=403,
+        message="Quota Exceeded",
+        headers={"Retry-After": "1800"},  # type: ignore
+    )
+    with mypyllant_aioresponses(raise_exception=quota_exception) as _:
+        with pytest.raises(UpdateFailed, match=r"Quota.*"):
+            await system_coordinator._async_update_data()
+
+    assert daily_data_coordinator_mock.quota is system_coordinator.quota
+    assert system_coordinator.quota.lockout_end_time is not None
+    # The daily data coordinator doesn't make requests during the lockout
+    with mypyllant_aioresponses(test_data=list_test_data()[0]) as _:
+        with pytest.raises(UpdateFailed, match=r"Quota.*"):
+            await daily_data_coordinator_mock._async_update_data()
+
+    # Neither do entity actions
+    entity = MagicMock()
+    entity.coordinator = system_coordinator
+    action = AsyncMock()
+    with pytest.raises(HomeAssistantError, match=r"Quota.*"):
+        await ensure_token_refresh(action)(entity)
+    action.assert_not_awaited()
+    await mocked_api.aiohttp_session.close()
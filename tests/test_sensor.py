@@ -19,6 +19,8 @@ from custom_components.mypyllant.sensor import (
     CircuitStateSensor,
     DataSensor,
     DomesticHotWaterCurrentSpecialFunctionSensor,
+    EfficiencySensor,
+    PeriodTotalSensor,
     DomesticHotWaterOperationModeSensor,
     DomesticHotWaterSetPointSensor,
     DomesticHotWaterTankTemperatureSensor,
@@ -38,6 +40,8 @@ from custom_components.mypyllant.sensor import (
     SystemDeviceCurrentPowerSensor,
 )
 from custom_components.mypyllant.const import DOMAIN
+from custom_components.mypyllant.statistics import StatisticsWriter
+from custom_components.mypyllant.totals import DailyTotals, PeriodTotals
 from tests.utils import get_config_entry
 
 
@@ -308,7 +312,7 @@ async def test_additional_system_sensors(
 
 
 # ---------------------------------------------------------------------------
-# Helpers for _write_hourly_statistics tests
+# Helpers for StatisticsWriter tests
 # ---------------------------------------------------------------------------
 
 _MIDNIGHT = datetime(2026, 5, 27, 0, 0, tzinfo=timezone.utc)
@@ -351,6 +355,8 @@ def _make_sensor(hass, buckets, data_from=_MIDNIGHT):
             "home_name": "Test Home",
         }
     }
+    coordinator.statistics_writer = StatisticsWriter(hass)
+    coordinator.daily_totals = DailyTotals(coordinator.data)
     sensor = DataSensor(_SYSTEM_ID, 0, 0, coordinator)
     sensor.hass = hass
     return sensor
@@ -366,13 +372,13 @@ async def test_write_hourly_statistics_correct_data(hass):
     sensor = _make_sensor(hass, buckets)
 
     with (
-        patch("custom_components.mypyllant.sensor.get_instance") as mock_recorder,
+        patch("custom_components.mypyllant.statistics.get_instance") as mock_recorder,
         patch(
-            "custom_components.mypyllant.sensor.async_add_external_statistics"
+            "custom_components.mypyllant.statistics.async_add_external_statistics"
         ) as mock_stats,
     ):
         mock_recorder.return_value.async_add_executor_job = AsyncMock(return_value={})
-        await sensor._write_hourly_statistics()
+        await sensor.coordinator.statistics_writer.async_write([sensor])
 
     mock_stats.assert_called_once()
     _, metadata, stats = mock_stats.call_args[0]
@@ -399,13 +405,13 @@ async def test_write_hourly_statistics_skips_none_values(hass):
     sensor = _make_sensor(hass, buckets)
 
     with (
-        patch("custom_components.mypyllant.sensor.get_instance") as mock_recorder,
+        patch("custom_components.mypyllant.statistics.get_instance") as mock_recorder,
         patch(
-            "custom_components.mypyllant.sensor.async_add_external_statistics"
+            "custom_components.mypyllant.statistics.async_add_external_statistics"
         ) as mock_stats,
     ):
         mock_recorder.return_value.async_add_executor_job = AsyncMock(return_value={})
-        await sensor._write_hourly_statistics()
+        await sensor.coordinator.statistics_writer.async_write([sensor])
 
     mock_stats.assert_called_once()
     _, _, stats = mock_stats.call_args[0]
@@ -422,13 +428,13 @@ async def test_write_hourly_statistics_no_data(hass):
     sensor = _make_sensor(hass, [])
 
     with (
-        patch("custom_components.mypyllant.sensor.get_instance") as mock_recorder,
+        patch("custom_components.mypyllant.statistics.get_instance") as mock_recorder,
         patch(
-            "custom_components.mypyllant.sensor.async_add_external_statistics"
+            "custom_components.mypyllant.statistics.async_add_external_statistics"
         ) as mock_stats,
     ):
         mock_recorder.return_value.async_add_executor_job = AsyncMock(return_value={})
-        await sensor._write_hourly_statistics()
+        await sensor.coordinator.statistics_writer.async_write([sensor])
 
     mock_stats.assert_not_called()
 
@@ -441,13 +447,14 @@ async def test_write_hourly_statistics_no_device_data(hass):
             "home_name": "Test Home",
         }
     }
+    coordinator.statistics_writer = StatisticsWriter(hass)
     sensor = DataSensor(_SYSTEM_ID, 0, 0, coordinator)
     sensor.hass = hass
 
     with patch(
-        "custom_components.mypyllant.sensor.async_add_external_statistics"
+        "custom_components.mypyllant.statistics.async_add_external_statistics"
     ) as mock_stats:
-        await sensor._write_hourly_statistics()
+        await coordinator.statistics_writer.async_write([sensor])
 
     mock_stats.assert_not_called()
 
@@ -457,9 +464,9 @@ async def test_async_added_to_hass_writes_statistics(hass):
     sensor = _make_sensor(hass, buckets)
 
     with (
-        patch("custom_components.mypyllant.sensor.get_instance") as mock_recorder,
+        patch("custom_components.mypyllant.statistics.get_instance") as mock_recorder,
         patch(
-            "custom_components.mypyllant.sensor.async_add_external_statistics"
+            "custom_components.mypyllant.statistics.async_add_external_statistics"
         ) as mock_stats,
         patch(
             "homeassistant.helpers.update_coordinator.CoordinatorEntity.async_added_to_hass",
@@ -468,6 +475,7 @@ async def test_async_added_to_hass_writes_statistics(hass):
     ):
         mock_recorder.return_value.async_add_executor_job = AsyncMock(return_value={})
         await sensor.async_added_to_hass()
+        await hass.async_block_till_done()
 
     mock_stats.assert_called_once()
     await sensor.async_will_remove_from_hass()
@@ -481,15 +489,24 @@ async def test_write_hourly_statistics_carries_forward_previous_sum(hass):
     stat_id = f"{DOMAIN}:{sensor.unique_id}".lower().replace("-", "_")
 
     with (
-        patch("custom_components.mypyllant.sensor.get_instance") as mock_recorder,
+        patch("custom_components.mypyllant.statistics.get_instance") as mock_recorder,
         patch(
-            "custom_components.mypyllant.sensor.async_add_external_statistics"
+            "custom_components.mypyllant.statistics.async_add_external_statistics"
         ) as mock_stats,
     ):
         mock_recorder.return_value.async_add_executor_job = AsyncMock(
-            return_value={stat_id: [{"sum": 3804.0}]}
+            return_value={
+                stat_id: [
+                    {
+                        "start": (
+                            buckets[0].start_date - timedelta(hours=1)
+                        ).timestamp(),
+                        "sum": 3804.0,
+                    }
+                ]
+            }
         )
-        await sensor._write_hourly_statistics()
+        await sensor.coordinator.statistics_writer.async_write([sensor])
 
     mock_stats.assert_called_once()
     _, _, stats = mock_stats.call_args[0]
@@ -510,13 +527,13 @@ async def test_write_hourly_statistics_without_data_from(hass):
     sensor = _make_sensor(hass, buckets, data_from=None)
 
     with (
-        patch("custom_components.mypyllant.sensor.get_instance") as mock_recorder,
+        patch("custom_components.mypyllant.statistics.get_instance") as mock_recorder,
         patch(
-            "custom_components.mypyllant.sensor.async_add_external_statistics"
+            "custom_components.mypyllant.statistics.async_add_external_statistics"
         ) as mock_stats,
     ):
         mock_recorder.return_value.async_add_executor_job = AsyncMock(return_value={})
-        await sensor._write_hourly_statistics()
+        await sensor.coordinator.statistics_writer.async_write([sensor])
 
     mock_stats.assert_called_once()
     _, _, stats = mock_stats.call_args[0]
@@ -535,10 +552,10 @@ async def test_async_added_to_hass_survives_statistics_failure(hass):
 
     with (
         patch(
-            "custom_components.mypyllant.sensor.DataSensor._write_hourly_statistics",
+            "custom_components.mypyllant.statistics.StatisticsWriter.async_write",
             new_callable=AsyncMock,
             side_effect=RuntimeError("recorder not ready"),
-        ),
+        ) as mock_write,
         patch(
             "homeassistant.helpers.update_coordinator.CoordinatorEntity.async_added_to_hass",
             new_callable=AsyncMock,
@@ -546,6 +563,9 @@ async def test_async_added_to_hass_survives_statistics_failure(hass):
     ):
         # Should not raise
         await sensor.async_added_to_hass()
+        await hass.async_block_till_done()
+
+    mock_write.assert_called_once()
 
     await sensor.async_will_remove_from_hass()
 
@@ -581,13 +601,13 @@ async def test_write_hourly_statistics_resets_state_across_day_boundary(hass):
     sensor = _make_sensor(hass, buckets, data_from=day1)
 
     with (
-        patch("custom_components.mypyllant.sensor.get_instance") as mock_recorder,
+        patch("custom_components.mypyllant.statistics.get_instance") as mock_recorder,
         patch(
-            "custom_components.mypyllant.sensor.async_add_external_statistics"
+            "custom_components.mypyllant.statistics.async_add_external_statistics"
         ) as mock_stats,
     ):
         mock_recorder.return_value.async_add_executor_job = AsyncMock(return_value={})
-        await sensor._write_hourly_statistics()
+        await sensor.coordinator.statistics_writer.async_write([sensor])
 
     _, _, stats = mock_stats.call_args[0]
     stats = list(stats)
@@ -610,9 +630,7 @@ async def test_write_hourly_statistics_skips_unchanged_buckets(hass):
     stat_id = f"{DOMAIN}:{sensor.unique_id}".lower().replace("-", "_")
 
     async def fake_job(func, hass, start_time, *rest):
-        if start_time < buckets[0].start_date:
-            # baseline lookup (window_start - 7 days .. window_start)
-            return {}
+        # nothing published before this window, so the baseline is 0
         return {
             stat_id: [
                 {"start": buckets[0].start_date.timestamp(), "sum": 100.0},
@@ -621,15 +639,15 @@ async def test_write_hourly_statistics_skips_unchanged_buckets(hass):
         }
 
     with (
-        patch("custom_components.mypyllant.sensor.get_instance") as mock_recorder,
+        patch("custom_components.mypyllant.statistics.get_instance") as mock_recorder,
         patch(
-            "custom_components.mypyllant.sensor.async_add_external_statistics"
+            "custom_components.mypyllant.statistics.async_add_external_statistics"
         ) as mock_stats,
     ):
         mock_recorder.return_value.async_add_executor_job = AsyncMock(
             side_effect=fake_job
         )
-        await sensor._write_hourly_statistics()
+        await sensor.coordinator.statistics_writer.async_write([sensor])
 
     mock_stats.assert_called_once()
     _, _, stats = mock_stats.call_args[0]
@@ -648,9 +666,7 @@ async def test_write_hourly_statistics_rewrites_corrected_bucket(hass):
     stat_id = f"{DOMAIN}:{sensor.unique_id}".lower().replace("-", "_")
 
     async def fake_job(func, hass, start_time, *rest):
-        if start_time < buckets[0].start_date:
-            # baseline lookup (window_start - 7 days .. window_start)
-            return {}
+        # nothing published before this window, so the baseline is 0
         return {
             stat_id: [
                 {"start": buckets[0].start_date.timestamp(), "sum": 100.0},
@@ -659,15 +675,15 @@ async def test_write_hourly_statistics_rewrites_corrected_bucket(hass):
         }
 
     with (
-        patch("custom_components.mypyllant.sensor.get_instance") as mock_recorder,
+        patch("custom_components.mypyllant.statistics.get_instance") as mock_recorder,
         patch(
-            "custom_components.mypyllant.sensor.async_add_external_statistics"
+            "custom_components.mypyllant.statistics.async_add_external_statistics"
         ) as mock_stats,
     ):
         mock_recorder.return_value.async_add_executor_job = AsyncMock(
             side_effect=fake_job
         )
-        await sensor._write_hourly_statistics()
+        await sensor.coordinator.statistics_writer.async_write([sensor])
 
     mock_stats.assert_called_once()
     _, _, stats = mock_stats.call_args[0]
@@ -693,16 +709,13 @@ async def test_write_hourly_statistics_baseline_stable_across_repeated_polls(has
     published: dict = {}
 
     async def fake_job(func, hass, start_time, *rest):
-        if start_time < buckets[0].start_date:
-            # baseline lookup: nothing published before this window in this test
-            return {}
-        # existing-stats lookup: reflects whatever the previous poll wrote
+        # reflects whatever the previous poll wrote, nothing before this window
         return {stat_id: published.get(stat_id, [])}
 
     with (
-        patch("custom_components.mypyllant.sensor.get_instance") as mock_recorder,
+        patch("custom_components.mypyllant.statistics.get_instance") as mock_recorder,
         patch(
-            "custom_components.mypyllant.sensor.async_add_external_statistics"
+            "custom_components.mypyllant.statistics.async_add_external_statistics"
         ) as mock_stats,
     ):
         mock_recorder.return_value.async_add_executor_job = AsyncMock(
@@ -710,7 +723,7 @@ async def test_write_hourly_statistics_baseline_stable_across_repeated_polls(has
         )
 
         # first poll: writes all three buckets
-        await sensor._write_hourly_statistics()
+        await sensor.coordinator.statistics_writer.async_write([sensor])
         _, _, first_stats = mock_stats.call_args[0]
         first_stats = list(first_stats)
         published[stat_id] = [
@@ -720,16 +733,100 @@ async def test_write_hourly_statistics_baseline_stable_across_repeated_polls(has
 
         # second poll: identical bucket data, nothing should have changed
         mock_stats.reset_mock()
-        await sensor._write_hourly_statistics()
+        await sensor.coordinator.statistics_writer.async_write([sensor])
 
     # everything was already published with matching sums, so nothing new
     # gets written - the sums must not have grown
     mock_stats.assert_not_called()
 
 
+async def test_write_hourly_statistics_batches_sensors(hass):
+    """All sensors of a coordinator are written with a single recorder query."""
+    sensor = _make_sensor(hass, _make_buckets([100.0, 200.0]))
+    writer = sensor.coordinator.statistics_writer
+    # A second sensor with its own statistic id
+    sensor.coordinator.data[_SYSTEM_ID]["devices_data"][0].append(
+        DeviceData(
+            operation_mode="DOMESTIC_HOT_WATER",
+            energy_type="CONSUMED_ELECTRICAL_ENERGY",
+            data_from=_MIDNIGHT,
+            total_consumption=50.0,
+            device=sensor.device,
+            data=_make_buckets([50.0]),
+        )
+    )
+    other = DataSensor(_SYSTEM_ID, 0, 1, sensor.coordinator)
+    other.hass = hass
+    writer.async_register(sensor)
+    writer.async_register(other)
+
+    with (
+        patch("custom_components.mypyllant.statistics.get_instance") as mock_recorder,
+        patch(
+            "custom_components.mypyllant.statistics.async_add_external_statistics"
+        ) as mock_stats,
+    ):
+        mock_recorder.return_value.async_add_executor_job = AsyncMock(return_value={})
+        await writer.async_write()
+
+    mock_recorder.return_value.async_add_executor_job.assert_called_once()
+    statistic_ids = mock_recorder.return_value.async_add_executor_job.call_args[0][4]
+    assert statistic_ids == {sensor.statistic_id, other.statistic_id}
+    assert mock_stats.call_count == 2
+
+
+async def test_write_hourly_statistics_uses_cached_sums(hass):
+    """Published sums are read from the recorder once, later polls use the cache."""
+    buckets = _make_buckets([100.0, 200.0])
+    sensor = _make_sensor(hass, buckets)
+    writer = sensor.coordinator.statistics_writer
+
+    with (
+        patch("custom_components.mypyllant.statistics.get_instance") as mock_recorder,
+        patch(
+            "custom_components.mypyllant.statistics.async_add_external_statistics"
+        ) as mock_stats,
+    ):
+        mock_recorder.return_value.async_add_executor_job = AsyncMock(
+            return_value={
+                sensor.statistic_id: [
+                    {
+                        "start": (
+                            buckets[0].start_date - timedelta(hours=1)
+                        ).timestamp(),
+                        "sum": 1000.0,
+                    }
+                ]
+            }
+        )
+        await writer.async_write([sensor])
+        assert [s["sum"] for s in mock_stats.call_args[0][2]] == [1100.0, 1300.0]
+
+        # A new hour arrives, only it is written on top of the cached sums
+        mock_stats.reset_mock()
+        sensor.device_data.data.append(
+            DeviceDataBucket(
+                start_date=buckets[-1].end_date,
+                end_date=buckets[-1].end_date + timedelta(hours=1),
+                value=300.0,
+            )
+        )
+        await writer.async_write([sensor])
+        stats = list(mock_stats.call_args[0][2])
+        assert len(stats) == 1
+        assert stats[0]["sum"] == 1600.0
+
+        # Nothing changed, nothing is written
+        mock_stats.reset_mock()
+        await writer.async_write([sensor])
+        mock_stats.assert_not_called()
+
+    mock_recorder.return_value.async_add_executor_job.assert_called_once()
+
+
 def test_today_total_consumption_ignores_yesterdays_buckets(hass):
     """The coordinator fetches a 2-day window (yesterday + today) so
-    _write_hourly_statistics can backfill yesterday's last hour. native_value
+    the StatisticsWriter can backfill yesterday's last hour. native_value
     must not inherit yesterday's total from that wider window - it should
     reset to only today's consumption, the same way the History graph is
     expected to reset at midnight."""
@@ -811,3 +908,54 @@ def test_today_total_consumption_all_none_values(hass):
         mock_datetime.now.return_value = _MIDNIGHT + timedelta(hours=1)
         sensor = _make_sensor(hass, buckets)
         assert sensor.today_total_consumption == 0.0
+
+
+def test_efficiency_uses_todays_totals(hass):
+    sensor = _make_sensor(hass, _make_buckets([1000.0, 2000.0]))
+    devices_data = sensor.coordinator.data[_SYSTEM_ID]["devices_data"][0]
+    devices_data.append(
+        DeviceData(
+            operation_mode="HEATING",
+            energy_type="HEAT_GENERATED",
+            data_from=_MIDNIGHT,
+            total_consumption=13500.0,
+            device=sensor.device,
+            data=[
+                DeviceDataBucket(
+                    start_date=_MIDNIGHT - timedelta(hours=1),
+                    end_date=_MIDNIGHT,
+                    value=4500.0,
+                ),
+                *_make_buckets([4000.0, 5000.0]),
+            ],
+        )
+    )
+    sensor.coordinator.daily_totals = DailyTotals(sensor.coordinator.data)
+    efficiency = EfficiencySensor(_SYSTEM_ID, 0, sensor.coordinator)
+    home_efficiency = EfficiencySensor(_SYSTEM_ID, None, sensor.coordinator)
+
+    with patch("custom_components.mypyllant.sensor.datetime") as mock_datetime:
+        mock_datetime.now.return_value = _MIDNIGHT + timedelta(hours=2)
+        # Yesterday's heat generated isn't part of today's efficiency
+        assert efficiency.native_value == 3.0
+        assert home_efficiency.native_value == 3.0
+
+
+def test_period_total_sensor(hass):
+    sensor = _make_sensor(hass, _make_buckets([1000.0, 2000.0]))
+    period_totals = PeriodTotals()
+    period_totals.seed(
+        _SYSTEM_ID,
+        "CONSUMED_ELECTRICAL_ENERGY",
+        {(_MIDNIGHT - timedelta(days=1)).date(): 5000.0},
+    )
+    period_totals.update(sensor.coordinator.daily_totals)
+    sensor.coordinator.period_totals = period_totals
+    year_to_date = PeriodTotalSensor(
+        _SYSTEM_ID, "CONSUMED_ELECTRICAL_ENERGY", "year", sensor.coordinator
+    )
+
+    assert year_to_date.name == "Test Home Consumed Electrical Energy Year to Date"
+    with patch("custom_components.mypyllant.sensor.datetime") as mock_datetime:
+        mock_datetime.now.return_value = _MIDNIGHT + timedelta(hours=2)
+        assert year_to_date.native_value == 8000.0
@@ -0,0 +1,103 @@
+import json
+
+import pytest as pytest
+from aiohttp import RequestInfo
+from aiohttp.client_exceptions import ClientResponseError
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from myPyllant.api import MyPyllantAPI
+from myPyllant.tests.utils import list_test_data
+
+from custom_components.mypyllant.quota import QuotaController
+from custom_components.mypyllant.storage import (
+    QuotaStore,
+    SnapshotStore,
+    deserialize_device_data,
+    deserialize_system,
+    serialize_device_data,
+    serialize_system,
+)
+
+
+@pytest.mark.parametrize("test_data", list_test_data(only_with_systems=True))
+async def test_snapshot_roundtrip(
+    mypyllant_aioresponses,
+    mocked_api: MyPyllantAPI,
+    daily_data_coordinator_mock,
+    test_data,
+):
+    with mypyllant_aioresponses(test_data) as _:
+        system_coordinator = daily_data_coordinator_mock.hass_data["system_coordinator"]
+        system_coordinator.data = await system_coordinator._async_update_data()
+        daily_data_coordinator_mock.data = (
+            await daily_data_coordinator_mock._async_update_data()
+        )
+
+    for system in system_coordinator.data:
+        restored = deserialize_system(json.loads(json.dumps(serialize_system(system))))
+        assert restored.id == system.id
+        assert restored.home == system.home
+        # Time program days can't be compared directly
+        assert [z.prepare_dict() for z in restored.zones] == [
+            z.prepare_dict() for z in system.zones
+        ]
+        assert [d.prepare_dict() for d in restored.domestic_hot_water] == [
+            d.prepare_dict() for d in system.domestic_hot_water
+        ]
+        assert [d.device_uuid for d in restored.devices] == [
+            d.device_uuid for d in system.devices
+        ]
+        assert restored.extra_fields == system.extra_fields
+
+        devices = {d.device_uuid: d for d in restored.devices}
+        for device_data in daily_data_coordinator_mock.data.get(system.id, {}).get(
+            "devices_data", []
+        ):
+            for dd in device_data:
+                restored_dd = deserialize_device_data(
+                    json.loads(json.dumps(serialize_device_data(dd))), devices
+                )
+                assert restored_dd.device is not None
+                assert restored_dd.total_consumption == dd.total_consumption
+                assert restored_dd.data == dd.data
+    await mocked_api.aiohttp_session.close()
+
+
+async def test_snapshot_store(hass, hass_storage):
+    store = SnapshotStore(hass, "entry_id")
+    assert await store.async_load() is None
+
+    hass_storage["mypyllant.snapshot.entry_id"] = {
+        "version": 1,
+        "data": {"homes": [], "systems": [{"invalid": True}], "daily_data": {}},
+    }
+    store = SnapshotStore(hass, "entry_id")
+    assert await store.async_load() is None
+
+
+async def test_quota_store(hass, hass_storage, mocked_api: MyPyllantAPI):
+    quota = QuotaController(mocked_api)
+    quota.set_quota_exceeded(
+        ClientResponseError(
+            request_info=RequestInfo(
+                url="https://api.vaillant-group.com/service-connected-control/end-user-app-api/v1/homes",  # type: ignore
+                method="GET",
+                headers=None,  # type: ignore
+            ),
+            history=None,  # type: ignore
+            status=403,
+            message="Quota Exceeded",
+            headers={"Retry-After": "1800"},  # type: ignore
+        )
+    )
+    store = QuotaStore(hass, "entry_id")
+    store.async_save(quota)
+    await hass.async_block_till_done()
+    assert hass_storage["mypyllant.quota.entry_id"]["data"]["end_time"]
+
+    restored = QuotaController(mocked_api)
+    await QuotaStore(hass, "entry_id").async_load(restored)
+    assert restored.lockout_end_time == quota.lockout_end_time
+    with pytest.raises(UpdateFailed, match=r"Quota Exceeded.*"):
+        restored.raise_if_locked("update")
+    await mocked_api.aiohttp_session.close()
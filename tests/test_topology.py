@@ -0,0 +1,162 @@
+from copy import deepcopy
+from functools import partial
+from unittest import mock
+
+import pytest
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_registry import DATA_REGISTRY, EntityRegistry
+from myPyllant.api import MyPyllantAPI
+from myPyllant.tests.utils import list_test_data
+
+from custom_components.mypyllant.const import DOMAIN, MODEL_REMOVAL_UPDATES
+from custom_components.mypyllant.coordinator import SystemCoordinator
+from custom_components.mypyllant.sensor import create_system_sensors
+from custom_components.mypyllant.topology import EntityTracker
+from tests.utils import get_config_entry
+
+
+@pytest.mark.parametrize("test_data", list_test_data(only_with_systems=True))
+async def test_zone_entities_follow_topology(
+    hass,
+    mypyllant_aioresponses,
+    mocked_api: MyPyllantAPI,
+    system_coordinator_mock: SystemCoordinator,
+    test_data,
+):
+    hass.data[DATA_REGISTRY] = EntityRegistry(hass)
+    with mypyllant_aioresponses(test_data) as _:
+        config_entry = get_config_entry()
+        system_coordinator_mock.data = (
+            await system_coordinator_mock._async_update_data()
+        )
+        system_index, system = next(
+            ((i, s) for i, s in enumerate(system_coordinator_mock.data) if s.zones),
+            (None, None),
+        )
+        if system is None:
+            await mocked_api.aiohttp_session.close()
+            pytest.skip("No system with zones")
+        hass.data[DOMAIN] = {
+            config_entry.entry_id: {"system_coordinator": system_coordinator_mock}
+        }
+        system_coordinator_mock.async_update_listeners()
+        topology_changes = []
+        system_coordinator_mock.async_add_topology_listener(
+            lambda added, removed: topology_changes.append((added, removed))
+        )
+        async_add_entities = mock.Mock(return_value=None)
+        create_entities = mock.AsyncMock(
+            side_effect=partial(create_system_sensors, hass, config_entry)
+        )
+        tracker = EntityTracker(
+            hass,
+            config_entry,
+            system_coordinator_mock,
+            async_add_entities,
+            create_entities,
+        )
+        await tracker.async_setup()
+        entity_count = len(tracker.entities)
+        zone = system.zones[-1]
+        zone_key = (system.id, "zone", zone.index)
+
+        def _zone_entities(entities):
+            return [e for e in entities if getattr(e, "_zone_key", None) == zone_key]
+
+        assert _zone_entities(tracker.entities)
+
+        # The last zone was removed, it's only removed after missing from several updates
+        without_zone = deepcopy(system_coordinator_mock.data)
+        without_zone[system_index].zones.pop()
+        with mock.patch.object(Entity, "async_remove", mock.AsyncMock()):
+            for _ in range(MODEL_REMOVAL_UPDATES):
+                assert _zone_entities(tracker.entities)
+                system_coordinator_mock.data = deepcopy(without_zone)
+                system_coordinator_mock.async_update_listeners()
+                await hass.async_block_till_done()
+        assert topology_changes == [(frozenset(), frozenset({zone_key}))]
+        assert not _zone_entities(tracker.entities)
+        removed_count = entity_count - len(tracker.entities)
+
+        # And added again, only its entities are added
+        system_coordinator_mock.data = deepcopy(system_coordinator_mock.data)
+        system_coordinator_mock.data[system_index].zones.append(zone)
+        system_coordinator_mock.async_update_listeners()
+        await hass.async_block_till_done()
+        assert topology_changes[-1] == (frozenset({zone_key}), frozenset())
+        # Only the entities of the added zone are created
+        create_entities.assert_awaited_with(frozenset({zone_key}))
+        assert async_add_entities.call_count == 2
+        added = async_add_entities.call_args.args[0]
+        assert len(added) == removed_count
+        assert _zone_entities(added) == added
+        assert len(tracker.entities) == entity_count
+        await mocked_api.aiohttp_session.close()
+
+
+@pytest.mark.parametrize("test_data", list_test_data(only_with_systems=True))
+async def test_missing_models_keep_registry_entries(
+    hass,
+    mypyllant_aioresponses,
+    mocked_api: MyPyllantAPI,
+    system_coordinator_mock: SystemCoordinator,
+    test_data,
+):
+    with mypyllant_aioresponses(test_data) as _:
+        config_entry = get_config_entry()
+        config_entry.add_to_hass(hass)
+        data = await system_coordinator_mock._async_update_data()
+        system_index = next(
+            (i for i, s in enumerate(data) if s.zones),
+            None,
+        )
+        if system_index is None:
+            await mocked_api.aiohttp_session.close()
+            pytest.skip("No system with zones")
+        hass.data[DOMAIN] = {
+            config_entry.entry_id: {"system_coordinator": system_coordinator_mock}
+        }
+        system_coordinator_mock.data = data
+        system_coordinator_mock.async_update_listeners()
+        tracker = EntityTracker(
+            hass,
+            config_entry,
+            system_coordinator_mock,
+            mock.Mock(return_value=None),
+            partial(create_system_sensors, hass, config_entry),
+        )
+        await tracker.async_setup()
+        entity_registry = er.async_get(hass)
+        for entity in tracker.entities:
+            entity.registry_entry = entity_registry.async_get_or_create(
+                "sensor", DOMAIN, entity.unique_id, config_entry=config_entry
+            )
+        entity_count = len(tracker.entities)
+
+        def _refresh(systems):
+            system_coordinator_mock.data = systems
+            system_coordinator_mock.async_update_listeners()
+
+        # Updates without systems, i.e. while the API is down
+        for _ in range(MODEL_REMOVAL_UPDATES):
+            _refresh([])
+        # A zone that is missing from a few updates, but comes back
+        without_zone = deepcopy(data)
+        without_zone[system_index].zones.pop()
+        for _ in range(MODEL_REMOVAL_UPDATES - 1):
+            _refresh(deepcopy(without_zone))
+        _refresh(deepcopy(data))
+        _refresh(deepcopy(without_zone))
+        await hass.async_block_till_done()
+
+        assert len(tracker.entities) == entity_count
+        assert (
+            len(
+                er.async_entries_for_config_entry(
+                    entity_registry, config_entry.entry_id
+                )
+            )
+            == entity_count
+        )
+        await mocked_api.aiohttp_session.close()
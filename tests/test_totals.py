@@ -0,0 +1,116 @@
+from datetime import date, datetime, timedelta, timezone
+
+from myPyllant.enums import DeviceDataBucketResolution
+from myPyllant.models import DeviceData, DeviceDataBucket
+
+from custom_components.mypyllant.totals import DailyTotals, PeriodTotals, rollup
+
+
+def _buckets(start, values, step=timedelta(hours=1)):
+    return [
+        DeviceDataBucket(
+            start_date=start + i * step, end_date=start + (i + 1) * step, value=value
+        )
+        for i, value in enumerate(values)
+    ]
+
+
+def test_rollup():
+    start = datetime(2025, 12, 31, 22, tzinfo=timezone.utc)
+    buckets = _buckets(start, [100.0, None, 300.0, 400.0])
+    assert rollup(buckets, "day") == {
+        date(2025, 12, 31): 100.0,
+        date(2026, 1, 1): 700.0,
+    }
+    assert rollup(buckets, "month") == {
+        date(2025, 12, 1): 100.0,
+        date(2026, 1, 1): 700.0,
+    }
+    assert rollup(buckets, "year") == {
+        date(2025, 1, 1): 100.0,
+        date(2026, 1, 1): 700.0,
+    }
+
+
+def _daily_totals(start, values):
+    return DailyTotals(
+        {
+            "system": {
+                "home_name": "Home",
+                "devices_data": [
+                    [
+                        DeviceData(
+                            operation_mode="HEATING",
+                            energy_type="CONSUMED_ELECTRICAL_ENERGY",
+                            resolution=DeviceDataBucketResolution.DAY,
+                            data=_buckets(start, values, timedelta(days=1)),
+                        )
+                    ]
+                ],
+            }
+        }  # type: ignore
+    )
+
+
+def test_daily_totals_periods():
+    start = datetime(2026, 5, 30, tzinfo=timezone.utc)
+    data = {
+        "system": {
+            "home_name": "Home",
+            "devices_data": [
+                [
+                    DeviceData(
+                        operation_mode="HEATING",
+                        energy_type="CONSUMED_ELECTRICAL_ENERGY",
+                        resolution=DeviceDataBucketResolution.DAY,
+                        data=_buckets(start, [1.0, 2.0, 3.0], timedelta(days=1)),
+                    ),
+                    DeviceData(
+                        operation_mode="DOMESTIC_HOT_WATER",
+                        energy_type="CONSUMED_ELECTRICAL_ENERGY",
+                        resolution=DeviceDataBucketResolution.DAY,
+                        data=_buckets(start, [10.0, 20.0, 30.0], timedelta(days=1)),
+                    ),
+                ]
+            ],
+        }
+    }
+    totals = DailyTotals(data)  # type: ignore
+    day = date(2026, 6, 1)
+    assert totals.device_data_total("system", 0, 0, day) == 3.0
+    assert totals.device_data_total("system", 0, 0, date(2026, 5, 15), "month") == 3.0
+    assert totals.device_data_total("system", 0, 0, day, "year") == 6.0
+    assert (
+        totals.energy_type_total("system", None, "CONSUMED_ELECTRICAL_ENERGY", day)
+        == 33.0
+    )
+    assert (
+        totals.energy_type_total("system", 0, "CONSUMED_ELECTRICAL_ENERGY", day, "year")
+        == 66.0
+    )
+
+
+def test_period_totals_accumulate():
+    period_totals = PeriodTotals()
+    period_totals.update(
+        _daily_totals(datetime(2026, 5, 31, tzinfo=timezone.utc), [1.0, 2.0])
+    )
+    # The next update fetches yesterday again, with its final value
+    period_totals.update(
+        _daily_totals(datetime(2026, 6, 1, tzinfo=timezone.utc), [3.0, 4.0])
+    )
+    # Recorder statistics don't overwrite days that were fetched
+    period_totals.seed(
+        "system",
+        "CONSUMED_ELECTRICAL_ENERGY",
+        {date(2025, 12, 31): 100.0, date(2026, 1, 1): 10.0, date(2026, 6, 1): 50.0},
+    )
+    day = date(2026, 6, 2)
+    energy_type = "CONSUMED_ELECTRICAL_ENERGY"
+    assert period_totals.total("system", energy_type, day, "month") == 7.0
+    assert period_totals.total("system", energy_type, day, "year") == 18.0
+
+    restored = PeriodTotals()
+    restored.load(period_totals.as_dict())
+    assert restored.energy_types("system") == [energy_type]
+    assert restored.total("system", energy_type, day, "year") == 18.0